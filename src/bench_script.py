@@ -0,0 +1,186 @@
+# bench_script.py
+#!/usr/bin/env python3
+"""
+Bitpy Script Benchmark - ops/sec interpreter script dalam format JSON
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from ecdsa import SigningKey, SECP256k1
+from ecdsa.util import sigencode_der
+from crypto import CryptoUtils
+from script import (Script, create_p2pkh_script, create_p2sh_script,
+                    create_multisig_script, get_signature_cache)
+
+DEFAULT_MIN_TIME = 0.5  # Durasi minimum pengukuran per case (detik)
+SIGHASH_ALL = b'\x01'
+MAX_MULTISIG_KEYS = 15
+PUSHDATA_ITEMS = 64  # Jumlah push OP_PUSHDATA2 di case pushdata_heavy
+PUSHDATA_SIZE = 520  # Ukuran element maksimum Bitcoin
+DEEP_STACK_DEPTH = 500
+
+# Satu case = (scriptSig, scriptPubKey, hasil yang diharapkan)
+BenchCase = Tuple[bytes, bytes, bool]
+
+def _push(data: bytes) -> bytes:
+    """Encode push data dengan opcode terkecil yang cukup"""
+    if len(data) <= 75:
+        return bytes([len(data)]) + data
+    if len(data) <= 0xff:
+        return bytes([76, len(data)]) + data  # OP_PUSHDATA1
+    return bytes([77]) + len(data).to_bytes(2, 'little') + data  # OP_PUSHDATA2
+
+class _Keys:
+    """Key pair deterministik untuk benchmark"""
+    
+    def __init__(self, count: int, sighash: bytes):
+        self.signing_keys = [
+            SigningKey.from_secret_exponent(index + 1, curve=SECP256k1)
+            for index in range(count)
+        ]
+        self.pubkeys = [key.get_verifying_key().to_string('compressed') for key in self.signing_keys]
+        self.signatures = [
+            key.sign_digest_deterministic(sighash, hashfunc=hashlib.sha256, sigencode=sigencode_der) + SIGHASH_ALL
+            for key in self.signing_keys
+        ]
+
+def build_cases(sighash: bytes) -> Dict[str, BenchCase]:
+    """Semua case benchmark: template standar, PUSHDATA besar, dan stack dalam"""
+    keys = _Keys(MAX_MULTISIG_KEYS, sighash)
+    cases: Dict[str, BenchCase] = {}
+    
+    # P2PKH
+    script_sig = _push(keys.signatures[0]) + _push(keys.pubkeys[0])
+    cases['p2pkh'] = (script_sig, create_p2pkh_script(CryptoUtils.hash160(keys.pubkeys[0])), True)
+    
+    # P2SH (redeem script 1-of-1 multisig)
+    redeem_script = create_multisig_script(1, keys.pubkeys[:1])
+    script_sig = b'\x00' + _push(keys.signatures[0]) + _push(redeem_script)
+    cases['p2sh'] = (script_sig, create_p2sh_script(CryptoUtils.hash160(redeem_script)), True)
+    
+    # Multisig bare m-of-m
+    for m in range(1, MAX_MULTISIG_KEYS + 1):
+        script_sig = b'\x00' + b''.join(_push(sig) for sig in keys.signatures[:m])
+        cases[f'multisig_{m}_of_{m}'] = (script_sig, create_multisig_script(m, keys.pubkeys[:m]), True)
+    
+    # PUSHDATA besar: scriptSig push element 520-byte, scriptPubKey membuangnya
+    element = bytes(range(256)) * 2 + bytes(PUSHDATA_SIZE - 512)
+    script_sig = b''.join(_push(element) for _ in range(PUSHDATA_ITEMS))
+    script_pubkey = bytes([0x75]) * (PUSHDATA_ITEMS - 1) + bytes([0xa9]) + _push(CryptoUtils.hash160(element)) + bytes([0x87])
+    cases['pushdata_heavy'] = (script_sig, script_pubkey, True)
+    
+    # Stack dalam: isi stack, pindah semua ke altstack lalu kembalikan
+    script_sig = bytes([0x51]) * DEEP_STACK_DEPTH  # OP_1
+    script_pubkey = (bytes([0x6b]) * (DEEP_STACK_DEPTH - 1) +  # OP_TOALTSTACK
+                     bytes([0x6c]) * (DEEP_STACK_DEPTH - 1) +  # OP_FROMALTSTACK
+                     bytes([0x76, 0x87]) * (DEEP_STACK_DEPTH // 2))  # OP_DUP OP_EQUAL
+    cases['deep_stack'] = (script_sig, script_pubkey, True)
+    
+    return cases
+
+def measure(func: Callable[[], None], min_time: float = DEFAULT_MIN_TIME) -> Tuple[int, float]:
+    """Jalankan func berulang (jumlah naik 2x) sampai durasi >= min_time"""
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return iterations, elapsed
+        iterations *= 2
+
+def run_benchmarks(min_time: float = DEFAULT_MIN_TIME, verify: bool = False,
+                   only: Optional[List[str]] = None) -> Dict[str, dict]:
+    """
+    Benchmark setiap case dan cek hasilnya (regression)
+    verify=True memakai verifikasi ECDSA penuh, signature cache
+    dikosongkan setiap iterasi; default tanpa sighash (biaya interpreter saja)
+    """
+    sighash = hashlib.sha256(b'bitpy script benchmark').digest()
+    cases = build_cases(sighash)
+    engine = Script()
+    cache = get_signature_cache()
+    results = {}
+    
+    for name, (script_sig, script_pubkey, expected) in cases.items():
+        if only and name not in only:
+            continue
+        
+        context = sighash if verify else None
+        result = engine.evaluate(script_sig, script_pubkey, context)
+        if result != expected:
+            raise AssertionError(f"{name}: hasil {result}, seharusnya {expected}")
+        
+        if verify:
+            def run():
+                cache.clear()
+                engine.evaluate(script_sig, script_pubkey, context)
+        else:
+            def run():
+                engine.evaluate(script_sig, script_pubkey, context)
+        
+        iterations, elapsed = measure(run, min_time)
+        results[name] = {
+            'ops_per_sec': iterations / elapsed,
+            'iterations': iterations,
+            'seconds': elapsed,
+            'script_size': len(script_sig) + len(script_pubkey)
+        }
+    
+    return results
+
+def _git_commit() -> Optional[str]:
+    """Commit git saat ini (jika tersedia)"""
+    try:
+        output = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=5
+        )
+        return output.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict]) -> Dict[str, float]:
+    """Rasio ops/sec terhadap baseline (> 1.0 berarti lebih cepat)"""
+    return {
+        name: result['ops_per_sec'] / baseline[name]['ops_per_sec']
+        for name, result in results.items()
+        if name in baseline and baseline[name]['ops_per_sec']
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bitpy script interpreter benchmark")
+    parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME, help="Durasi minimum per case (detik)")
+    parser.add_argument('--verify', action='store_true', help="Verifikasi ECDSA penuh (tanpa signature cache)")
+    parser.add_argument('--case', action='append', help="Hanya jalankan case ini (bisa diulang)")
+    parser.add_argument('--output', help="Simpan hasil JSON ke file")
+    parser.add_argument('--baseline', help="File JSON hasil sebelumnya untuk dibandingkan")
+    args = parser.parse_args()
+    
+    report = {
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'timestamp': int(time.time()),
+        'verify': args.verify,
+        'results': run_benchmarks(args.min_time, args.verify, args.case)
+    }
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            report['speedup'] = compare(report['results'], json.load(f)['results'])
+    
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
@@ -0,0 +1,110 @@
+# bench_startup.py
+#!/usr/bin/env python3
+"""
+Bitpy Startup Benchmark - waktu startup CLI dan import (python -X importtime)
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+DEFAULT_RUNS = 10
+DEFAULT_COMMANDS = ['help']
+TOP_IMPORTS = 10  # Jumlah import paling lambat yang dilaporkan
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """Parse output -X importtime menjadi list (module, self us, cumulative us)"""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3:
+            continue
+        imports.append((fields[2][1:].rstrip(), int(fields[0]), int(fields[1])))  # Indentasi = kedalaman import
+    return imports
+
+def measure_command(command: List[str], runs: int = DEFAULT_RUNS) -> dict:
+    """Jalankan main.py <command> beberapa kali, ukur wall time dan import time"""
+    durations = []
+    imports: List[Tuple[str, int, int]] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', MAIN_SCRIPT] + command,
+            stdin=subprocess.DEVNULL, capture_output=True, text=True
+        )
+        durations.append((time.perf_counter() - start) * 1000)
+        if result.returncode != 0:
+            raise RuntimeError(f"{' '.join(command)} gagal: {result.stderr[-500:]}")
+        imports = parse_importtime(result.stderr)
+    
+    # Module top-level (tanpa indentasi) dari run terakhir
+    top_level = [(name, cumulative) for name, _, cumulative in imports if not name.startswith(' ')]
+    slowest = sorted(top_level, key=lambda item: item[1], reverse=True)[:TOP_IMPORTS]
+    return {
+        'median_ms': statistics.median(durations),
+        'min_ms': min(durations),
+        'max_ms': max(durations),
+        'runs': runs,
+        'import_ms': sum(cumulative for _, cumulative in top_level) / 1000,
+        'modules_imported': len(imports),
+        'slowest_imports': [{'module': name, 'cumulative_ms': cumulative / 1000} for name, cumulative in slowest]
+    }
+
+def imported_modules(command: List[str]) -> List[str]:
+    """Nama semua module yang di-import saat main.py <command> dijalankan sekali"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', MAIN_SCRIPT] + command,
+        stdin=subprocess.DEVNULL, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(command)} gagal: {result.stderr[-500:]}")
+    return [name.strip() for name, _, _ in parse_importtime(result.stderr)]
+
+def measure_baseline(runs: int = DEFAULT_RUNS) -> float:
+    """Median startup interpreter Python kosong (ms), pembanding"""
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'], check=True)
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bitpy CLI startup benchmark")
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS)
+    parser.add_argument('--command', action='append', help="Command CLI yang diukur (bisa diulang, default: help)")
+    parser.add_argument('--budget-ms', type=float, help="Exit code 1 jika median startup melebihi budget")
+    parser.add_argument('--output', help="Simpan hasil JSON ke file")
+    args = parser.parse_args()
+    
+    commands = args.command or DEFAULT_COMMANDS
+    results: Dict[str, dict] = {command: measure_command(command.split(), args.runs) for command in commands}
+    report = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'timestamp': int(time.time()),
+        'python_baseline_ms': measure_baseline(args.runs),
+        'results': results
+    }
+    
+    over_budget = []
+    if args.budget_ms is not None:
+        report['budget_ms'] = args.budget_ms
+        over_budget = [command for command, result in results.items() if result['median_ms'] > args.budget_ms]
+        report['over_budget'] = over_budget
+    
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+    sys.exit(1 if over_budget else 0)
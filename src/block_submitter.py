@@ -0,0 +1,169 @@
+# block_submitter.py
+"""
+Bitpy Block Submitter - simpan dan relay block hasil mining di luar thread hashing
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from typing import Callable, Optional
+from block import Block
+from database import get_data_manager
+
+# P2P server dan event loop tempat server berjalan (diset oleh network layer)
+_network_server = None
+_network_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def set_network_server(server, loop: Optional[asyncio.AbstractEventLoop] = None):
+    """
+    Daftarkan P2P server agar block hasil mining di-relay
+    Dipanggil dari event loop network (loop default: loop yang sedang jalan)
+    """
+    global _network_server, _network_loop
+    _network_loop = loop or asyncio.get_running_loop()
+    _network_server = server
+
+def clear_network_server():
+    """Lepas P2P server (contoh: saat node berhenti)"""
+    global _network_server, _network_loop
+    _network_server = None
+    _network_loop = None
+
+class LatencyStat:
+    """Latency terakhir, rata-rata, dan maksimum (detik)"""
+    
+    def __init__(self):
+        self.count = 0
+        self.last = 0.0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def record(self, seconds: float):
+        self.count += 1
+        self.last = seconds
+        self.total += seconds
+        self.max = max(self.max, seconds)
+    
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+class BlockSubmitter:
+    """
+    Queue block yang ditemukan miner, diproses satu per satu di thread sendiri
+    
+    save_block dan broadcast tidak menahan hashing: miner cukup memanggil
+    submit lalu lanjut ke template berikutnya. Broadcast dijadwalkan ke event
+    loop network dengan run_coroutine_threadsafe (thread-safe), hasilnya
+    dicatat lewat callback future. on_saved(block, accepted) dipanggil dari
+    thread submitter setelah save_block selesai.
+    """
+    
+    def __init__(self, on_saved: Optional[Callable[[Block, bool], None]] = None):
+        self.on_saved = on_saved
+        self.queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self.thread: Optional[threading.Thread] = None
+        
+        # Metrics
+        self.submitted = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.relayed = 0
+        self.relay_errors = 0
+        self.save_latency = LatencyStat()  # Submit -> tersimpan di blockchain
+        self.relay_latency = LatencyStat()  # Submit -> broadcast selesai
+        self._lock = threading.Lock()
+    
+    def start(self):
+        """Mulai thread submitter"""
+        if self.thread:
+            return
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        """Proses block yang masih di queue lalu stop thread"""
+        if not self.thread:
+            return
+        self.queue.put(None)
+        self.thread.join()
+        self.thread = None
+    
+    def submit(self, block: Block, height: int):
+        """Masukkan block ke queue (return segera)"""
+        with self._lock:
+            self.submitted += 1
+        self.queue.put((block, height, time.time()))
+    
+    def get_stats(self) -> dict:
+        """Metrics submit dan relay"""
+        with self._lock:
+            return {
+                'submitted_blocks': self.submitted,
+                'accepted_blocks': self.accepted,
+                'rejected_blocks': self.rejected,
+                'relayed_blocks': self.relayed,
+                'relay_errors': self.relay_errors,
+                'submit_queue': self.queue.qsize(),
+                'last_save_latency': self.save_latency.last,
+                'avg_save_latency': self.save_latency.average(),
+                'last_relay_latency': self.relay_latency.last,
+                'avg_relay_latency': self.relay_latency.average(),
+                'max_relay_latency': self.relay_latency.max
+            }
+    
+    def _run(self):
+        """Loop thread submitter"""
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            try:
+                self._process(*item)
+            except Exception as e:
+                print(f"Block submit error: {e}")
+    
+    def _process(self, block: Block, height: int, submitted_at: float):
+        """Simpan block lalu jadwalkan broadcast ke network"""
+        try:
+            accepted = bool(get_data_manager().db.save_block(block))
+        except Exception as e:
+            # Tetap panggil on_saved agar miner tidak menunggu tip yang tidak pernah tersimpan
+            print(f"Block submit error: {e}")
+            accepted = False
+        
+        with self._lock:
+            if accepted:
+                self.accepted += 1
+                self.save_latency.record(time.time() - submitted_at)
+            else:
+                self.rejected += 1
+        
+        if accepted:
+            print(f"✅ Block successfully added to blockchain!")
+            print(f"Block Height: {height}")
+            print(f"Block Hash: {block.header.get_hash_hex()}")
+            self._relay(block, submitted_at)
+        else:
+            print("❌ Failed to add block to blockchain")
+        
+        if self.on_saved:
+            self.on_saved(block, accepted)
+    
+    def _relay(self, block: Block, submitted_at: float):
+        """Broadcast block di event loop network (jika node berjalan)"""
+        server, loop = _network_server, _network_loop
+        if server is None or loop is None or loop.is_closed():
+            return
+        
+        future = asyncio.run_coroutine_threadsafe(server.broadcast_block(block), loop)
+        
+        def relay_done(done):
+            with self._lock:
+                if done.cancelled() or done.exception() is not None:
+                    self.relay_errors += 1
+                else:
+                    self.relayed += 1
+                    self.relay_latency.record(time.time() - submitted_at)
+        
+        future.add_done_callback(relay_done)
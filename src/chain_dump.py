@@ -0,0 +1,93 @@
+# chain_dump.py
+"""
+Bitpy Chain Dump - export block secara streaming (text, NDJSON, binary)
+"""
+
+import json
+import struct
+from typing import BinaryIO, Iterable, TextIO, Tuple
+from block import Block
+from util import ByteUtils
+
+DUMP_FORMATS = ('text', 'ndjson', 'binary')
+BINARY_MAGIC = b'BPYD'  # Header file dump binary
+BINARY_VERSION = 1
+FLUSH_INTERVAL = 1000  # Flush output setiap N block
+
+# Satu record = (height, hash hex, block)
+BlockRecord = Tuple[int, str, Block]
+
+_record_header = struct.Struct('<II')  # height, panjang payload
+
+def block_to_dict(height: int, block_hash: str, block: Block) -> dict:
+    """Representasi JSON block (satu baris NDJSON)"""
+    header = block.header
+    return {
+        'height': height,
+        'hash': block_hash,
+        'version': header.version,
+        'prev_block_hash': header.prev_block_hash.hex(),
+        'merkle_root': header.merkle_root.hex(),
+        'timestamp': header.timestamp,
+        'bits': header.bits,
+        'nonce': header.nonce,
+        'tx_count': len(block.transactions),
+        'txids': [tx.get_txid_hex() for tx in block.transactions]
+    }
+
+def serialize_block(block: Block) -> bytes:
+    """Serialisasi block: header 80-byte + var_int jumlah tx + transaksi"""
+    parts = [block.header.serialize(), ByteUtils.var_int_encode(len(block.transactions))]
+    parts.extend(tx.serialize() for tx in block.transactions)
+    return b''.join(parts)
+
+def dump_text(records: Iterable[BlockRecord], output: TextIO) -> int:
+    """Ringkasan block yang mudah dibaca (format lama dumpblockchain)"""
+    count = 0
+    for height, block_hash, block in records:
+        output.write(f"Block {height}: {block_hash}\n")
+        output.write(f"  Transactions: {len(block.transactions)}\n")
+        output.write(f"  Timestamp: {block.header.timestamp}\n")
+        count += 1
+    return count
+
+def dump_ndjson(records: Iterable[BlockRecord], output: TextIO) -> int:
+    """Satu object JSON per baris"""
+    count = 0
+    for height, block_hash, block in records:
+        output.write(json.dumps(block_to_dict(height, block_hash, block), separators=(',', ':')))
+        output.write('\n')
+        count += 1
+        if count % FLUSH_INTERVAL == 0:
+            output.flush()
+    return count
+
+def dump_binary(records: Iterable[BlockRecord], output: BinaryIO) -> int:
+    """
+    Format binary ringkas:
+    BINARY_MAGIC + 1 byte versi, lalu per block: height (uint32 LE),
+    panjang payload (uint32 LE), payload serialize_block()
+    """
+    output.write(BINARY_MAGIC + bytes([BINARY_VERSION]))
+    count = 0
+    for height, _, block in records:
+        payload = serialize_block(block)
+        output.write(_record_header.pack(height, len(payload)))
+        output.write(payload)
+        count += 1
+        if count % FLUSH_INTERVAL == 0:
+            output.flush()
+    return count
+
+def dump_blocks(records: Iterable[BlockRecord], output, fmt: str = 'text') -> int:
+    """Tulis records ke output (text stream untuk text/ndjson, binary stream untuk binary)"""
+    if fmt == 'text':
+        count = dump_text(records, output)
+    elif fmt == 'ndjson':
+        count = dump_ndjson(records, output)
+    elif fmt == 'binary':
+        count = dump_binary(records, output)
+    else:
+        raise ValueError(f"Format dump tidak dikenal: {fmt}")
+    output.flush()
+    return count
@@ -0,0 +1,63 @@
+# chain_hooks.py
+"""
+Bitpy Chain Hooks - validator dan callback di sekitar blockchain.save_block
+"""
+
+import threading
+from typing import Callable, Dict
+from block import Block
+
+BlockValidator = Callable[[Block], bool]
+BlockCallback = Callable[[Block], None]
+
+class ChainHooks:
+    """
+    save_block yang dibungkus satu kali untuk semua subsystem
+    
+    Validator dipanggil sebelum block disimpan (satu yang return False =
+    block ditolak), callback dipanggil setelah block tersimpan. Keduanya
+    jalan sesuai urutan pendaftaran; nama yang sama menggantikan hook lama.
+    Callback tidak boleh bergantung pada callback lain: error satu
+    callback dicatat tanpa membatalkan block yang sudah tersimpan.
+    """
+    
+    def __init__(self, blockchain):
+        self.validators: Dict[str, BlockValidator] = {}
+        self.callbacks: Dict[str, BlockCallback] = {}
+        self._save_block = blockchain.save_block
+        blockchain.save_block = self.save_block
+    
+    def add_validator(self, name: str, validator: BlockValidator):
+        """Daftarkan validator yang dipanggil sebelum block disimpan"""
+        self.validators[name] = validator
+    
+    def add_callback(self, name: str, callback: BlockCallback):
+        """Daftarkan callback yang dipanggil setelah block tersimpan"""
+        self.callbacks[name] = callback
+    
+    def save_block(self, block: Block, *args, **kwargs):
+        """Validasi, simpan lewat save_block asli, lalu jalankan callback"""
+        for name, validator in list(self.validators.items()):
+            if not validator(block):
+                print(f"Block {block.header.get_hash_hex()} ditolak oleh {name}")
+                return False
+        
+        result = self._save_block(block, *args, **kwargs)
+        if result is not False:
+            for name, callback in list(self.callbacks.items()):
+                try:
+                    callback(block)
+                except Exception as e:
+                    print(f"Chain hook {name} error: {e}")
+        return result
+
+_chain_hooks_lock = threading.Lock()
+
+def get_chain_hooks(blockchain) -> ChainHooks:
+    """Hooks blockchain (save_block dibungkus saat pertama dipanggil)"""
+    with _chain_hooks_lock:
+        hooks = getattr(blockchain, 'chain_hooks', None)
+        if hooks is None:
+            hooks = ChainHooks(blockchain)
+            blockchain.chain_hooks = hooks
+        return hooks
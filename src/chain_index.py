@@ -0,0 +1,463 @@
+# chain_index.py
+"""
+Bitpy Chain Index - index address -> saldo/UTXO dan height <-> hash block
+yang di-update per block
+"""
+
+import atexit
+import os
+import pickle
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from block import Block
+from chain_hooks import get_chain_hooks
+from database import get_data_manager
+from script import extract_p2pkh_address, extract_p2sh_address
+
+# Outpoint = (txid, index output)
+Outpoint = Tuple[bytes, int]
+# UTXO yang dibelanjakan block = (outpoint, address, value, script_pubkey)
+SpentOutput = Tuple[Outpoint, str, int, bytes]
+
+DEFAULT_ADDRESS_INDEX_PATH = os.path.join(os.path.expanduser('~'), '.bitpy', 'address_index.pkl')
+DEFAULT_HEIGHT_INDEX_PATH = os.path.join(os.path.expanduser('~'), '.bitpy', 'height_index')
+GENESIS_PREV_HASH = b'\x00' * 32
+MAX_UNDO_BLOCKS = 100  # Reorg lebih dalam dari ini membangun ulang address index
+SNAPSHOT_INTERVAL = 100  # Simpan snapshot address index setiap N block
+
+def script_to_address(script_pubkey: bytes) -> Optional[str]:
+    """Address dari scriptPubKey standar (P2PKH / P2SH), None jika tidak standar"""
+    return extract_p2pkh_address(script_pubkey) or extract_p2sh_address(script_pubkey)
+
+def block_lookup(blockchain, reference: Block) -> Callable[[bytes], Optional[Block]]:
+    """
+    Fungsi hash raw -> Block lewat blockchain.get_block (tanpa scan semua block)
+    Format hex key storage (get_hash_hex) dicocokkan dengan block reference
+    """
+    header = reference.header
+    reverse = header.get_hash_hex() != header.get_hash().hex()
+    
+    def lookup(raw_hash: bytes) -> Optional[Block]:
+        return blockchain.get_block((raw_hash[::-1] if reverse else raw_hash).hex())
+    
+    return lookup
+
+class AddressIndex:
+    """
+    Index address -> (saldo, UTXO) untuk best chain
+    
+    Di-update incremental setiap block disimpan (callback save_block, lihat
+    attach), jadi saldo seluruh address wallet cukup dibaca dari dict
+    tanpa scan blockchain per address. Block cabang tidak di-apply; saat
+    reorg block lama di-disconnect sampai fork point memakai undo data
+    (UTXO yang dibelanjakan setiap block). Index disimpan sebagai snapshot
+    agar start berikutnya hanya meng-index block setelah tip snapshot.
+    """
+    
+    def __init__(self, path: str = DEFAULT_ADDRESS_INDEX_PATH):
+        self.path = path
+        self.balances: Dict[str, int] = {}
+        self.utxos: Dict[str, Dict[Outpoint, Tuple[int, bytes]]] = {}  # address -> {outpoint: (value, script_pubkey)}
+        self.outpoints: Dict[Outpoint, str] = {}  # outpoint -> address (untuk input yang membelanjakan)
+        self.chain: List[bytes] = []  # Hash block main chain yang sudah di-index (genesis -> tip)
+        self.heights: Dict[bytes, int] = {}  # Hash block -> posisi di chain
+        self.undo: Dict[bytes, List[SpentOutput]] = {}  # Hash block -> UTXO yang dibelanjakan block
+        self._unsaved = 0  # Block yang belum masuk snapshot
+        self._lock = threading.RLock()
+    
+    def attach(self, blockchain):
+        """Sync ke best block setiap kali block disimpan"""
+        get_chain_hooks(blockchain).add_callback('address_index', lambda block: self.sync(blockchain))
+    
+    def bootstrap(self, blockchain):
+        """Load snapshot lalu index block sampai best block"""
+        self.load()
+        self.sync(blockchain)
+    
+    def sync(self, blockchain):
+        """
+        Samakan index dengan best block
+        Block yang memperpanjang tip langsung di-connect; selain itu jalan
+        mundur dari best block sampai fork point, disconnect branch lama,
+        lalu connect branch baru
+        """
+        best_block = blockchain.get_best_block()
+        if best_block is None:
+            return
+        
+        with self._lock:
+            if best_block.header.get_hash() == self._tip_hash():
+                return
+            if best_block.header.prev_block_hash == self._tip_hash():
+                self.connect_block(best_block)
+                return
+            
+            lookup = block_lookup(blockchain, best_block)
+            branch: List[Block] = []
+            block = best_block
+            while block is not None and block.header.get_hash() not in self.heights:
+                branch.append(block)
+                block = lookup(block.header.prev_block_hash)
+            if block is None and branch[-1].header.prev_block_hash != GENESIS_PREV_HASH:
+                return  # Parent best block belum tersimpan
+            
+            fork_hash = block.header.get_hash() if block is not None else None
+            if not self._rewind(fork_hash, lookup):
+                branch = self._branch_from_genesis(best_block, lookup)
+            for block in reversed(branch):
+                self.connect_block(block)
+    
+    def connect_block(self, block: Block) -> bool:
+        """Apply block yang memperpanjang tip index (False jika bukan)"""
+        with self._lock:
+            if block.header.prev_block_hash != self._tip_hash():
+                return False
+            
+            spent: List[SpentOutput] = []
+            for tx in block.transactions:
+                for outpoint in self._spent_outpoints(tx):
+                    entry = self._spend(outpoint)
+                    if entry is not None:
+                        spent.append(entry)
+                self._add_outputs(tx)
+            
+            block_hash = block.header.get_hash()
+            self.heights[block_hash] = len(self.chain)
+            self.chain.append(block_hash)
+            self.undo[block_hash] = spent
+            if len(self.chain) > MAX_UNDO_BLOCKS:
+                self.undo.pop(self.chain[-MAX_UNDO_BLOCKS - 1], None)
+            
+            self._unsaved += 1
+            if self._unsaved >= SNAPSHOT_INTERVAL:
+                self.save()
+            return True
+    
+    def disconnect_block(self, block: Block) -> bool:
+        """Batalkan block tip index (reorg), False jika bukan tip atau undo data sudah dibuang"""
+        with self._lock:
+            block_hash = block.header.get_hash()
+            if not self.chain or self.chain[-1] != block_hash or block_hash not in self.undo:
+                return False
+            
+            for tx in reversed(block.transactions):
+                txid = tx.get_txid()
+                for vout in range(len(tx.outputs)):
+                    self._spend((txid, vout))
+            for outpoint, address, value, script_pubkey in self.undo.pop(block_hash):
+                self._add_utxo(outpoint, address, value, script_pubkey)
+            
+            self.chain.pop()
+            del self.heights[block_hash]
+            self._unsaved += 1
+            return True
+    
+    def save(self):
+        """Simpan snapshot index (tulis ke file sementara lalu rename)"""
+        with self._lock:
+            state = {
+                'chain': self.chain,
+                'balances': self.balances,
+                'utxos': self.utxos,
+                'outpoints': self.outpoints,
+                'undo': self.undo
+            }
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+            self._unsaved = 0
+    
+    def load(self) -> bool:
+        """Load snapshot index jika ada (snapshot rusak diabaikan, index dibangun ulang)"""
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, 'rb') as f:
+                state = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError) as e:
+            print(f"Address index snapshot error: {e}")
+            return False
+        
+        with self._lock:
+            self.chain = state['chain']
+            self.balances = state['balances']
+            self.utxos = state['utxos']
+            self.outpoints = state['outpoints']
+            self.undo = state['undo']
+            self.heights = {block_hash: height for height, block_hash in enumerate(self.chain)}
+            self._unsaved = 0
+        return True
+    
+    def get_balance(self, address: str) -> int:
+        """Saldo satu address"""
+        with self._lock:
+            return self.balances.get(address, 0)
+    
+    def get_balances(self, addresses: Iterable[str]) -> Dict[str, int]:
+        """Saldo banyak address sekaligus (satu kali ambil lock)"""
+        with self._lock:
+            balances = self.balances
+            return {address: balances.get(address, 0) for address in addresses}
+    
+    def get_utxos(self, address: str) -> List[dict]:
+        """UTXO milik address"""
+        with self._lock:
+            return [
+                {'txid': txid, 'vout': vout, 'value': value, 'script_pubkey': script_pubkey}
+                for (txid, vout), (value, script_pubkey) in self.utxos.get(address, {}).items()
+            ]
+    
+    def get_output(self, outpoint: Outpoint) -> Optional[Tuple[int, bytes]]:
+        """(value, script_pubkey) UTXO yang belum dibelanjakan, None jika tidak ada"""
+        with self._lock:
+            address = self.outpoints.get(outpoint)
+            return self.utxos[address][outpoint] if address is not None else None
+    
+    def get_stats(self) -> dict:
+        """Statistik index"""
+        with self._lock:
+            return {
+                'indexed_blocks': len(self.chain),
+                'addresses': len(self.balances),
+                'utxos': len(self.outpoints)
+            }
+    
+    def _tip_hash(self) -> bytes:
+        """Hash tip index (GENESIS_PREV_HASH jika index masih kosong)"""
+        return self.chain[-1] if self.chain else GENESIS_PREV_HASH
+    
+    def _rewind(self, fork_hash: Optional[bytes], lookup: Callable[[bytes], Optional[Block]]) -> bool:
+        """
+        Disconnect block di atas fork_hash (None = seluruh chain)
+        Jika undo data tidak cukup, index dikosongkan dan False dikembalikan
+        """
+        while self.chain and self.chain[-1] != fork_hash:
+            block = lookup(self.chain[-1])
+            if block is None or not self.disconnect_block(block):
+                self._reset()
+                return fork_hash is None
+        return True
+    
+    def _reset(self):
+        """Kosongkan index (dibangun ulang dari genesis)"""
+        self.balances, self.utxos, self.outpoints = {}, {}, {}
+        self.chain, self.heights, self.undo = [], {}, {}
+    
+    def _branch_from_genesis(self, block: Block, lookup: Callable[[bytes], Optional[Block]]) -> List[Block]:
+        """Block dari block sampai genesis (urutan mundur)"""
+        branch: List[Block] = []
+        while block is not None:
+            branch.append(block)
+            block = lookup(block.header.prev_block_hash)
+        return branch
+    
+    def _add_outputs(self, tx):
+        """Tambah output transaksi ke UTXO address pemiliknya"""
+        txid = tx.get_txid()
+        for vout, txout in enumerate(tx.outputs):
+            address = script_to_address(txout.script_pubkey)
+            if address:
+                self._add_utxo((txid, vout), address, txout.value, txout.script_pubkey)
+    
+    def _add_utxo(self, outpoint: Outpoint, address: str, value: int, script_pubkey: bytes):
+        """Tambah satu UTXO ke address"""
+        self.outpoints[outpoint] = address
+        self.utxos.setdefault(address, {})[outpoint] = (value, script_pubkey)
+        self.balances[address] = self.balances.get(address, 0) + value
+    
+    def _spent_outpoints(self, tx) -> List[Outpoint]:
+        """Outpoint yang dibelanjakan input transaksi"""
+        return [(txin.prev_tx_hash, txin.prev_output_index) for txin in tx.inputs]
+    
+    def _spend(self, outpoint: Outpoint) -> Optional[SpentOutput]:
+        """Hapus outpoint dari UTXO (coinbase / output non-standar diabaikan)"""
+        address = self.outpoints.pop(outpoint, None)
+        if address is None:
+            return None
+        value, script_pubkey = self.utxos[address].pop(outpoint)
+        self.balances[address] -= value
+        if not self.utxos[address]:
+            del self.utxos[address]
+            del self.balances[address]
+        return outpoint, address, value, script_pubkey
+
+# Global address index instance
+_address_index: Optional[AddressIndex] = None
+_address_index_lock = threading.Lock()
+
+def get_address_index() -> AddressIndex:
+    """Get global address index (dari snapshot + blockchain saat pertama dipakai)"""
+    global _address_index
+    with _address_index_lock:
+        if _address_index is None:
+            # Attach dulu agar block yang disimpan selama bootstrap tidak terlewat
+            blockchain = get_data_manager().db
+            index = AddressIndex()
+            index.attach(blockchain)
+            index.bootstrap(blockchain)
+            atexit.register(index.save)
+            _address_index = index
+        return _address_index
+
+class HeightIndex:
+    """
+    Index persisten height <-> hash block main chain (RocksDB)
+    
+    Key 'h:<height>' -> (hash hex, raw hash hex), 'b:<hash hex>' -> height,
+    'p:<raw hash hex>' -> height (untuk cari parent dari prev_block_hash),
+    'tip' -> height tertinggi. Hanya block di best chain yang di-index:
+    setiap block disimpan (lihat attach) index disamakan dengan best block.
+    Jika best block pindah branch (reorg), index dipotong sampai fork
+    point lalu branch baru di-index maju.
+    """
+    
+    def __init__(self, path: str = DEFAULT_HEIGHT_INDEX_PATH):
+        from rocksdict import Rdict  # RocksDB hanya di-load jika index dipakai
+        
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = Rdict(path)
+        self._lock = threading.RLock()
+    
+    def close(self):
+        """Tutup database index"""
+        with self._lock:
+            self.db.close()
+    
+    def attach(self, blockchain):
+        """Sync ke best block setiap kali block disimpan"""
+        get_chain_hooks(blockchain).add_callback('height_index', lambda block: self.sync(blockchain))
+    
+    def bootstrap(self, blockchain):
+        """Lengkapi index sampai best block (index yang sudah up to date tidak perlu scan)"""
+        self.sync(blockchain)
+    
+    def sync(self, blockchain) -> Optional[int]:
+        """
+        Samakan index dengan best block, return height tip
+        Block yang memperpanjang tip cukup di-index (O(1)); selain itu jalan
+        mundur dari best block sampai block yang sudah di main chain index
+        """
+        best_block = blockchain.get_best_block()
+        if best_block is None:
+            return None
+        
+        with self._lock:
+            tip = self.get_tip_height()
+            height = self.get_height(best_block.header.get_hash_hex())
+            if height is not None:
+                # Best block sudah di main chain (tip turun jika branch di atasnya dibuang)
+                self._disconnect_above(height)
+                return height
+            
+            prev_hash = best_block.header.prev_block_hash
+            tip_entry = self.db.get(f'h:{tip}') if tip is not None else None
+            if tip_entry is not None and prev_hash.hex() == tip_entry[1]:
+                return self._connect(best_block, tip + 1)
+            if tip is None and prev_hash == GENESIS_PREV_HASH:
+                return self._connect(best_block, 0)
+            
+            # Reorg (atau index tertinggal): cari fork point di branch best block
+            lookup = block_lookup(blockchain, best_block)
+            branch: List[Block] = []
+            fork_height = -1
+            block = best_block
+            while block is not None:
+                fork = self.db.get(f'p:{block.header.get_hash().hex()}')
+                if fork is not None:
+                    fork_height = fork
+                    break
+                branch.append(block)
+                block = lookup(block.header.prev_block_hash)
+            
+            if block is None and branch[-1].header.prev_block_hash != GENESIS_PREV_HASH:
+                return tip  # Parent best block belum tersimpan
+            
+            self._disconnect_above(fork_height)
+            height = fork_height
+            for block in reversed(branch):
+                height = self._connect(block, height + 1)
+            return height
+    
+    def _connect(self, block: Block, height: int) -> int:
+        """Index block di height tertentu sebagai tip baru"""
+        block_hash = block.header.get_hash_hex()
+        raw_hash = block.header.get_hash().hex()
+        self.db[f'h:{height}'] = (block_hash, raw_hash)
+        self.db[f'b:{block_hash}'] = height
+        self.db[f'p:{raw_hash}'] = height
+        self.db['tip'] = height
+        return height
+    
+    def _disconnect_above(self, height: int):
+        """Hapus block main chain di atas height (branch lama saat reorg)"""
+        tip = self.get_tip_height()
+        if tip is None or tip <= height:
+            return
+        for stale_height in range(tip, height, -1):
+            stale = self.db.get(f'h:{stale_height}')
+            if stale is not None:
+                del self.db[f'b:{stale[0]}']
+                del self.db[f'p:{stale[1]}']
+                del self.db[f'h:{stale_height}']
+        if height >= 0:
+            self.db['tip'] = height
+        else:
+            del self.db['tip']
+    
+    def get_height(self, block_hash: str) -> Optional[int]:
+        """Height block dari hash hex (O(1))"""
+        return self.db.get(f'b:{block_hash}')
+    
+    def get_hash(self, height: int) -> Optional[str]:
+        """Hash hex block di height tertentu (O(1))"""
+        entry = self.db.get(f'h:{height}')
+        return entry[0] if entry is not None else None
+    
+    def get_hashes(self, start: int, end: int) -> List[Tuple[int, str]]:
+        """(height, hash hex) untuk height di range [start, end]"""
+        tip = self.get_tip_height()
+        if tip is None:
+            return []
+        result = []
+        for height in range(max(start, 0), min(end, tip) + 1):
+            block_hash = self.get_hash(height)
+            if block_hash is not None:
+                result.append((height, block_hash))
+        return result
+    
+    def iter_blocks(self, blockchain, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, str, Block]]:
+        """
+        Generator (height, hash hex, block) urut height di range [start, end]
+        Block dibaca satu per satu dari storage (memory tetap kecil)
+        """
+        tip = self.get_tip_height()
+        if tip is None:
+            return
+        end = tip if end is None else min(end, tip)
+        for height in range(max(start, 0), end + 1):
+            block_hash = self.get_hash(height)
+            block = blockchain.get_block(block_hash) if block_hash else None
+            if block is not None:
+                yield height, block_hash, block
+    
+    def get_tip_height(self) -> Optional[int]:
+        """Height tertinggi di index"""
+        return self.db.get('tip')
+
+# Global height index instance
+_height_index: Optional[HeightIndex] = None
+_height_index_lock = threading.Lock()
+
+def get_height_index() -> HeightIndex:
+    """Get global height index (dilengkapi sampai best block saat pertama dipakai)"""
+    global _height_index
+    with _height_index_lock:
+        if _height_index is None:
+            blockchain = get_data_manager().db
+            index = HeightIndex()
+            index.attach(blockchain)
+            index.bootstrap(blockchain)
+            _height_index = index
+        return _height_index
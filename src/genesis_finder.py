@@ -1,40 +1,186 @@
-import hashlib
-import struct
+import argparse
+import collections
+import json
+import multiprocessing
+import os
 import time
+from hasher import HeaderHasher, search_nonce, serialize_header, target_to_bytes
+
+MAX_NONCE = 0xffffffff
+CHUNK_SIZE = 1 << 22  # Nonce per unit kerja worker
+CHECKPOINT_INTERVAL = 10  # Detik antar penulisan checkpoint
 
 def little_endian(hex_str):
     return bytes.fromhex(hex_str)[::-1]
 
-def double_sha256(b):
-    return hashlib.sha256(hashlib.sha256(b).digest()).digest()
+def bits_to_target(bits):
+    return (bits & 0xffffff) * (2 ** (8 * ((bits >> 24) - 3)))
 
 def find_genesis(version, prev_block, merkle_root, timestamp, bits):
-    target = (bits & 0xffffff) * (2 ** (8 * ((bits >> 24) - 3)))
+    target = bits_to_target(bits)
     print(f"Target: {hex(target)}")
 
-    for nonce in range(0, 0xffffffff):
-        header = (
-            struct.pack("<L", version) +
-            little_endian(prev_block) +
-            little_endian(merkle_root) +
-            struct.pack("<LLL", timestamp, bits, nonce)
-        )
-        hash_ = double_sha256(header)[::-1]
-        if int(hash_.hex(), 16) < target:
-            print(f"✅ Found valid genesis block!")
-            print(f"Nonce: {nonce}")
-            print(f"Genesis Hash: {hash_.hex()}")
-            print(f"Timestamp: {timestamp}")
-            return nonce, hash_.hex()
-        if nonce % 500000 == 0:
-            print(f"Searching... nonce={nonce}")
+    header = serialize_header(
+        version, little_endian(prev_block), little_endian(merkle_root), timestamp, bits, 0
+    )
+    scanned = 0
+
+    def progress(count):
+        nonlocal scanned
+        scanned += count
+        if scanned % 500000 == 0:
+            print(f"Searching... nonce={scanned}")
+
+    nonce = search_nonce(
+        header, target_to_bytes(target), 0, 0xffffffff,
+        on_batch=progress, batch_size=500000, byteorder='little'
+    )
+    if nonce is not None:
+        hash_ = HeaderHasher(header).hash_nonce(nonce)[::-1]
+        print(f"✅ Found valid genesis block!")
+        print(f"Nonce: {nonce}")
+        print(f"Genesis Hash: {hash_.hex()}")
+        print(f"Timestamp: {timestamp}")
+        return nonce, hash_.hex(), timestamp
     print("❌ No valid genesis found.")
-    return None, None
+    return None, None, None
+
+def _scan_chunk(args):
+    """Scan satu unit kerja (timestamp, range nonce) di worker process"""
+    header, target, timestamp, start, end = args
+    nonce = search_nonce(header, target, start, end, byteorder='little')
+    return timestamp, start, end, nonce
+
+def _is_scanned(ranges, start, end):
+    return any(lo <= start and end <= hi for lo, hi in ranges)
+
+def _add_range(ranges, start, end):
+    """Tambah range [start, end) lalu gabungkan range yang bersambung"""
+    ranges.append([start, end])
+    ranges.sort()
+    merged = [ranges[0]]
+    for lo, hi in ranges[1:]:
+        if lo <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], hi)
+        else:
+            merged.append([lo, hi])
+    ranges[:] = merged
+
+def _load_checkpoint(path, params):
+    """
+    Load range yang sudah di-scan; timestamp None di params diambil dari
+    checkpoint (resume tanpa --timestamp)
+    """
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        data = json.load(f)
+    if params['timestamp'] is None:
+        params['timestamp'] = data.get('params', {}).get('timestamp')
+    if data.get('params') != params:
+        raise ValueError(f"Checkpoint {path} dibuat untuk parameter genesis yang berbeda")
+    print(f"Resume dari checkpoint: {path}")
+    return {int(ts): ranges for ts, ranges in data['scanned'].items()}
+
+def _save_checkpoint(path, params, scanned):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'params': params, 'scanned': {str(ts): r for ts, r in scanned.items()}}, f)
+    os.replace(tmp_path, path)
+
+def find_genesis_parallel(version, prev_block, merkle_root, timestamp, bits,
+                          workers=None, checkpoint=None, chunk_size=CHUNK_SIZE):
+    """
+    Cari genesis dengan membagi ruang nonce ke beberapa process
+    Jika nonce untuk satu timestamp habis, lanjut ke timestamp berikutnya.
+    Range yang sudah di-scan disimpan ke file checkpoint agar bisa di-resume;
+    timestamp None = timestamp dari checkpoint (atau waktu sekarang).
+    Return (nonce, hash, timestamp) seperti find_genesis.
+    """
+    workers = workers or os.cpu_count() or 1
+    target = bits_to_target(bits)
+    target_bytes = target_to_bytes(target)
+    expected_hashes = (1 << 256) / (target + 1)
+    print(f"Target: {hex(target)}")
+    print(f"Workers: {workers}, expected hashes: {expected_hashes:.3e}")
+
+    params = {'version': version, 'prev_block': prev_block, 'merkle_root': merkle_root,
+              'timestamp': timestamp, 'bits': bits}
+    scanned = _load_checkpoint(checkpoint, params)
+    if params['timestamp'] is None:
+        params['timestamp'] = int(time.time())  # Run baru: mulai dari waktu sekarang
+    timestamp = params['timestamp']
+    print(f"Timestamp awal: {timestamp}")
+    prev_hash = little_endian(prev_block)
+    merkle = little_endian(merkle_root)
+
+    def work_units():
+        ts = timestamp
+        while True:
+            header = serialize_header(version, prev_hash, merkle, ts, bits, 0)
+            ranges = scanned.get(ts, [])
+            for start in range(0, MAX_NONCE + 1, chunk_size):
+                end = min(start + chunk_size, MAX_NONCE + 1)
+                if not _is_scanned(ranges, start, end):
+                    yield header, target_bytes, ts, start, end
+            ts += 1
+
+    start_time = time.time()
+    hashes = 0
+    last_checkpoint = start_time
+    units = work_units()
+    pool = multiprocessing.Pool(workers)
+    try:
+        # Batasi unit kerja yang sedang berjalan (generator unit tidak terbatas)
+        pending = collections.deque(
+            pool.apply_async(_scan_chunk, (next(units),)) for _ in range(workers * 2)
+        )
+        while pending:
+            ts, start, end, nonce = pending.popleft().get()
+            if nonce is not None:
+                header = serialize_header(version, prev_hash, merkle, ts, bits, 0)
+                hash_ = HeaderHasher(header).hash_nonce(nonce)[::-1]
+                print(f"✅ Found valid genesis block!")
+                print(f"Nonce: {nonce}")
+                print(f"Genesis Hash: {hash_.hex()}")
+                print(f"Timestamp: {ts}")
+                return nonce, hash_.hex(), ts
+
+            hashes += end - start
+            _add_range(scanned.setdefault(ts, []), start, end)
+
+            now = time.time()
+            rate = hashes / (now - start_time)
+            eta = expected_hashes / rate if rate else float('inf')
+            print(f"Searching... timestamp={ts} nonce={start}-{end} "
+                  f"{rate:,.0f} H/s, ETA (rata-rata): {eta:,.0f}s")
+
+            if checkpoint and now - last_checkpoint >= CHECKPOINT_INTERVAL:
+                _save_checkpoint(checkpoint, params, scanned)
+                last_checkpoint = now
+
+            pending.append(pool.apply_async(_scan_chunk, (next(units),)))
+    finally:
+        pool.terminate()
+        pool.join()
+        if checkpoint:
+            _save_checkpoint(checkpoint, params, scanned)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bitpy genesis block finder")
+    parser.add_argument('--timestamp', type=int, default=None,
+                        help="Default: dari checkpoint saat resume, selain itu waktu sekarang")
+    parser.add_argument('--bits', type=lambda x: int(x, 0), default=0x1e0ffff0)  # difficulty ringan
+    parser.add_argument('--merkle-root', default="4a5e1e4baab89f3a32518a88c31bc87f618f76673e2cc77ab2127b7afdeda33b")
+    parser.add_argument('--workers', type=int, default=1, help="Jumlah process (0 = semua core)")
+    parser.add_argument('--checkpoint', help="File checkpoint untuk resume (mode paralel)")
+    args = parser.parse_args()
+
     version = 1
     prev_block = "00" * 32
-    merkle_root = "4a5e1e4baab89f3a32518a88c31bc87f618f76673e2cc77ab2127b7afdeda33b"
-    timestamp = int(time.time())  # waktu sekarang
-    bits = 0x1e0ffff0             # difficulty ringan
-    find_genesis(version, prev_block, merkle_root, timestamp, bits)
+    if args.workers == 1 and not args.checkpoint:
+        timestamp = args.timestamp if args.timestamp is not None else int(time.time())
+        find_genesis(version, prev_block, args.merkle_root, timestamp, args.bits)
+    else:
+        find_genesis_parallel(version, prev_block, args.merkle_root, args.timestamp, args.bits,
+                              workers=args.workers or None, checkpoint=args.checkpoint)
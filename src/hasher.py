@@ -0,0 +1,99 @@
+# hasher.py
+"""
+Bitpy Header Hasher - SHA-256 midstate untuk Proof-of-Work
+"""
+
+import hashlib
+import struct
+from typing import Callable, Optional
+
+HEADER_SIZE = 80  # version(4) + prev_hash(32) + merkle_root(32) + timestamp(4) + bits(4) + nonce(4)
+MIDSTATE_SIZE = 64  # Satu blok kompresi SHA-256
+NONCE_OFFSET = 12  # Posisi nonce di dalam tail 16-byte
+DEFAULT_BATCH_SIZE = 10000  # Jumlah nonce per batch sebelum cek stop/progress
+
+_uint32 = struct.Struct('<I')
+
+class HeaderHasher:
+    """
+    Hash block header dengan SHA-256 midstate
+    
+    64 byte pertama header (version, prev hash, 28 byte awal merkle root)
+    konstan selama satu template, jadi cukup di-hash sekali. Setiap
+    percobaan hanya memproses tail 16-byte (4 byte akhir merkle root,
+    timestamp, bits, nonce) di atas salinan midstate.
+    """
+    
+    def __init__(self, header: bytes):
+        if len(header) != HEADER_SIZE:
+            raise ValueError(f"Header harus {HEADER_SIZE} bytes, bukan {len(header)}")
+        
+        self.midstate = hashlib.sha256(header[:MIDSTATE_SIZE])
+        self.tail = bytearray(header[MIDSTATE_SIZE:])
+    
+    def hash_tail(self, tail: bytes) -> bytes:
+        """Double SHA-256 header dengan tail 16-byte yang diberikan"""
+        inner = self.midstate.copy()
+        inner.update(tail)
+        return hashlib.sha256(inner.digest()).digest()
+    
+    def hash_nonce(self, nonce: int) -> bytes:
+        """Double SHA-256 header dengan nonce tertentu"""
+        _uint32.pack_into(self.tail, NONCE_OFFSET, nonce)
+        return self.hash_tail(self.tail)
+
+def serialize_header(version: int, prev_block_hash: bytes, merkle_root: bytes,
+                     timestamp: int, bits: int, nonce: int) -> bytes:
+    """Serialisasi block header 80-byte (little-endian, format Bitpy)"""
+    return (
+        struct.pack("<L", version) +
+        prev_block_hash +
+        merkle_root +
+        struct.pack("<LLL", timestamp, bits, nonce)
+    )
+
+def target_to_bytes(target: int) -> bytes:
+    """Konversi target integer ke 32-byte big-endian untuk perbandingan langsung"""
+    return min(target, (1 << 256) - 1).to_bytes(32, 'big')
+
+def search_nonce(header: bytes, target: bytes, start: int, end: int,
+                 keep_running: Optional[Callable[[], bool]] = None,
+                 on_batch: Optional[Callable[[int], None]] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 byteorder: str = 'big') -> Optional[int]:
+    """
+    Kernel pencarian nonce Proof-of-Work di range [start, end)
+    
+    target adalah hasil target_to_bytes(), dibandingkan langsung dengan hash
+    (byteorder='little' untuk hash yang dibaca terbalik seperti genesis).
+    keep_running dicek sekali per batch, on_batch menerima jumlah hash
+    yang dihitung di batch tersebut. Return nonce valid atau None.
+    """
+    hasher = HeaderHasher(header)
+    tail = hasher.tail
+    copy_midstate = hasher.midstate.copy
+    sha256 = hashlib.sha256
+    pack_into = _uint32.pack_into
+    reverse = byteorder == 'little'
+    
+    for batch_start in range(start, end, batch_size):
+        if keep_running is not None and not keep_running():
+            return None
+        
+        batch_end = min(batch_start + batch_size, end)
+        for nonce in range(batch_start, batch_end):
+            pack_into(tail, NONCE_OFFSET, nonce)
+            inner = copy_midstate()
+            inner.update(tail)
+            block_hash = sha256(inner.digest()).digest()
+            if reverse:
+                block_hash = block_hash[::-1]
+            if block_hash <= target:
+                if on_batch is not None:
+                    on_batch(nonce - batch_start + 1)
+                return nonce
+        
+        if on_batch is not None:
+            on_batch(batch_end - batch_start)
+    
+    return None
@@ -6,7 +6,7 @@ Implementasi Bitpy lengkap dalam Python dengan interface command line
 """
 
 import argparse
-import asyncio
+import shlex
 import sys
 import os
 from typing import Optional
@@ -14,19 +14,39 @@ from typing import Optional
 # Add current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from database import get_data_manager, DataManager
-from wallet import Wallet, WalletManager, format_bitpys, parse_bitpy_amount
-from mining import start_mining, stop_mining, get_mining_info
-from network import start_network_server, TransactionMempool
-from util import ByteUtils, Config
+# Subsystem (database, wallet, mining, network, ecdsa, RocksDB) di-import
+# saat pertama dipakai oleh command, bukan saat startup, supaya command
+# one-shot dari cron/Termux tidak membayar biaya load semuanya
+
+class CommandArgumentParser(argparse.ArgumentParser):
+    """ArgumentParser untuk command CLI (error tidak menutup program)"""
+    
+    def error(self, message):
+        raise ValueError(f"{self.prog}: {message}")
 
 class BitpyCLI:
     """Bitpy Command Line Interface"""
     
     def __init__(self):
-        self.data_manager = get_data_manager()
-        self.wallet_manager = WalletManager()
+        self._data_manager = None
+        self._wallet_manager = None
         self.running = True
+    
+    @property
+    def data_manager(self):
+        """DataManager (database dibuka saat pertama dipakai)"""
+        if self._data_manager is None:
+            from database import get_data_manager
+            self._data_manager = get_data_manager()
+        return self._data_manager
+    
+    @property
+    def wallet_manager(self):
+        """WalletManager (dibuat saat pertama dipakai)"""
+        if self._wallet_manager is None:
+            from wallet import WalletManager
+            self._wallet_manager = WalletManager()
+        return self._wallet_manager
         
     def print_banner(self):
         """Print welcome banner"""
@@ -55,61 +75,77 @@ class BitpyCLI:
                 if command in ['quit', 'exit', 'q']:
                     self.running = False
                     print("Goodbye! 👋")
-                    
-                elif command == 'help':
-                    self.show_help()
-                    
-                elif command == 'status':
-                    self.show_status()
-                    
-                elif command.startswith('createwallet'):
-                    self.handle_createwallet(command)
-                    
-                elif command.startswith('getbalance'):
-                    self.handle_getbalance(command)
-                    
-                elif command.startswith('send'):
-                    self.handle_send(command)
-                    
-                elif command.startswith('mine'):
-                    self.handle_mine(command)
-                    
-                elif command == 'stopmining':
-                    self.handle_stopmining()
-                    
-                elif command == 'mininginfo':
-                    self.handle_mininginfo()
-                    
-                elif command == 'getblockcount':
-                    self.handle_getblockcount()
-                    
-                elif command.startswith('getblock'):
-                    self.handle_getblock(command)
-                    
-                elif command == 'getbestblockhash':
-                    self.handle_getbestblockhash()
-                    
-                elif command.startswith('listaddresses'):
-                    self.handle_listaddresses(command)
-                    
-                elif command == 'startnode':
-                    self.handle_startnode()
-                    
-                elif command == 'getpeerinfo':
-                    self.handle_getpeerinfo()
-                    
-                elif command == 'dumpblockchain':
-                    self.handle_dumpblockchain()
-                    
                 else:
-                    print(f"Unknown command: {command}")
-                    print("Type 'help' for available commands")
+                    self.execute_command(command)
                     
             except KeyboardInterrupt:
                 print("\nUse 'quit' to exit")
             except Exception as e:
                 print(f"Error: {e}")
     
+    def execute_command(self, command: str):
+        """Jalankan satu command CLI (mode interaktif, single command, dan batch)"""
+        if command == 'help':
+            self.show_help()
+        
+        elif command == 'status':
+            self.show_status()
+        
+        elif command.startswith('createwallet'):
+            self.handle_createwallet(command)
+        
+        elif command.startswith('getbalance'):
+            self.handle_getbalance(command)
+        
+        elif command.startswith('send'):
+            self.handle_send(command)
+        
+        elif command.startswith('mine'):
+            self.handle_mine(command)
+        
+        elif command.startswith('stopmining'):
+            self.handle_stopmining(command)
+        
+        elif command == 'mininginfo':
+            self.handle_mininginfo()
+        
+        elif command == 'getblockcount':
+            self.handle_getblockcount()
+        
+        elif command.startswith('getblockbyheight'):
+            self.handle_getblockbyheight(command)
+        
+        elif command.startswith('getblockhashes'):
+            self.handle_getblockhashes(command)
+        
+        elif command.startswith('getblock'):
+            self.handle_getblock(command)
+        
+        elif command == 'getbestblockhash':
+            self.handle_getbestblockhash()
+        
+        elif command.startswith('listaddresses'):
+            self.handle_listaddresses(command)
+        
+        elif command == 'startnode':
+            self.handle_startnode()
+        
+        elif command == 'getpeerinfo':
+            self.handle_getpeerinfo()
+        
+        elif command.startswith('dumpblockchain'):
+            self.handle_dumpblockchain(command)
+        
+        elif command.startswith('rpcserver'):
+            self.handle_rpcserver(command)
+        
+        elif command.startswith('workserver'):
+            self.handle_workserver(command)
+        
+        else:
+            print(f"Unknown command: {command}")
+            print("Type 'help' for available commands")
+    
     def show_help(self):
         """Show help message"""
         print("\nAvailable Commands:")
@@ -119,19 +155,30 @@ class BitpyCLI:
         print("  getbalance [addr]         - Get balance for address")
         print("  listaddresses [wallet]    - List addresses in wallet")
         print("  send <from> <to> <amount> - Send Bitpy")
-        print("  mine <address>            - Start mining to address")
-        print("  stopmining                - Stop mining")
+        print("  mine <address> [--workers N] - Start mining to address (multiple addresses allowed)")
+        print("  stopmining [address]      - Stop mining (all addresses by default)")
         print("  mininginfo                - Show mining information")
         print("  getblockcount             - Get current block height")
         print("  getblock <hash>           - Get block information")
+        print("  getblockbyheight <height> - Get block information by height")
+        print("  getblockhashes <from> <to> - List block hashes in height range")
         print("  getbestblockhash          - Get best block hash")
         print("  startnode                 - Start P2P network node")
         print("  getpeerinfo               - Get peer information")
-        print("  dumpblockchain            - Dump blockchain info")
+        print("  dumpblockchain [--from N] [--to N] [--format text|ndjson|binary] [--output FILE]")
+        print("                            - Dump blockchain (streaming)")
+        print("  rpcserver [--host H] [--port P] - Start JSON-RPC server")
+        print("  workserver <address> [--host H] [--port P] - Serve mining work to external hashers")
         print("  quit                      - Exit Bitpy CLI")
     
     def show_status(self):
         """Show node status"""
+        from wallet import format_bitpys
+        from mining import get_mining_info
+        from script import get_signature_cache
+        from chain_index import get_address_index
+        from reward import get_supply_info
+        
         blockchain = self.data_manager.db
         wallet = self.wallet_manager.current_wallet
         
@@ -140,14 +187,19 @@ class BitpyCLI:
         print(f"Block Count:  {blockchain.get_block_count()}")
         print(f"Difficulty:   {blockchain.difficulty:08x}")
         
+        supply = get_supply_info(blockchain.get_block_height())
+        print(f"Supply:       {format_bitpys(supply['issued_supply'])} issued, "
+              f"{format_bitpys(supply['remaining_supply'])} remaining")
+        print(f"Next Reward:  {format_bitpys(supply['next_subsidy'])}")
+        
         if wallet:
             print(f"Wallet:       {wallet.name}")
             print(f"Addresses:    {len(wallet.get_addresses())}")
             
-            # Calculate total balance
+            # Calculate total balance (satu multi-get dari address index)
+            balances = get_address_index().get_balances(wallet.get_addresses())
             total_balance = 0
-            for addr in wallet.get_addresses():
-                balance = blockchain.get_balance(addr)
+            for addr, balance in balances.items():
                 total_balance += balance
                 if balance > 0:
                     print(f"  {addr}: {format_bitpys(balance)}")
@@ -160,6 +212,10 @@ class BitpyCLI:
         print(f"Mining:       {'Yes' if mining_info['mining'] else 'No'}")
         if mining_info['mining']:
             print(f"Hash Rate:    {mining_info['hash_rate']:.2f} H/s")
+        
+        sig_cache = get_signature_cache().get_stats()
+        print(f"Sig Cache:    {sig_cache['size']} entries, "
+              f"{sig_cache['hits']} hits / {sig_cache['misses']} misses")
     
     def handle_createwallet(self, command: str):
         """Handle createwallet command"""
@@ -172,12 +228,15 @@ class BitpyCLI:
     
     def handle_getbalance(self, command: str):
         """Handle getbalance command"""
+        from wallet import format_bitpys
+        from chain_index import get_address_index
+        
         parts = command.split()
         
         if len(parts) > 1:
             # Get balance for specific address
             address = parts[1]
-            balance = self.data_manager.db.get_balance(address)
+            balance = get_address_index().get_balance(address)
             print(f"Balance for {address}: {format_bitpys(balance)}")
         else:
             # Get balance for current wallet
@@ -186,10 +245,10 @@ class BitpyCLI:
                 print("No wallet loaded. Use 'createwallet' first.")
                 return
             
+            balances = get_address_index().get_balances(wallet.get_addresses())
             total_balance = 0
             print(f"Balances for wallet '{wallet.name}':")
-            for addr in wallet.get_addresses():
-                balance = self.data_manager.db.get_balance(addr)
+            for addr, balance in balances.items():
                 total_balance += balance
                 print(f"  {addr}: {format_bitpys(balance)}")
             
@@ -197,6 +256,8 @@ class BitpyCLI:
     
     def handle_send(self, command: str):
         """Handle send command"""
+        from wallet import format_bitpys, parse_bitpy_amount
+        
         parts = command.split()
         if len(parts) != 4:
             print("Usage: send <from_address> <to_address> <amount>")
@@ -231,8 +292,10 @@ class BitpyCLI:
                 print(f"To: {to_addr}")
                 
                 # Add to mempool (simulated)
-                self.data_manager.db.mempool.add_transaction(transaction)
-                print("Transaction added to mempool")
+                if self.data_manager.db.mempool.add_transaction(transaction) is False:
+                    print("❌ Transaction rejected by mempool")
+                else:
+                    print("Transaction added to mempool")
             else:
                 print("❌ Failed to create transaction")
                 
@@ -240,35 +303,62 @@ class BitpyCLI:
             print(f"Error: {e}")
     
     def handle_mine(self, command: str):
-        """Handle mine command"""
-        parts = command.split()
-        if len(parts) != 2:
-            print("Usage: mine <address>")
+        """Handle mine command (address lain yang sedang mining tetap jalan)"""
+        from mining import start_mining
+        
+        parser = CommandArgumentParser(prog='mine', add_help=False)
+        parser.add_argument('address')
+        parser.add_argument('--workers', type=int, default=None)
+        try:
+            args = parser.parse_args(shlex.split(command)[1:])
+        except ValueError:
+            print("Usage: mine <address> [--workers N]")
             return
         
-        address = parts[1]
-        print(f"🚀 Starting mining to address: {address}")
-        print("Press Ctrl+C to stop mining")
+        # Start mining in background (ditolak jika sudah jalan atau core tidak cukup)
+        if not start_mining(args.address, args.workers):
+            print(f"❌ Mining not started for address: {args.address}")
+            return
         
-        # Start mining in background
-        start_mining(address)
+        print(f"🚀 Starting mining to address: {args.address}")
+        print("Press Ctrl+C to stop mining")
     
-    def handle_stopmining(self):
-        """Handle stopmining command"""
-        stop_mining()
+    def handle_stopmining(self, command: str):
+        """Handle stopmining command (semua address, atau satu address)"""
+        from mining import stop_mining
+        
+        parts = command.split()
+        stop_mining(parts[1] if len(parts) > 1 else None)
         print("⛔ Mining stopped")
     
     def handle_mininginfo(self):
         """Handle mininginfo command"""
+        from mining import get_mining_info
+        
         info = get_mining_info()
         print("\n=== MINING INFORMATION ===")
         print(f"Mining:      {'Yes' if info['mining'] else 'No'}")
-        if info['mining']:
-            print(f"Address:     {info['miner_address']}")
-            print(f"Hash Rate:   {info['hash_rate']:.2f} H/s")
-            print(f"Found Blocks: {info['found_blocks']}")
-            print(f"Current Block: {info['current_block']}")
-            print(f"Difficulty:  {info['difficulty']:08x}")
+        if not info['mining']:
+            return
+        
+        print(f"Addresses:   {info['miners']} ({info['workers']} / {info['total_cores']} cores)")
+        print(f"Hash Rate:   {info['hash_rate']:.2f} H/s (total, 1m)")
+        print(f"Found Blocks: {info['found_blocks']} (stale: {info['stale_shares']})")
+        
+        for address, miner_info in info['addresses'].items():
+            print(f"\n  Address:     {address}")
+            print(f"  Hash Rate:   {miner_info['hash_rate_1m']:.2f} / {miner_info['hash_rate_5m']:.2f} / "
+                  f"{miner_info['hash_rate_15m']:.2f} H/s (1m / 5m / 15m)")
+            print(f"  Workers:     {miner_info['workers']} "
+                  f"({', '.join(f'{rate:.0f}' for rate in miner_info['worker_hash_rates'])} H/s)")
+            print(f"  Found Blocks: {miner_info['found_blocks']} (stale: {miner_info['stale_shares']})")
+            print(f"  Time to Template: {miner_info['last_time_to_template']:.3f}s")
+            print(f"  Relayed:     {miner_info['relayed_blocks']} (queue: {miner_info['submit_queue']}, "
+                  f"latency: {miner_info['avg_relay_latency'] * 1000:.1f} ms avg)")
+            print(f"  Current Block: {miner_info['current_block']}")
+            print(f"  Bits:        {miner_info['bits']:08x}")
+            print(f"  Target:      {miner_info['target']}")
+            print(f"  Difficulty:  {miner_info['difficulty']:.6f}")
     
     def handle_getblockcount(self):
         """Handle getblockcount command"""
@@ -277,6 +367,8 @@ class BitpyCLI:
     
     def handle_getblock(self, command: str):
         """Handle getblock command"""
+        from chain_index import get_height_index
+        
         parts = command.split()
         if len(parts) != 2:
             print("Usage: getblock <hash>")
@@ -286,25 +378,59 @@ class BitpyCLI:
         block = self.data_manager.db.get_block(block_hash)
         
         if block:
-            print(f"\n=== BLOCK {block_hash} ===")
-            print(f"Height:       {self.data_manager.db.get_block_height()}")
-            print(f"Version:      {block.header.version}")
-            print(f"Prev Hash:    {block.header.prev_block_hash.hex()}")
-            print(f"Merkle Root:  {block.header.merkle_root.hex()}")
-            print(f"Timestamp:    {block.header.timestamp}")
-            print(f"Bits:         {block.header.bits:08x}")
-            print(f"Nonce:        {block.header.nonce}")
-            print(f"Transactions: {len(block.transactions)}")
-            
-            # Show first few transactions
-            for i, tx in enumerate(block.transactions[:3]):
-                print(f"  TX {i}: {tx.get_txid_hex()}")
-            
-            if len(block.transactions) > 3:
-                print(f"  ... and {len(block.transactions) - 3} more transactions")
+            self._print_block(block_hash, block, get_height_index().get_height(block_hash))
         else:
             print(f"Block not found: {block_hash}")
     
+    def handle_getblockbyheight(self, command: str):
+        """Handle getblockbyheight command"""
+        from chain_index import get_height_index
+        
+        parts = command.split()
+        if len(parts) != 2 or not parts[1].isdigit():
+            print("Usage: getblockbyheight <height>")
+            return
+        
+        height = int(parts[1])
+        block_hash = get_height_index().get_hash(height)
+        block = self.data_manager.db.get_block(block_hash) if block_hash else None
+        
+        if block:
+            self._print_block(block_hash, block, height)
+        else:
+            print(f"Block not found at height: {height}")
+    
+    def handle_getblockhashes(self, command: str):
+        """Handle getblockhashes command"""
+        from chain_index import get_height_index
+        
+        parts = command.split()
+        if len(parts) != 3 or not parts[1].isdigit() or not parts[2].isdigit():
+            print("Usage: getblockhashes <from_height> <to_height>")
+            return
+        
+        for height, block_hash in get_height_index().get_hashes(int(parts[1]), int(parts[2])):
+            print(f"{height}: {block_hash}")
+    
+    def _print_block(self, block_hash: str, block, height: Optional[int]):
+        """Print informasi block"""
+        print(f"\n=== BLOCK {block_hash} ===")
+        print(f"Height:       {height if height is not None else 'unknown'}")
+        print(f"Version:      {block.header.version}")
+        print(f"Prev Hash:    {block.header.prev_block_hash.hex()}")
+        print(f"Merkle Root:  {block.header.merkle_root.hex()}")
+        print(f"Timestamp:    {block.header.timestamp}")
+        print(f"Bits:         {block.header.bits:08x}")
+        print(f"Nonce:        {block.header.nonce}")
+        print(f"Transactions: {len(block.transactions)}")
+        
+        # Show first few transactions
+        for i, tx in enumerate(block.transactions[:3]):
+            print(f"  TX {i}: {tx.get_txid_hex()}")
+        
+        if len(block.transactions) > 3:
+            print(f"  ... and {len(block.transactions) - 3} more transactions")
+    
     def handle_getbestblockhash(self):
         """Handle getbestblockhash command"""
         best_block = self.data_manager.db.get_best_block()
@@ -315,6 +441,9 @@ class BitpyCLI:
     
     def handle_listaddresses(self, command: str):
         """Handle listaddresses command"""
+        from wallet import format_bitpys
+        from chain_index import get_address_index
+        
         parts = command.split()
         wallet_name = parts[1] if len(parts) > 1 else "default"
         
@@ -324,25 +453,60 @@ class BitpyCLI:
             return
         
         print(f"Addresses in wallet '{wallet_name}':")
-        for addr in wallet.get_addresses():
-            balance = self.data_manager.db.get_balance(addr)
+        balances = get_address_index().get_balances(wallet.get_addresses())
+        for addr, balance in balances.items():
             print(f"  {addr} - {format_bitpys(balance)}")
     
     async def handle_startnode(self):
         """Handle startnode command"""
+        import asyncio
+        import inspect
+        from network import start_network_server
+        from block_submitter import set_network_server, clear_network_server
+        from chain_index import get_address_index, get_height_index
+        from mempool_index import IndexedMempool
+        from reward import attach_coinbase_check
+        from script_validator import get_script_validator
+        from util import Config
+        
         print("Starting P2P network node...")
+        blockchain = self.data_manager.db
+        
+        # Hook save_block, jalan sesuai urutan pendaftaran (lihat chain_hooks):
+        #   validator: script input (UTXO dari address index, jika ENFORCE_SCRIPTS),
+        #              lalu nilai coinbase (subsidy + fee)
+        #   callback:  address index, height index, lalu mempool
+        #              (transaksi block dihapus setelah semua index di-update)
+        get_script_validator().attach(blockchain)
+        attach_coinbase_check(blockchain)
+        get_address_index()
+        get_height_index()
         
-        # Initialize mempool
-        mempool = TransactionMempool()
-        self.data_manager.db.mempool = mempool
+        # Initialize mempool (dengan fee-rate index untuk mining)
+        mempool = IndexedMempool()
+        mempool.attach(blockchain)
+        blockchain.mempool = mempool
+        
+        # Block hasil mining di-relay lewat server, didaftarkan lewat callback
+        # on_ready(server) begitu server listen (start_network_server blocking)
+        loop = asyncio.get_running_loop()
+        relay_options = {}
+        if 'on_ready' in inspect.signature(start_network_server).parameters:
+            relay_options['on_ready'] = lambda server: set_network_server(server, loop)
+        else:
+            print("⚠️  Network layer tidak mendukung on_ready, relay block hasil mining nonaktif")
         
         # Start network server
-        await start_network_server(
-            blockchain=self.data_manager.db,
-            mempool=mempool,
-            host='0.0.0.0',
-            port=Config.DEFAULT_PORT
-        )
+        try:
+            await start_network_server(
+                blockchain=blockchain,
+                mempool=mempool,
+                host='0.0.0.0',
+                port=Config.DEFAULT_PORT,
+                **relay_options
+            )
+        finally:
+            clear_network_server()
     
     def handle_getpeerinfo(self):
         """Handle getpeerinfo command"""
@@ -350,20 +514,79 @@ class BitpyCLI:
         print("Peer information not available in standalone mode")
         print("Use 'startnode' to enable P2P networking")
     
-    def handle_dumpblockchain(self):
-        """Handle dumpblockchain command"""
-        print("\n=== BLOCKCHAIN DUMP ===")
-        blockchain = self.data_manager.db
+    def handle_dumpblockchain(self, command: str):
+        """Handle dumpblockchain command (streaming, urut height)"""
+        from chain_index import get_height_index
+        from chain_dump import DUMP_FORMATS, dump_blocks
         
-        for i, block_hash in enumerate(blockchain.blocks.keys()):
-            block = blockchain.blocks[block_hash]
-            print(f"Block {i}: {block_hash}")
-            print(f"  Transactions: {len(block.transactions)}")
-            print(f"  Timestamp: {block.header.timestamp}")
-            
-            if i >= 10:  # Show only first 10 blocks
-                print(f"... and {len(blockchain.blocks) - 10} more blocks")
-                break
+        parser = CommandArgumentParser(prog='dumpblockchain', add_help=False)
+        parser.add_argument('--from', dest='start', type=int, default=0)
+        parser.add_argument('--to', dest='end', type=int, default=None)
+        parser.add_argument('--format', choices=DUMP_FORMATS, default='text')
+        parser.add_argument('--output', default=None)
+        args = parser.parse_args(shlex.split(command)[1:])
+        
+        records = get_height_index().iter_blocks(self.data_manager.db, args.start, args.end)
+        binary = args.format == 'binary'
+        
+        if args.output:
+            with open(args.output, 'wb' if binary else 'w') as output:
+                count = dump_blocks(records, output, args.format)
+            print(f"Dumped {count} blocks to {args.output}")
+        else:
+            if args.format == 'text':
+                print("\n=== BLOCKCHAIN DUMP ===")
+            dump_blocks(records, sys.stdout.buffer if binary else sys.stdout, args.format)
+    
+    def handle_rpcserver(self, command: str):
+        """Handle rpcserver command (blocking sampai Ctrl+C)"""
+        from rpc import RPCServer, DEFAULT_RPC_HOST, DEFAULT_RPC_PORT
+        
+        parser = CommandArgumentParser(prog='rpcserver', add_help=False)
+        parser.add_argument('--host', default=DEFAULT_RPC_HOST)
+        parser.add_argument('--port', type=int, default=DEFAULT_RPC_PORT)
+        args = parser.parse_args(shlex.split(command)[1:])
+        
+        server = RPCServer(self.data_manager, self.wallet_manager, args.host, args.port)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nJSON-RPC server stopped")
+        finally:
+            server.close()
+
+    def handle_workserver(self, command: str):
+        """Handle workserver command (blocking sampai Ctrl+C)"""
+        import asyncio
+        from work_server import WorkServer, DEFAULT_WORK_HOST, DEFAULT_WORK_PORT
+        
+        parser = CommandArgumentParser(prog='workserver', add_help=False)
+        parser.add_argument('address')
+        parser.add_argument('--host', default=DEFAULT_WORK_HOST)
+        parser.add_argument('--port', type=int, default=DEFAULT_WORK_PORT)
+        args = parser.parse_args(shlex.split(command)[1:])
+        
+        server = WorkServer(args.address, args.host, args.port)
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            print("\nWork server stopped")
+
+def run_batch(cli: BitpyCLI, source: str):
+    """Jalankan command per baris dari file (atau stdin jika source '-')"""
+    stream = sys.stdin if source == '-' else open(source)
+    try:
+        for line in stream:
+            command = line.strip()
+            if not command or command.startswith('#'):
+                continue
+            try:
+                cli.execute_command(command)
+            except Exception as e:
+                print(f"Error: {e}")
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
 
 def main():
     """Main function"""
@@ -371,13 +594,18 @@ def main():
     
     # Handle command line arguments
     if len(sys.argv) > 1:
+        if sys.argv[1] == '--batch':
+            # Batch mode: bitpy --batch <file|->
+            run_batch(cli, sys.argv[2] if len(sys.argv) > 2 else '-')
+            return
+        
         # Single command mode
-        command = ' '.join(sys.argv[1:])
+        command = shlex.join(sys.argv[1:])
         if command == 'startnode':
+            import asyncio
             asyncio.run(cli.handle_startnode())
         else:
-            print(f"Single command mode not implemented for: {command}")
-            print("Run without arguments for interactive mode")
+            cli.execute_command(command)
     else:
         # Interactive mode
         cli.run()
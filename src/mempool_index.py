@@ -0,0 +1,329 @@
+# mempool_index.py
+"""
+Bitpy Mempool Index - fee-rate priority index untuk pemilihan transaksi block
+"""
+
+import heapq
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from block import Block
+from chain_hooks import get_chain_hooks
+from transaction import Transaction
+from network import TransactionMempool
+
+MAX_BLOCK_SIZE = 4 * 1000 * 1000  # 4 MB (TECHNICAL_SPEC)
+COINBASE_RESERVED_SIZE = 1000  # Ruang untuk header + coinbase transaction
+MAX_CONSECUTIVE_FAILURES = 1000  # Berhenti jika block hampir penuh dan paket terus tidak muat
+BLOCK_FULL_MARGIN = 4000  # Sisa ruang (bytes) yang dianggap "hampir penuh"
+
+class MempoolEntry:
+    """Transaksi di mempool beserta statistik paket ancestor-nya"""
+    
+    __slots__ = ('txid', 'tx', 'fee', 'size', 'sequence', 'parents', 'children',
+                 'ancestor_fee', 'ancestor_size', 'version')
+    
+    def __init__(self, tx: Transaction, txid: bytes, fee: int, size: int, sequence: int):
+        self.txid = txid
+        self.tx = tx
+        self.fee = fee
+        self.size = size
+        self.sequence = sequence  # Urutan masuk (parent selalu lebih dulu dari child)
+        self.parents: Set[bytes] = set()
+        self.children: Set[bytes] = set()
+        self.ancestor_fee = fee
+        self.ancestor_size = size
+        self.version = 0
+    
+    @property
+    def ancestor_fee_rate(self) -> float:
+        """Fee rate paket (transaksi + semua ancestor di mempool)"""
+        return self.ancestor_fee / self.ancestor_size
+
+class FeeRateIndex:
+    """
+    Priority index mempool berdasarkan fee rate paket ancestor
+    
+    Heap menyimpan (-fee_rate, sequence, version, txid) dengan lazy deletion:
+    entry dengan version lama diabaikan saat di-pop. Pemilihan template
+    hanya mem-pop k kandidat teratas (O(k log n)), tanpa scan/sort seluruh pool.
+    """
+    
+    def __init__(self):
+        self.entries: Dict[bytes, MempoolEntry] = {}
+        self._heap: List[Tuple[float, int, int, bytes]] = []
+        self._sequence = 0
+        self.revision = 0  # Bertambah setiap isi index berubah
+        self._lock = threading.RLock()
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def __contains__(self, txid: bytes) -> bool:
+        return txid in self.entries
+    
+    def add(self, tx: Transaction, fee: int = 0, size: Optional[int] = None,
+            depends: Optional[Iterable[bytes]] = None) -> bool:
+        """
+        Tambah transaksi ke index
+        depends: txid parent; default diambil dari input yang mereferensikan
+        transaksi lain di mempool
+        """
+        txid = tx.get_txid()
+        with self._lock:
+            if txid in self.entries:
+                return False
+            
+            if size is None:
+                size = len(tx.serialize())
+            if depends is None:
+                depends = [txin.prev_tx_hash for txin in tx.inputs]
+            
+            entry = MempoolEntry(tx, txid, fee, max(size, 1), self._sequence)
+            self._sequence += 1
+            entry.parents = {parent for parent in depends if parent in self.entries}
+            for parent in entry.parents:
+                self.entries[parent].children.add(txid)
+            
+            self.entries[txid] = entry
+            self._update_ancestor_state(entry)
+            self.revision += 1
+            return True
+    
+    def remove(self, txid: bytes) -> Optional[Transaction]:
+        """Hapus transaksi (contoh: sudah masuk block) dan update skor descendant"""
+        with self._lock:
+            entry = self.entries.get(txid)
+            if not entry:
+                return None
+            
+            descendants = self._descendants(entry)
+            del self.entries[txid]
+            for parent in entry.parents:
+                self.entries[parent].children.discard(txid)
+            for child in entry.children:
+                self.entries[child].parents.discard(txid)
+            
+            for descendant in descendants:
+                self._update_ancestor_state(self.entries[descendant])
+            self.revision += 1
+            return entry.tx
+    
+    def select_transactions(self, max_size: int = MAX_BLOCK_SIZE - COINBASE_RESERVED_SIZE) -> List[Transaction]:
+        """
+        Pilih transaksi untuk template block berdasarkan fee rate paket
+        Ancestor selalu dimasukkan sebelum descendant-nya
+        """
+        with self._lock:
+            selected: List[Transaction] = []
+            included: Set[bytes] = set()
+            skipped: Set[bytes] = set()
+            popped: List[Tuple[float, int, int, bytes]] = []
+            # Skor paket yang berubah karena sebagian ancestor sudah masuk block
+            modified: Dict[bytes, Tuple[int, int]] = {}
+            modified_heap: List[Tuple[float, int, int, int, bytes]] = []
+            total_size = 0
+            failures = 0
+            
+            while total_size < max_size:
+                main_top = self._peek_main(included, skipped, modified, popped)
+                modified_top = self._peek_modified(included, skipped, modified, modified_heap)
+                if main_top is None and modified_top is None:
+                    break
+                
+                if modified_top is None or (main_top is not None and main_top[0] <= modified_top[0]):
+                    txid = heapq.heappop(self._heap)[3]
+                    popped.append(main_top)
+                else:
+                    txid = heapq.heappop(modified_heap)[4]
+                
+                package = self._package(self.entries[txid], included)
+                package_size = sum(self.entries[member].size for member in package)
+                if total_size + package_size > max_size:
+                    skipped.add(txid)
+                    failures += 1
+                    if failures >= MAX_CONSECUTIVE_FAILURES and total_size > max_size - BLOCK_FULL_MARGIN:
+                        break
+                    continue
+                
+                failures = 0
+                total_size += package_size
+                for member in package:
+                    included.add(member)
+                    selected.append(self.entries[member].tx)
+                for member in package:
+                    self._update_modified(self.entries[member], included, modified, modified_heap)
+            
+            # Kembalikan kandidat yang masih valid ke heap utama
+            for item in popped:
+                heapq.heappush(self._heap, item)
+            return selected
+    
+    def _peek_main(self, included, skipped, modified, popped):
+        """Top heap utama yang masih valid (entry lama dibuang permanen)"""
+        while self._heap:
+            _, _, version, txid = self._heap[0]
+            entry = self.entries.get(txid)
+            if entry is None or entry.version != version:
+                heapq.heappop(self._heap)
+                continue
+            if txid in included or txid in skipped or txid in modified:
+                popped.append(heapq.heappop(self._heap))
+                continue
+            return self._heap[0]
+        return None
+    
+    def _peek_modified(self, included, skipped, modified, modified_heap):
+        """Top heap paket termodifikasi yang masih valid"""
+        while modified_heap:
+            _, _, fee, size, txid = modified_heap[0]
+            if txid in included or txid in skipped or modified.get(txid) != (fee, size):
+                heapq.heappop(modified_heap)
+                continue
+            return modified_heap[0]
+        return None
+    
+    def _update_modified(self, entry: MempoolEntry, included: Set[bytes],
+                         modified: Dict[bytes, Tuple[int, int]], modified_heap: list):
+        """Hitung ulang paket descendant yang ancestor-nya baru masuk block"""
+        for txid in self._descendants(entry):
+            if txid in included:
+                continue
+            package = self._package(self.entries[txid], included)
+            fee = sum(self.entries[member].fee for member in package)
+            size = sum(self.entries[member].size for member in package)
+            modified[txid] = (fee, size)
+            heapq.heappush(modified_heap, (-fee / size, self.entries[txid].sequence, fee, size, txid))
+    
+    def _package(self, entry: MempoolEntry, included: Set[bytes]) -> List[bytes]:
+        """Ancestor yang belum masuk block + transaksi itu sendiri, urut topologis"""
+        members = [txid for txid in self._ancestors(entry) if txid not in included]
+        members.sort(key=lambda txid: self.entries[txid].sequence)
+        members.append(entry.txid)
+        return members
+    
+    def _ancestors(self, entry: MempoolEntry) -> Set[bytes]:
+        """Semua ancestor transaksi di mempool"""
+        result: Set[bytes] = set()
+        stack = list(entry.parents)
+        while stack:
+            txid = stack.pop()
+            if txid not in result:
+                result.add(txid)
+                stack.extend(self.entries[txid].parents)
+        return result
+    
+    def _descendants(self, entry: MempoolEntry) -> Set[bytes]:
+        """Semua descendant transaksi di mempool"""
+        result: Set[bytes] = set()
+        stack = list(entry.children)
+        while stack:
+            txid = stack.pop()
+            if txid not in result:
+                result.add(txid)
+                stack.extend(self.entries[txid].children)
+        return result
+    
+    def _update_ancestor_state(self, entry: MempoolEntry):
+        """Hitung ulang statistik paket ancestor dan push skor baru ke heap"""
+        ancestors = [self.entries[txid] for txid in self._ancestors(entry)]
+        entry.ancestor_fee = entry.fee + sum(a.fee for a in ancestors)
+        entry.ancestor_size = entry.size + sum(a.size for a in ancestors)
+        entry.version += 1
+        heapq.heappush(self._heap, (-entry.ancestor_fee_rate, entry.sequence, entry.version, entry.txid))
+
+class IndexedMempool(TransactionMempool):
+    """
+    TransactionMempool dengan fee-rate index untuk template mining
+    
+    Fee dihitung dan script input diverifikasi saat transaksi masuk, dari
+    output yang dibelanjakan (transaksi parent di mempool atau UTXO di
+    address index). Transaksi yang masuk block dihapus setelah block disimpan
+    (lihat attach).
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fee_index = FeeRateIndex()
+    
+    @property
+    def revision(self) -> int:
+        """Penanda perubahan isi mempool (dipakai template manager)"""
+        return self.fee_index.revision
+    
+    def attach(self, blockchain):
+        """Hapus transaksi block dari mempool setiap kali block disimpan"""
+        get_chain_hooks(blockchain).add_callback('mempool', self.remove_block_transactions)
+    
+    def add_transaction(self, transaction: Transaction, depends: Optional[Iterable[bytes]] = None):
+        """
+        Tambah transaksi ke mempool dan fee-rate index
+        Ditolak (False) jika ada input yang tidak ditemukan, output melebihi
+        input, atau script input tidak valid (ENFORCE_SCRIPTS). Signature yang valid masuk
+        signature cache, jadi tidak diverifikasi ulang saat block disimpan
+        """
+        from script_validator import ENFORCE_SCRIPTS, get_script_validator, transaction_jobs
+        
+        prevouts = self._get_prevouts(transaction)
+        if prevouts is None:
+            return False
+        fee = sum(value for value, _ in prevouts) - sum(txout.value for txout in transaction.outputs)
+        if fee < 0:
+            return False
+        
+        if ENFORCE_SCRIPTS:
+            jobs = transaction_jobs(transaction, [script_pubkey for _, script_pubkey in prevouts])
+            if not all(get_script_validator().validate(jobs, parallel=False)):
+                return False
+        
+        result = super().add_transaction(transaction)
+        if result is not False:
+            self.fee_index.add(transaction, fee=fee, depends=depends)
+        return result
+    
+    def get_fee(self, transaction: Transaction) -> Optional[int]:
+        """Total nilai input - total output (None jika ada input yang tidak ditemukan)"""
+        prevouts = self._get_prevouts(transaction)
+        if prevouts is None:
+            return None
+        return sum(value for value, _ in prevouts) - sum(txout.value for txout in transaction.outputs)
+    
+    def _get_prevouts(self, transaction: Transaction) -> Optional[List[Tuple[int, bytes]]]:
+        """
+        (value, script_pubkey) output yang dibelanjakan setiap input, dari
+        transaksi parent di mempool atau UTXO di address index
+        """
+        from chain_index import get_address_index
+        
+        address_index = get_address_index()
+        prevouts = []
+        for txin in transaction.inputs:
+            parent = self.fee_index.entries.get(txin.prev_tx_hash)
+            if parent is not None:
+                outputs = parent.tx.outputs
+                if txin.prev_output_index >= len(outputs):
+                    return None
+                txout = outputs[txin.prev_output_index]
+                prevouts.append((txout.value, txout.script_pubkey))
+                continue
+            output = address_index.get_output((txin.prev_tx_hash, txin.prev_output_index))
+            if output is None:
+                return None
+            prevouts.append(output)
+        return prevouts
+    
+    def remove_transaction(self, txid: bytes):
+        """Hapus transaksi dari mempool dan fee-rate index"""
+        result = super().remove_transaction(txid)
+        self.fee_index.remove(txid)
+        return result
+    
+    def remove_block_transactions(self, block: Block):
+        """Hapus transaksi yang sudah masuk block"""
+        for tx in block.transactions:
+            txid = tx.get_txid()
+            if txid in self.fee_index:
+                self.remove_transaction(txid)
+    
+    def select_transactions(self, max_size: int = MAX_BLOCK_SIZE - COINBASE_RESERVED_SIZE) -> List[Transaction]:
+        """Pilih transaksi untuk template block (fee rate paket tertinggi dulu)"""
+        return self.fee_index.select_transactions(max_size)
@@ -0,0 +1,126 @@
+# merkle.py
+"""
+Bitpy Merkle Cache - update merkle root tanpa menghitung ulang seluruh tree
+"""
+
+from typing import List, Optional
+from crypto import CryptoUtils
+
+class MerkleCache:
+    """
+    Merkle tree dengan cache node interior
+    
+    Mengikuti aturan MerkleTree (node ganjil terakhir diduplikasi).
+    Append, replace, dan truncate hanya menghitung ulang path dari leaf ke
+    root, jadi setiap operasi O(log n) hash.
+    """
+    
+    def __init__(self, tx_hashes: Optional[List[bytes]] = None):
+        # levels[0] = leaf (txid), levels[-1] = [root]
+        self.levels: List[List[bytes]] = [[]]
+        for tx_hash in tx_hashes or []:
+            self.append(tx_hash)
+    
+    def __len__(self) -> int:
+        return len(self.levels[0])
+    
+    @property
+    def leaves(self) -> List[bytes]:
+        return self.levels[0]
+    
+    @property
+    def root(self) -> bytes:
+        """Merkle root saat ini"""
+        if not self.levels[0]:
+            return b'\x00' * 32
+        return self.levels[-1][0]
+    
+    def append(self, tx_hash: bytes):
+        """Tambah transaksi di akhir tree"""
+        self.levels[0].append(tx_hash)
+        self._update_path(len(self.levels[0]) - 1)
+    
+    def replace(self, index: int, tx_hash: bytes):
+        """Ganti transaksi di posisi index (contoh: coinbase di index 0)"""
+        self.levels[0][index] = tx_hash
+        self._update_path(index)
+    
+    def truncate(self, size: int):
+        """Buang semua transaksi mulai dari posisi size"""
+        if size >= len(self.levels[0]):
+            return
+        
+        del self.levels[0][size:]
+        level_size = size
+        for level in self.levels[1:]:
+            level_size = (level_size + 1) // 2
+            del level[level_size:]
+        while len(self.levels) > 1 and len(self.levels[-2]) <= 1:
+            self.levels.pop()
+        
+        if size > 0:
+            self._update_path(size - 1)
+    
+    def update(self, tx_hashes: List[bytes]):
+        """
+        Samakan isi tree dengan tx_hashes
+        Coinbase (index 0) diganti terpisah, jadi template baru dengan coinbase
+        berbeda tetap memakai ulang node dari transaksi mempool yang sama
+        """
+        if not tx_hashes:
+            self.truncate(0)
+            return
+        
+        leaves = self.levels[0]
+        common = 1
+        limit = min(len(leaves), len(tx_hashes))
+        while common < limit and leaves[common] == tx_hashes[common]:
+            common += 1
+        
+        self.truncate(common)
+        for tx_hash in tx_hashes[len(self.levels[0]):]:
+            self.append(tx_hash)
+        if self.levels[0][0] != tx_hashes[0]:
+            self.replace(0, tx_hashes[0])
+    
+    def get_branch(self, index: int = 0) -> List[bytes]:
+        """Merkle branch (sibling hash di setiap level) untuk transaksi di posisi index"""
+        branch = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            branch.append(level[sibling] if sibling < len(level) else level[index])
+            index //= 2
+        return branch
+    
+    def _update_path(self, index: int):
+        """Hitung ulang node dari leaf di posisi index sampai root"""
+        depth = 0
+        while len(self.levels[depth]) > 1:
+            level = self.levels[depth]
+            if depth + 1 == len(self.levels):
+                self.levels.append([])
+            parent_level = self.levels[depth + 1]
+            
+            parent = index // 2
+            left = level[parent * 2]
+            right = level[parent * 2 + 1] if parent * 2 + 1 < len(level) else left
+            node = CryptoUtils.double_sha256(left + right)
+            
+            if parent < len(parent_level):
+                parent_level[parent] = node
+            else:
+                parent_level.append(node)
+            
+            index = parent
+            depth += 1
+
+def merkle_root_from_branch(tx_hash: bytes, branch: List[bytes], index: int = 0) -> bytes:
+    """Hitung merkle root dari hash transaksi dan merkle branch-nya (O(log n) hash)"""
+    node = tx_hash
+    for sibling in branch:
+        if index & 1:
+            node = CryptoUtils.double_sha256(sibling + node)
+        else:
+            node = CryptoUtils.double_sha256(node + sibling)
+        index >>= 1
+    return node
@@ -1,24 +1,230 @@
 # mining.py
+import os
 import time
+import struct
 import threading
-from typing import List, Optional
-from crypto import CryptoUtils, MerkleTree
-from util import ByteUtils, Config, TimeUtils
+import multiprocessing
+from typing import Callable, Dict, List, Optional, Tuple
+from util import TimeUtils
 from block import Block, BlockHeader
 from transaction import Transaction, TransactionBuilder
 from database import get_data_manager
+from hasher import search_nonce, target_to_bytes
+from merkle import MerkleCache, merkle_root_from_branch
+from template_manager import BlockTemplate, TemplateManager, DEFAULT_MIN_REFRESH_INTERVAL
+from mining_stats import MiningStats, format_prometheus, target_to_difficulty
+from block_submitter import BlockSubmitter
+from reward import get_block_subsidy
+
+MAX_NONCE = 0xFFFFFFFF  # 4-byte nonce
+POLL_INTERVAL = 0.1  # Interval polling hasil worker (detik)
+
+# State worker process (diset oleh _init_worker di setiap process pool)
+_worker_stop_event = None
+_worker_hash_counts = None
+
+def _init_worker(stop_event, hash_counts):
+    """Initializer untuk worker process di mining pool"""
+    global _worker_stop_event, _worker_hash_counts
+    _worker_stop_event = stop_event
+    _worker_hash_counts = hash_counts
+
+def _mine_nonce_range(header: bytes, target: bytes, start: int, end: int, worker_id: int) -> Optional[int]:
+    """
+    Cari nonce valid di range [start, end) (dijalankan di worker process)
+    Header adalah serialisasi 80-byte, nonce berada di 4 byte terakhir
+    """
+    def add_hashes(count: int):
+        _worker_hash_counts[worker_id] += count
+        
+    return search_nonce(
+        header, target, start, end,
+        keep_running=lambda: not _worker_stop_event.is_set(),
+        on_batch=add_hashes
+    )
+
+def _split_nonce_range(start: int, end: int, parts: int) -> List[Tuple[int, int]]:
+    """Bagi range nonce [start, end) menjadi beberapa bagian yang tidak overlap"""
+    size = max(1, (end - start + parts - 1) // parts)
+    return [(lo, min(lo + size, end)) for lo in range(start, end, size)]
+
+def create_coinbase_transaction(miner_address: str, block_height: Optional[int] = None,
+                                extranonce: int = 0) -> Transaction:
+    """Buat coinbase transaction (mining reward)"""
+    if block_height is None:
+        data_manager = get_data_manager()
+        block_height = data_manager.db.get_block_height() + 1
+    
+    # Hitung block reward (mengikuti Bitpy halving schedule, lookup tabel O(1))
+    reward = get_block_subsidy(block_height)
+    
+    # Extra data (bisa berisi apa saja) + 8-byte extranonce
+    extra_data = f"Python Bitpy Miner - Block {block_height}".encode()
+    extra_data += struct.pack('<Q', extranonce)
+    
+    return TransactionBuilder.create_coinbase_transaction(
+        block_height=block_height,
+        miner_address=miner_address,
+        reward=reward,
+        extra_data=extra_data
+    )
+
+class TemplateBuilder:
+    """
+    Pembangun template block dasar beserta template manager-nya
+    
+    Dimiliki satu Miner, atau dipakai bersama banyak Miner lewat
+    SharedTemplatePipeline (coinbase template dasar dibayar ke
+    coinbase_address, setiap miner menggantinya dengan address sendiri).
+    Tip template adalah block sendiri yang masih di queue submitter,
+    atau best block.
+    """
+    
+    def __init__(self, coinbase_address: str,
+                 on_template: Optional[Callable[[BlockTemplate], None]] = None,
+                 min_refresh_interval: float = DEFAULT_MIN_REFRESH_INTERVAL):
+        self.coinbase_address = coinbase_address
+        
+        # Cache merkle tree, dipakai ulang antar template
+        self.merkle_cache = MerkleCache()
+        
+        # Block sendiri (block, height) yang belum tersimpan
+        self._submitted_tip: Optional[Tuple[Block, int]] = None
+        self._lock = threading.Lock()
+        
+        self.template_manager = TemplateManager(
+            build_template=self.create_template,
+            on_template=on_template,
+            min_refresh_interval=min_refresh_interval,
+            get_tip=self.get_tip
+        )
+    
+    def create_template(self) -> Optional[BlockTemplate]:
+        """Buat block baru untuk mining"""
+        data_manager = get_data_manager()
+        blockchain = data_manager.db
+        
+        # Dapatkan block terakhir (block sendiri yang masih di queue submitter jika ada)
+        submitted_tip = self._submitted_tip
+        if submitted_tip:
+            prev_block, block_height = submitted_tip[0], submitted_tip[1] + 1
+        else:
+            prev_block, block_height = blockchain.get_best_block(), blockchain.get_block_height() + 1
+        if not prev_block:
+            print("Tidak ada previous block, pastikan genesis block diinisialisasi")
+            return
+        
+        # Dapatkan transactions dari mempool
+        transactions = self._get_transactions_from_mempool()
+        if submitted_tip:
+            # Transaksi di block yang belum tersimpan masih ada di mempool
+            confirmed = {tx.get_txid() for tx in prev_block.transactions}
+            transactions = [tx for tx in transactions if tx.get_txid() not in confirmed]
+        
+        # Buat coinbase transaction (mining reward)
+        coinbase_tx = create_coinbase_transaction(self.coinbase_address, block_height, 0)
+        all_transactions = [coinbase_tx] + transactions
+        
+        # Hitung merkle root (hanya node yang berubah sejak template sebelumnya)
+        tx_hashes = [tx.get_txid() for tx in all_transactions]
+        self.merkle_cache.update(tx_hashes)
+        merkle_root = self.merkle_cache.root
+        
+        # Dapatkan current difficulty
+        difficulty = blockchain.get_difficulty()
+        
+        # Buat block header
+        header = BlockHeader(
+            version=1,
+            prev_block_hash=prev_block.header.get_hash(),
+            merkle_root=merkle_root,
+            timestamp=TimeUtils.get_current_timestamp(),
+            bits=difficulty,
+            nonce=0
+        )
+        
+        print(f"New block created, mining... Difficulty: {difficulty:08x}")
+        
+        # Coinbase branch disimpan bersama template untuk extranonce rolling
+        return BlockTemplate(Block(header, all_transactions), block_height, self.merkle_cache.get_branch(0))
+    
+    def _get_transactions_from_mempool(self) -> List[Transaction]:
+        """Dapatkan transactions dari mempool"""
+        data_manager = get_data_manager()
+        if not hasattr(data_manager.db, 'mempool'):
+            return []
+        
+        mempool = data_manager.db.mempool
+        if hasattr(mempool, 'select_transactions'):
+            # Pilih berdasarkan fee rate paket sampai batas ukuran block
+            return mempool.select_transactions()
+        
+        # Mempool tanpa fee-rate index: ambil beberapa transactions
+        return mempool.get_transactions()[:10]
+    
+    def set_submitted_tip(self, block: Block, height: int):
+        """Block yang baru ditemukan menjadi tip template berikutnya"""
+        with self._lock:
+            # Block di atas tip lama (kalah cepat dari miner lain) tidak jadi tip template
+            if block.header.prev_block_hash == self.get_tip():
+                self._submitted_tip = (block, height)
+    
+    def clear_submitted_tip(self, block: Block):
+        """Block sudah diproses submitter, tip kembali dari best block"""
+        with self._lock:
+            if self._submitted_tip and self._submitted_tip[0] is block:
+                self._submitted_tip = None
+    
+    def get_tip(self) -> Optional[bytes]:
+        """Hash tip untuk template: block sendiri yang belum tersimpan, atau best block"""
+        submitted_tip = self._submitted_tip
+        if submitted_tip:
+            return submitted_tip[0].header.get_hash()
+        best_block = get_data_manager().db.get_best_block()
+        return best_block.header.get_hash() if best_block else None
 
 class Miner:
     """Bitpy Miner (mengikuti algoritma PoW persis)"""
     
-    def __init__(self, miner_address: str):
+    def __init__(self, miner_address: str, num_workers: Optional[int] = None,
+                 min_refresh_interval: float = DEFAULT_MIN_REFRESH_INTERVAL,
+                 pipeline: Optional['SharedTemplatePipeline'] = None):
         self.miner_address = miner_address
+        self.pipeline = pipeline
         self.is_mining = False
         self.current_block: Optional[Block] = None
         self.hash_rate = 0
         self.thread: Optional[threading.Thread] = None
         self.found_blocks = 0
         
+        # State template untuk extranonce rolling
+        self.extranonce = 0
+        self._template_height = 0
+        self._coinbase_branch: List[bytes] = []
+        
+        # Template baru dari template manager, diganti di antara batch nonce
+        # (multi-address: template builder milik pipeline bersama)
+        if pipeline:
+            self.builder = pipeline.builder
+        else:
+            self.builder = TemplateBuilder(miner_address, self._queue_template, min_refresh_interval)
+        self.template_manager = self.builder.template_manager
+        self._pending_template: Optional[BlockTemplate] = None
+        self._template_lock = threading.Lock()
+        
+        # Jumlah worker process (default: semua core)
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.pool = None
+        self._stop_event = None
+        self._hash_counts = None
+        
+        # Telemetry (hash rate EWMA, counter per worker, template, stale share)
+        self.stats = MiningStats(self.num_workers)
+        
+        # Block yang ditemukan disimpan dan di-relay di thread submitter;
+        # template berikutnya langsung dibangun di atas block itu
+        self.submitter = BlockSubmitter(on_saved=self._on_block_saved)
+    
     def start_mining(self):
         """Mulai mining"""
         if self.is_mining:
@@ -26,23 +232,69 @@ class Miner:
             return
             
         self.is_mining = True
+        self.submitter.start()
+        # Beberapa miner dalam satu process: hashing di thread akan rebutan GIL
+        if self.num_workers > 1 or self.pipeline:
+            self._start_pool()
         self.thread = threading.Thread(target=self._mining_loop, daemon=True)
         self.thread.start()
-        print(f"Mining started for address: {self.miner_address}")
+        if self.pipeline:
+            self.pipeline.subscribe(self)
+        else:
+            self.template_manager.start()
+        print(f"Mining started for address: {self.miner_address} ({self.num_workers} worker)")
         
     def stop_mining(self):
         """Stop mining"""
         self.is_mining = False
+        if self.pipeline:
+            self.pipeline.unsubscribe(self)
+        else:
+            self.template_manager.stop()
+        if self._stop_event:
+            self._stop_event.set()
         if self.thread:
             self.thread.join()
+        self._stop_pool()
+        # Block yang sudah ditemukan tetap disimpan
+        self.submitter.stop()
         print("Mining stopped")
         
+    def _start_pool(self):
+        """Buat process pool untuk mining multi-core"""
+        try:
+            self._stop_event = multiprocessing.Event()
+            self._hash_counts = multiprocessing.Array('Q', self.num_workers, lock=False)
+            self.pool = multiprocessing.Pool(
+                processes=self.num_workers,
+                initializer=_init_worker,
+                initargs=(self._stop_event, self._hash_counts)
+            )
+        except (OSError, ImportError) as e:
+            # Contoh: Termux/Android tidak mendukung semaphore multiprocessing
+            print(f"Multiprocessing tidak tersedia ({e}), mining dengan 1 thread")
+            self.num_workers = 1
+            self.pool = None
+            self.stats.set_workers(1)
+    
+    def _stop_pool(self):
+        """Hentikan process pool"""
+        if self.pool:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+    
     def _mining_loop(self):
         """Main mining loop"""
         while self.is_mining:
             try:
                 if not self.current_block:
-                    self._create_new_block()
+                    if self.pipeline:
+                        template = self.pipeline.get_template(self)
+                    else:
+                        template = self.template_manager.refresh()
+                    if template:
+                        self._set_template(template)
                     
                 if self.current_block:
                     found = self._mine_block()
@@ -52,224 +304,397 @@ class Miner:
                 print(f"Mining error: {e}")
                 time.sleep(1)
                 
-    def _create_new_block(self):
-        """Buat block baru untuk mining"""
-        data_manager = get_data_manager()
-        blockchain = data_manager.db
+    def _queue_template(self, template: BlockTemplate):
+        """Simpan template baru untuk diganti oleh mining thread"""
+        with self._template_lock:
+            self._pending_template = template
+    
+    def _take_pending_template(self) -> Optional[BlockTemplate]:
+        """Ambil template yang menunggu (jika ada)"""
+        with self._template_lock:
+            template, self._pending_template = self._pending_template, None
+            return template
+
+    def _keep_hashing(self) -> bool:
+        """Hashing lanjut selama mining aktif dan template belum diganti"""
+        return self.is_mining and self._pending_template is None
+    
+    def _set_template(self, template: BlockTemplate):
+        """Pakai template sebagai block yang di-hash (hanya dari mining thread)"""
+        self.current_block = template.block
+        self.extranonce = 0
+        self._template_height = template.height
+        self._coinbase_branch = template.coinbase_branch
+        self.template_manager.mark_swapped(template)
+        # Time-to-template: sejak tip lama terdeteksi basi (atau template dibangun)
+        self.stats.record_template(template.stale_since or template.created_at)
+    
+    def _create_coinbase_transaction(self, block_height: Optional[int] = None, extranonce: int = 0) -> Transaction:
+        """Buat coinbase transaction (mining reward) ke address miner ini"""
+        return create_coinbase_transaction(self.miner_address, block_height, extranonce)
         
-        # Dapatkan block terakhir
-        prev_block = blockchain.get_best_block()
-        if not prev_block:
-            print("Tidak ada previous block, pastikan genesis block diinisialisasi")
-            return
+    def _mine_block(self) -> bool:
+        """Lakukan Proof-of-Work mining pada block"""
+        if not self.current_block:
+            return False
             
-        # Dapatkan transactions dari mempool
-        transactions = self._get_transactions_from_mempool()
+        print(f"Mining block with target: {self.current_block.header.get_target():064x}")
         
-        # Buat coinbase transaction (mining reward)
-        coinbase_tx = self._create_coinbase_transaction()
-        all_transactions = [coinbase_tx] + transactions
+        while self.is_mining:
+            if self.pool:
+                found = self._mine_block_parallel()
+            else:
+                found = self._mine_block_serial()
+            
+            if found:
+                return True
+            
+            # Template baru dari template manager (tip atau mempool berubah)
+            template = self._take_pending_template()
+            if template:
+                self._set_template(template)
+                print(f"Template refreshed, mining block at height {template.height}")
+                continue
+            
+            # Ruang nonce habis: roll timestamp/extranonce lalu lanjut hashing
+            if self.is_mining:
+                self._roll_work()
         
-        # Hitung merkle root
-        tx_hashes = [tx.get_txid() for tx in all_transactions]
-        merkle_root = MerkleTree.compute_merkle_root(tx_hashes)
+        return False
+    
+    def _roll_work(self):
+        """
+        Perbarui header setelah ruang nonce 4-byte habis
+        Utamakan timestamp rolling (midstate tetap), jika timestamp belum
+        berubah naikkan extranonce di coinbase dan update merkle root
+        lewat coinbase branch (O(log n) hash)
+        """
+        header = self.current_block.header
+        now = TimeUtils.get_current_timestamp()
         
-        # Dapatkan current difficulty
-        difficulty = blockchain.get_difficulty()
+        if now > header.timestamp:
+            header.timestamp = now
+        else:
+            self.extranonce += 1
+            coinbase_tx = self._create_coinbase_transaction(self._template_height, self.extranonce)
+            self.current_block.transactions[0] = coinbase_tx
+            header.merkle_root = merkle_root_from_branch(coinbase_tx.get_txid(), self._coinbase_branch)
         
-        # Buat block header
-        header = BlockHeader(
-            version=1,
-            prev_block_hash=prev_block.header.get_hash(),
-            merkle_root=merkle_root,
-            timestamp=TimeUtils.get_current_timestamp(),
-            bits=difficulty,
+        header.nonce = 0
+    
+    def build_block(self, template: BlockTemplate, extranonce: int) -> Block:
+        """
+        Salinan block template dengan extranonce tertentu (template tidak diubah)
+        Merkle root dihitung ulang lewat coinbase branch, dipakai work server
+        untuk membagi ruang extranonce ke hasher eksternal
+        """
+        header = template.block.header
+        coinbase_tx = self._create_coinbase_transaction(template.height, extranonce)
+        block_header = BlockHeader(
+            version=header.version,
+            prev_block_hash=header.prev_block_hash,
+            merkle_root=merkle_root_from_branch(coinbase_tx.get_txid(), template.coinbase_branch),
+            timestamp=header.timestamp,
+            bits=header.bits,
             nonce=0
         )
+        return Block(block_header, [coinbase_tx] + template.block.transactions[1:])
+    
+    def _mine_block_parallel(self) -> bool:
+        """Proof-of-Work dengan membagi ruang nonce ke semua worker process"""
+        header = self.current_block.header
+        header_bytes = header.serialize()
+        target = target_to_bytes(header.get_target())
         
-        self.current_block = Block(header, all_transactions)
-        print(f"New block created, mining... Difficulty: {difficulty:08x}")
-        
-    def _create_coinbase_transaction(self) -> Transaction:
-        """Buat coinbase transaction (mining reward)"""
-        data_manager = get_data_manager()
-        block_height = data_manager.db.get_block_height() + 1
-        
-        # Hitung block reward (mengikuti Bitpy halving schedule)
-        reward = self._calculate_block_reward(block_height)
-        
-        # Extra data (bisa berisi apa saja)
-        extra_data = f"Python Bitpy Miner - Block {block_height}".encode()
-        
-        return TransactionBuilder.create_coinbase_transaction(
-            block_height=block_height,
-            miner_address=self.miner_address,
-            reward=reward,
-            extra_data=extra_data
-        )
-        
-    def _calculate_block_reward(self, block_height: int) -> int:
-        """Hitung block reward berdasarkan height (mengikuti Bitpy)"""
-        # Initial reward: 50 BITPY
-        reward = 50 * Config.COIN
+        self._stop_event.clear()
+        start_time = time.time()
+        last_counts = list(self._hash_counts)
         
-        # Apply halving setiap 210,000 blocks
-        halving_interval = Config.SUBSIDY_HALVING_INTERVAL
-        halvings = block_height // halving_interval
+        ranges = _split_nonce_range(header.nonce, MAX_NONCE + 1, self.num_workers)
+        pending = [
+            self.pool.apply_async(_mine_nonce_range, (header_bytes, target, lo, hi, worker_id))
+            for worker_id, (lo, hi) in enumerate(ranges)
+        ]
         
-        # Setelah setiap halving, reward dibagi 2
-        for _ in range(halvings):
-            reward //= 2
+        found_nonce = None
+        while pending:
+            if not self._keep_hashing():
+                self._stop_event.set()
             
-        return reward
-        
-    def _get_transactions_from_mempool(self) -> List[Transaction]:
-        """Dapatkan transactions dari mempool"""
-        # Dalam implementasi sederhana, ambil beberapa transactions
-        # Di real implementation, pilih berdasarkan fee rate
-        data_manager = get_data_manager()
-        if hasattr(data_manager.db, 'mempool'):
-            return data_manager.db.mempool.get_transactions()[:10]
-        return []
+            for result in [r for r in pending if r.ready()]:
+                pending.remove(result)
+                nonce = result.get()
+                if nonce is not None and found_nonce is None:
+                    # Hentikan semua worker lain
+                    found_nonce = nonce
+                    self._stop_event.set()
+            
+            # Hash baru per worker sejak polling sebelumnya
+            counts = list(self._hash_counts)
+            for worker_id, (count, last) in enumerate(zip(counts, last_counts)):
+                self.stats.record_hashes(worker_id, count - last)
+            last_counts = counts
+            self.hash_rate = self.stats.get_hash_rate()
+            
+            if pending:
+                time.sleep(POLL_INTERVAL)
         
-    def _mine_block(self) -> bool:
-        """Lakukan Proof-of-Work mining pada block"""
-        if not self.current_block:
+        if found_nonce is None:
             return False
-            
-        start_time = time.time()
-        hashes_calculated = 0
-        max_nonce = 0xFFFFFFFF  # 4-byte nonce
         
-        print(f"Mining block with target: {self.current_block.header.get_target():064x}")
+        header.nonce = found_nonce
+        self._report_block_found(start_time)
+        return True
+    
+    def _mine_block_serial(self) -> bool:
+        """Proof-of-Work di thread mining (tanpa multiprocessing)"""
+        header = self.current_block.header
+        target = target_to_bytes(header.get_target())
+        start_time = time.time()
         
-        for nonce in range(self.current_block.header.nonce, max_nonce):
-            if not self.is_mining:
-                return False
+        def update_hash_rate(count: int):
+            self.stats.record_hashes(0, count)
+            self.hash_rate = self.stats.get_hash_rate()
                 
-            # Update nonce
-            self.current_block.header.nonce = nonce
-            
-            # Calculate block hash
-            block_hash = self.current_block.header.get_hash()
-            hash_int = int.from_bytes(block_hash, 'big')
-            
-            hashes_calculated += 1
+        nonce = search_nonce(
+            header.serialize(), target, header.nonce, MAX_NONCE + 1,
+            keep_running=self._keep_hashing,
+            on_batch=update_hash_rate
+        )
+        if nonce is None:
+            return False
             
-            # Update hash rate setiap 1000 hashes
-            if hashes_calculated % 1000 == 0:
-                elapsed = time.time() - start_time
-                if elapsed > 0:
-                    self.hash_rate = hashes_calculated / elapsed
-                    
-            # Check jika hash memenuhi target difficulty
-            if hash_int <= self.current_block.header.get_target():
-                elapsed = time.time() - start_time
-                print(f"🎉 BLOCK MINED! Nonce: {nonce}")
-                print(f"Block Hash: {block_hash.hex()}")
-                print(f"Time: {elapsed:.2f}s, Hash Rate: {self.hash_rate:.2f} H/s")
-                print(f"Transactions: {len(self.current_block.transactions)}")
-                return True
-                
-        return False
+        header.nonce = nonce
+        self._report_block_found(start_time)
+        return True
+    
+    def _report_block_found(self, start_time: float):
+        """Print informasi block yang berhasil di-mine"""
+        header = self.current_block.header
+        elapsed = time.time() - start_time
+        print(f"🎉 BLOCK MINED! Nonce: {header.nonce}")
+        print(f"Block Hash: {header.get_hash().hex()}")
+        print(f"Time: {elapsed:.2f}s, Hash Rate: {self.hash_rate:.2f} H/s ({self.num_workers} worker)")
+        print(f"Transactions: {len(self.current_block.transactions)}")
         
     def _submit_block(self):
-        """Submit mined block ke blockchain"""
+        """Serahkan mined block ke submitter (save dan broadcast di thread lain)"""
         if not self.current_block:
             return
-            
-        data_manager = get_data_manager()
-        success = data_manager.db.save_block(self.current_block)
         
-        if success:
-            print(f"✅ Block successfully added to blockchain!")
-            print(f"Block Height: {data_manager.db.get_block_height()}")
-            print(f"Block Hash: {self.current_block.header.get_hash_hex()}")
-            
-            # Broadcast block ke network
-            self._broadcast_block()
-            
-            # Update stats
-            self.found_blocks += 1
+        self.submit_block(self.current_block, self._template_height)
             
-        else:
-            print("❌ Failed to add block to blockchain")
-            
-        # Reset untuk block berikutnya
+        # Reset untuk block berikutnya (template lama sudah basi)
         self.current_block = None
+        self._take_pending_template()
+    
+    def submit_block(self, block: Block, height: int):
+        """Queue block valid untuk disimpan dan di-relay, template berikutnya di atas block ini"""
+        self.builder.set_submitted_tip(block, height)
+        self.submitter.submit(block, height)
+    
+    def template_from(self, base: BlockTemplate) -> BlockTemplate:
+        """
+        Template untuk address miner ini dari template bersama
+        Transaksi dan coinbase branch dipakai ulang, hanya coinbase yang berbeda
+        """
+        template = BlockTemplate(self.build_block(base, 0), base.height, base.coinbase_branch)
+        template.created_at = base.created_at
+        template.stale_since = base.stale_since
+        return template
+    
+    def _on_block_saved(self, block: Block, accepted: bool):
+        """Callback submitter setelah save_block (dari thread submitter)"""
+        self.stats.record_block(accepted)
+        if accepted:
+            self.found_blocks += 1
         
-    def _broadcast_block(self):
-        """Broadcast block ke network P2P"""
-        # Ini akan diintegrasikan dengan network layer
-        global network_server
-        if network_server and self.current_block:
-            asyncio.create_task(network_server.broadcast_block(self.current_block))
-            
+        self.builder.clear_submitted_tip(block)
+        if not accepted:
+            # Template di atas block yang ditolak sudah basi
+            self.template_manager.notify()
+    
     def get_mining_info(self) -> dict:
         """Dapatkan informasi mining saat ini"""
+        header = self.current_block.header if self.current_block else None
+        target = header.get_target() if header else 0
         return {
             'mining': self.is_mining,
             'miner_address': self.miner_address,
-            'hash_rate': self.hash_rate,
+            'hash_rate': self.stats.get_hash_rate(),
+            'workers': self.num_workers,
             'found_blocks': self.found_blocks,
-            'current_block': self.current_block.header.get_hash_hex() if self.current_block else None,
-            'difficulty': self.current_block.header.get_target() if self.current_block else 0
+            **self.template_manager.get_stats(),
+            **self.stats.get_stats(),
+            **self.submitter.get_stats(),
+            'current_block': header.get_hash_hex() if header else None,
+            'bits': header.bits if header else 0,
+            'target': f"{target:064x}",
+            'difficulty': target_to_difficulty(target)
         }
 
-class MiningManager:
-    """Manager untuk multiple miners"""
+class SharedTemplatePipeline:
+    """
+    Satu template manager untuk banyak Miner (mining multi-address)
+    
+    Template dasar dibangun sekali oleh TemplateBuilder milik pipeline;
+    setiap miner hanya mengganti coinbase dengan address-nya sendiri
+    (lihat Miner.template_from). Block yang ditemukan miner mana pun
+    menjadi tip template berikutnya untuk semua miner.
+    """
     
-    def __init__(self):
+    def __init__(self, builder: TemplateBuilder):
+        self.builder = builder
+        self.template_manager = builder.template_manager
+        self.template_manager.on_template = self._dispatch
         self.miners: List[Miner] = []
-        self.active_miner: Optional[Miner] = None
+        self.current: Optional[BlockTemplate] = None
+        self._lock = threading.Lock()
+    
+    def subscribe(self, miner: Miner):
+        """Tambah miner, template manager jalan selama ada miner"""
+        with self._lock:
+            self.miners.append(miner)
+            if len(self.miners) == 1:
+                self.template_manager.start()
+    
+    def unsubscribe(self, miner: Miner):
+        """Hapus miner (template manager berhenti jika tidak ada miner lagi)"""
+        with self._lock:
+            if miner in self.miners:
+                self.miners.remove(miner)
+            stop = not self.miners
+            if stop:
+                self.current = None
+        if stop:
+            self.template_manager.stop()
+    
+    def get_template(self, miner: Miner) -> Optional[BlockTemplate]:
+        """
+        Template untuk miner (dari mining thread-nya)
+        Template dasar dibangun ulang jika tip sudah berubah, miner lain
+        ikut menerima template baru tersebut
+        """
+        others: List[Miner] = []
+        with self._lock:
+            base = self.current
+            if base is None or base.block.header.prev_block_hash != self.builder.get_tip():
+                base = self.template_manager.refresh(stale_since=time.time() if base else None)
+                if base is None:
+                    return None
+                self.current = base
+                others = [other for other in self.miners if other is not miner]
         
-    def create_miner(self, address: str) -> Miner:
-        """Buat miner baru"""
-        miner = Miner(address)
-        self.miners.append(miner)
+        for other in others:
+            other._queue_template(other.template_from(base))
+        return miner.template_from(base)
+    
+    def _dispatch(self, base: BlockTemplate):
+        """Callback template manager: kirim template baru ke semua miner"""
+        with self._lock:
+            self.current = base
+            miners = list(self.miners)
+        for miner in miners:
+            miner._queue_template(miner.template_from(base))
+
+class MiningManager:
+    """
+    Manager untuk multiple miners
+    Beberapa address bisa mining bersamaan dari satu pipeline template,
+    setiap address mendapat budget core (jumlah worker process) sendiri
+    """
+    
+    def __init__(self, total_cores: Optional[int] = None):
+        self.miners: Dict[str, Miner] = {}  # address -> miner yang sedang berjalan
+        self.total_cores = total_cores or os.cpu_count() or 1
+        self.pipeline: Optional[SharedTemplatePipeline] = None
+        self._lock = threading.Lock()
+    
+    def create_miner(self, address: str, num_workers: int) -> Miner:
+        """Buat miner baru di pipeline template bersama"""
+        if self.pipeline is None:
+            self.pipeline = SharedTemplatePipeline(TemplateBuilder(address))
+        miner = Miner(address, num_workers, pipeline=self.pipeline)
+        self.miners[address] = miner
         return miner
+    
+    def free_cores(self) -> int:
+        """Core yang belum dipakai miner yang berjalan"""
+        return self.total_cores - sum(miner.num_workers for miner in self.miners.values())
         
-    def start_mining(self, address: str):
-        """Start mining dengan address tertentu"""
-        # Stop miner aktif jika ada
-        if self.active_miner:
-            self.active_miner.stop_mining()
-            
-        # Cari atau buat miner untuk address ini
-        miner = next((m for m in self.miners if m.miner_address == address), None)
-        if not miner:
-            miner = self.create_miner(address)
-            
-        self.active_miner = miner
+    def start_mining(self, address: str, num_workers: Optional[int] = None) -> bool:
+        """
+        Start mining dengan address tertentu (miner address lain tetap jalan)
+        Default budget: semua core yang belum dipakai. Ditolak (False) jika
+        budget melebihi core yang tersisa, total worker tidak pernah > total_cores
+        """
+        with self._lock:
+            if address in self.miners:
+                print(f"Mining untuk {address} sudah berjalan")
+                return False
+            free_cores = self.free_cores()
+            num_workers = num_workers or free_cores
+            if num_workers < 1 or num_workers > free_cores:
+                print(f"Core tidak cukup untuk {address}: diminta {num_workers}, tersisa {free_cores} "
+                      f"dari {self.total_cores} (kurangi --workers miner lain atau stopmining)")
+                return False
+            miner = self.create_miner(address, num_workers)
         miner.start_mining()
+        return True
         
-    def stop_mining(self):
-        """Stop semua mining"""
-        if self.active_miner:
-            self.active_miner.stop_mining()
-        self.active_miner = None
+    def stop_mining(self, address: Optional[str] = None):
+        """Stop mining satu address, atau semua jika address None"""
+        with self._lock:
+            if address is None:
+                miners = list(self.miners.values())
+                self.miners.clear()
+            else:
+                miner = self.miners.pop(address, None)
+                miners = [miner] if miner else []
+        for miner in miners:
+            miner.stop_mining()
         
     def get_mining_info(self) -> dict:
-        """Dapatkan info mining"""
-        if self.active_miner:
-            return self.active_miner.get_mining_info()
-        return {'mining': False, 'miners': len(self.miners)}
+        """Info mining gabungan dan per address"""
+        with self._lock:
+            miners = list(self.miners.values())
+        addresses = {miner.miner_address: miner.get_mining_info() for miner in miners}
+        infos = list(addresses.values())
+        
+        info = {
+            'mining': any(miner_info['mining'] for miner_info in infos),
+            'miners': len(infos),
+            'total_cores': self.total_cores,
+            'workers': sum(miner_info['workers'] for miner_info in infos),
+            'hash_rate': sum(miner_info['hash_rate'] for miner_info in infos),
+            'hashes': sum(miner_info['hashes'] for miner_info in infos),
+            'found_blocks': sum(miner_info['found_blocks'] for miner_info in infos),
+            'stale_shares': sum(miner_info['stale_shares'] for miner_info in infos),
+            'addresses': addresses
+        }
+        if self.pipeline and infos:
+            info.update(self.pipeline.template_manager.get_stats())
+        return info
 
 # Global mining manager
 mining_manager = MiningManager()
 
-def start_mining(address: str):
-    """Start mining (untuk CLI)"""
-    mining_manager.start_mining(address)
+def start_mining(address: str, num_workers: Optional[int] = None) -> bool:
+    """Start mining (untuk CLI), False jika ditolak"""
+    return mining_manager.start_mining(address, num_workers)
     
-def stop_mining():
+def stop_mining(address: Optional[str] = None):
     """Stop mining (untuk CLI)"""
-    mining_manager.stop_mining()
+    mining_manager.stop_mining(address)
     
 def get_mining_info() -> dict:
     """Dapatkan mining info (untuk CLI)"""
     return mining_manager.get_mining_info()
 
+def get_mining_metrics() -> str:
+    """Mining metrics dalam format text Prometheus"""
+    return format_prometheus(list(mining_manager.get_mining_info()['addresses'].values()))
+
 # Test function
 def test_mining():
     """Test mining functionality"""
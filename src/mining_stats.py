@@ -0,0 +1,206 @@
+# mining_stats.py
+"""
+Bitpy Mining Stats - hash rate EWMA, counter per worker, dan export Prometheus
+"""
+
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+TICK_INTERVAL = 5.0  # Interval update EWMA (detik), sama seperti load average Unix
+RATE_WINDOWS = {'1m': 60.0, '5m': 300.0, '15m': 900.0}
+DIFFICULTY_1_TARGET = 0xFFFF << 208  # Target untuk difficulty 1 (bits 0x1d00ffff)
+
+def target_to_difficulty(target: int) -> float:
+    """Difficulty dari target (DIFFICULTY_1_TARGET / target)"""
+    return DIFFICULTY_1_TARGET / target if target else 0.0
+
+class EWMA:
+    """Exponentially weighted moving average rate (per detik)"""
+    
+    def __init__(self, window: float, interval: float = TICK_INTERVAL):
+        self.alpha = 1 - math.exp(-interval / window)
+        self.interval = interval
+        self.rate = 0.0
+        self.initialized = False
+    
+    def tick(self, count: int):
+        """Masukkan jumlah event selama satu interval"""
+        instant_rate = count / self.interval
+        if self.initialized:
+            self.rate += self.alpha * (instant_rate - self.rate)
+        else:
+            self.rate = instant_rate
+            self.initialized = True
+
+class RateMeter:
+    """Counter dengan hash rate EWMA 1, 5, dan 15 menit"""
+    
+    def __init__(self, interval: float = TICK_INTERVAL):
+        self.interval = interval
+        self.count = 0
+        self.start_time = time.time()
+        self.last_tick = self.start_time
+        self.uncounted = 0
+        self.rates = {name: EWMA(window, interval) for name, window in RATE_WINDOWS.items()}
+    
+    def mark(self, count: int, now: Optional[float] = None):
+        """Catat count event baru"""
+        self.tick_if_necessary(now)
+        self.count += count
+        self.uncounted += count
+    
+    def tick_if_necessary(self, now: Optional[float] = None):
+        """Update EWMA untuk setiap interval yang sudah lewat"""
+        now = now if now is not None else time.time()
+        ticks = int((now - self.last_tick) // self.interval)
+        for _ in range(ticks):
+            for rate in self.rates.values():
+                rate.tick(self.uncounted)
+            self.uncounted = 0
+        self.last_tick += ticks * self.interval
+    
+    def get_rate(self, window: str = '1m') -> float:
+        """Hash rate EWMA untuk window ('1m', '5m', '15m')"""
+        self.tick_if_necessary()
+        rate = self.rates[window]
+        # Sebelum interval pertama selesai pakai rata-rata sejak start
+        return rate.rate if rate.initialized else self.mean_rate()
+    
+    def mean_rate(self) -> float:
+        """Rata-rata sejak meter dibuat"""
+        elapsed = time.time() - self.start_time
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+class MiningStats:
+    """
+    Telemetry miner: hash rate, counter per worker, waktu ganti template,
+    dan stale share. Thread-safe (diupdate mining thread, dibaca CLI/RPC)
+    """
+    
+    def __init__(self, num_workers: int = 1):
+        self.hashes = RateMeter()
+        self.workers: List[RateMeter] = [RateMeter() for _ in range(num_workers)]
+        self.blocks_found = 0
+        self.stale_shares = 0  # Block ditemukan tapi ditolak / tip sudah berubah
+        self.templates_used = 0
+        self.last_time_to_template = 0.0  # Detik dari template dibangun sampai dipakai worker
+        self.total_time_to_template = 0.0
+        self._lock = threading.Lock()
+    
+    def set_workers(self, num_workers: int):
+        """Ubah jumlah worker (contoh: fallback ke 1 worker)"""
+        with self._lock:
+            if num_workers != len(self.workers):
+                self.workers = [RateMeter() for _ in range(num_workers)]
+    
+    def record_hashes(self, worker_id: int, count: int):
+        """Catat hash yang dihitung worker"""
+        if count <= 0:
+            return
+        now = time.time()
+        with self._lock:
+            self.hashes.mark(count, now)
+            if worker_id < len(self.workers):
+                self.workers[worker_id].mark(count, now)
+    
+    def record_template(self, created_at: float):
+        """Catat template baru mulai di-hash"""
+        elapsed = max(0.0, time.time() - created_at)
+        with self._lock:
+            self.templates_used += 1
+            self.last_time_to_template = elapsed
+            self.total_time_to_template += elapsed
+    
+    def record_block(self, accepted: bool):
+        """Catat block yang ditemukan (ditolak = stale share)"""
+        with self._lock:
+            self.blocks_found += 1
+            if not accepted:
+                self.stale_shares += 1
+    
+    def get_hash_rate(self, window: str = '1m') -> float:
+        with self._lock:
+            return self.hashes.get_rate(window)
+    
+    def get_stats(self) -> dict:
+        """Snapshot statistik"""
+        with self._lock:
+            return {
+                'hashes': self.hashes.count,
+                'hash_rate_1m': self.hashes.get_rate('1m'),
+                'hash_rate_5m': self.hashes.get_rate('5m'),
+                'hash_rate_15m': self.hashes.get_rate('15m'),
+                'hash_rate_mean': self.hashes.mean_rate(),
+                'worker_hashes': [worker.count for worker in self.workers],
+                'worker_hash_rates': [worker.get_rate('1m') for worker in self.workers],
+                'blocks_found': self.blocks_found,
+                'stale_shares': self.stale_shares,
+                'templates_used': self.templates_used,
+                'last_time_to_template': self.last_time_to_template,
+                'avg_time_to_template': (self.total_time_to_template / self.templates_used
+                                         if self.templates_used else 0.0)
+            }
+
+def format_prometheus(miners: List[dict], labels: Optional[Dict[str, str]] = None) -> str:
+    """
+    Export mining info dalam format text Prometheus
+    miners adalah list Miner.get_mining_info() (satu per address, label address)
+    """
+    lines: List[str] = []
+    
+    def label_str(info: dict, extra: Optional[Dict[str, str]] = None) -> str:
+        merged = {**(labels or {}), **(extra or {})}
+        if info.get('miner_address'):
+            merged.setdefault('address', info['miner_address'])
+        if not merged:
+            return ''
+        return '{' + ','.join(f'{key}="{value}"' for key, value in sorted(merged.items())) + '}'
+    
+    def metric(name: str, metric_type: str, help_text: str, samples: Callable[[dict], list]):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        for info in miners:
+            for extra, value in samples(info):
+                lines.append(f'{name}{label_str(info, extra)} {value}')
+    
+    lines.append('# HELP bitpy_miner_up Miner sedang berjalan')
+    lines.append('# TYPE bitpy_miner_up gauge')
+    lines.extend(f"bitpy_miner_up{label_str(info)} {int(bool(info.get('mining')))}" for info in miners)
+    if not miners:
+        lines.append(f'bitpy_miner_up{label_str({})} 0')
+    miners = [info for info in miners if 'hashes' in info]
+    if not miners:
+        return '\n'.join(lines) + '\n'
+    
+    metric('bitpy_miner_hashes_total', 'counter', 'Total hash yang dihitung', lambda info: [(None, info['hashes'])])
+    metric('bitpy_miner_hash_rate', 'gauge', 'Hash rate EWMA (H/s)', lambda info: [
+        ({'window': window}, info[f'hash_rate_{window}']) for window in RATE_WINDOWS
+    ])
+    metric('bitpy_miner_worker_hashes_total', 'counter', 'Total hash per worker', lambda info: [
+        ({'worker': str(worker_id)}, count) for worker_id, count in enumerate(info['worker_hashes'])
+    ])
+    metric('bitpy_miner_worker_hash_rate', 'gauge', 'Hash rate EWMA 1 menit per worker (H/s)', lambda info: [
+        ({'worker': str(worker_id)}, rate) for worker_id, rate in enumerate(info['worker_hash_rates'])
+    ])
+    metric('bitpy_miner_blocks_found_total', 'counter', 'Block yang ditemukan',
+           lambda info: [(None, info['blocks_found'])])
+    metric('bitpy_miner_stale_shares_total', 'counter', 'Block ditemukan tapi ditolak (basi)',
+           lambda info: [(None, info['stale_shares'])])
+    metric('bitpy_miner_templates_total', 'counter', 'Template yang dipakai worker',
+           lambda info: [(None, info['templates_used'])])
+    metric('bitpy_miner_time_to_template_seconds', 'gauge', 'Waktu dari template dibangun sampai di-hash',
+           lambda info: [(None, info['last_time_to_template'])])
+    metric('bitpy_miner_stale_work_seconds_total', 'counter', 'Waktu hashing di atas tip lama',
+           lambda info: [(None, info.get('stale_work_time', 0.0))])
+    metric('bitpy_miner_relayed_blocks_total', 'counter', 'Block yang sudah di-broadcast ke network',
+           lambda info: [(None, info.get('relayed_blocks', 0))])
+    metric('bitpy_miner_submit_queue', 'gauge', 'Block yang menunggu disimpan',
+           lambda info: [(None, info.get('submit_queue', 0))])
+    metric('bitpy_miner_relay_latency_seconds', 'gauge', 'Latency submit sampai broadcast selesai', lambda info: [
+        ({'stat': stat}, info.get(f'{stat}_relay_latency', 0.0)) for stat in ('last', 'avg', 'max')
+    ])
+    metric('bitpy_miner_difficulty', 'gauge', 'Difficulty block yang sedang di-mine',
+           lambda info: [(None, info.get('difficulty', 0.0))])
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,111 @@
+# reward.py
+"""
+Bitpy Reward - tabel subsidy block (halving) dan total supply yang sudah diterbitkan
+"""
+
+from typing import Dict, List, Optional, Tuple
+from block import Block
+from chain_hooks import get_chain_hooks
+from util import Config
+
+INITIAL_SUBSIDY = 50 * Config.COIN  # Reward awal: 50 BITPY
+HALVING_INTERVAL = Config.SUBSIDY_HALVING_INTERVAL
+
+def _build_subsidy_table() -> List[int]:
+    """Subsidy per era halving (reward //= 2 setiap era) sampai menjadi 0"""
+    table = []
+    subsidy = INITIAL_SUBSIDY
+    while subsidy > 0:
+        table.append(subsidy)
+        subsidy //= 2
+    return table
+
+def _build_era_start_supply(table: List[int]) -> List[int]:
+    """Total supply sebelum awal setiap era (prefix sum), elemen terakhir = supply maksimum"""
+    supply = [0]
+    for subsidy in table:
+        supply.append(supply[-1] + subsidy * HALVING_INTERVAL)
+    return supply
+
+# Subsidy per era dan total supply sebelum awal setiap era
+SUBSIDY_TABLE = _build_subsidy_table()
+_ERA_START_SUPPLY = _build_era_start_supply(SUBSIDY_TABLE)
+MAX_SUPPLY = _ERA_START_SUPPLY[-1]  # Total supply dari subsidy setelah era terakhir
+
+def get_block_subsidy(height: int) -> int:
+    """Subsidy block di height tertentu (O(1), sama dengan loop halving)"""
+    era = height // HALVING_INTERVAL
+    return SUBSIDY_TABLE[era] if era < len(SUBSIDY_TABLE) else 0
+
+def get_supply_at(height: int) -> int:
+    """Total subsidy block 0 sampai height (inklusif), O(1)"""
+    if height < 0:
+        return 0
+    era = height // HALVING_INTERVAL
+    if era >= len(SUBSIDY_TABLE):
+        return MAX_SUPPLY
+    blocks_in_era = height - era * HALVING_INTERVAL + 1
+    return _ERA_START_SUPPLY[era] + blocks_in_era * SUBSIDY_TABLE[era]
+
+def get_supply_info(height: int) -> dict:
+    """Supply setelah block di height tertentu (dihitung dari tabel subsidy, O(1))"""
+    issued = get_supply_at(height)
+    return {
+        'height': height,
+        'issued_supply': issued,
+        'remaining_supply': MAX_SUPPLY - issued,
+        'max_supply': MAX_SUPPLY,
+        'next_subsidy': get_block_subsidy(height + 1)
+    }
+
+def check_coinbase_value(block: Block, height: int, fees: int = 0) -> bool:
+    """Output coinbase tidak boleh melebihi subsidy + fee block"""
+    coinbase_value = sum(txout.value for txout in block.transactions[0].outputs)
+    return coinbase_value <= get_block_subsidy(height) + fees
+
+def get_block_fees(block: Block, address_index) -> Optional[int]:
+    """
+    Total fee transaksi non-coinbase block (nilai input dari address index
+    atau output transaksi sebelumnya di block yang sama)
+    None jika ada input yang output-nya tidak diketahui
+    """
+    created: Dict[Tuple[bytes, int], int] = {}  # Outpoint -> value output di block ini
+    fees = 0
+    for tx in block.transactions[1:]:
+        for txin in tx.inputs:
+            outpoint = (txin.prev_tx_hash, txin.prev_output_index)
+            value = created.pop(outpoint, None)
+            if value is None:
+                output = address_index.get_output(outpoint)
+                if output is None:
+                    return None
+                value = output[0]
+            fees += value
+        fees -= sum(txout.value for txout in tx.outputs)
+        txid = tx.get_txid()
+        for vout, txout in enumerate(tx.outputs):
+            created[(txid, vout)] = txout.value
+    return fees
+
+def validate_coinbase(block: Block, blockchain) -> bool:
+    """
+    Cek nilai coinbase block yang memperpanjang best block (subsidy height
+    block + fee). Block cabang dan block dengan input di luar address index
+    (fee tidak diketahui) diserahkan ke validasi database
+    """
+    from chain_index import get_address_index
+    
+    best_block = blockchain.get_best_block()
+    if best_block is None or not block.transactions:
+        return True
+    if block.header.prev_block_hash != best_block.header.get_hash():
+        return True
+    
+    fees = get_block_fees(block, get_address_index())
+    if fees is None:
+        return True
+    return check_coinbase_value(block, blockchain.get_block_height() + 1, fees)
+
+def attach_coinbase_check(blockchain):
+    """Daftarkan cek nilai coinbase sebagai validator sebelum block disimpan"""
+    get_chain_hooks(blockchain).add_validator('coinbase', lambda block: validate_coinbase(block, blockchain))
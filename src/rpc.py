@@ -0,0 +1,394 @@
+# rpc.py
+"""
+Bitpy JSON-RPC Server - akses command CLI lewat HTTP (JSON-RPC 2.0)
+"""
+
+import base64
+import hmac
+import inspect
+import json
+import os
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+from chain_dump import block_to_dict
+from chain_index import get_address_index, get_height_index
+from mining import start_mining, stop_mining, get_mining_info, get_mining_metrics
+from reward import get_supply_info
+from script import get_signature_cache
+from wallet import parse_bitpy_amount
+
+DEFAULT_RPC_HOST = '127.0.0.1'  # Hanya lokal
+DEFAULT_RPC_PORT = 8332
+DEFAULT_COOKIE_PATH = os.path.join(os.path.expanduser('~'), '.bitpy', '.cookie')
+COOKIE_USER = '__cookie__'
+MAX_REQUEST_SIZE = 16 * 1024 * 1024  # Batas body request (bytes)
+WILDCARD_HOSTS = ('', '0.0.0.0', '::')  # Bind semua interface: Host header tidak dicek
+LOOPBACK_HOSTS = ('127.0.0.1', 'localhost', '::1')
+
+# Kode error JSON-RPC 2.0
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+APPLICATION_ERROR = -1
+
+class RPCError(Exception):
+    """Error yang dikirim ke client sebagai response JSON-RPC"""
+    
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+def write_cookie(path: str = DEFAULT_COOKIE_PATH) -> str:
+    """Buat token acak, tulis '__cookie__:<token>' ke file cookie (hanya bisa dibaca owner)"""
+    token = secrets.token_hex(32)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(f'{COOKIE_USER}:{token}')
+    return token
+
+def read_cookie(path: str = DEFAULT_COOKIE_PATH) -> str:
+    """Isi file cookie ('__cookie__:<token>') untuk client RPC"""
+    with open(path) as f:
+        return f.read().strip()
+
+def auth_header(path: str = DEFAULT_COOKIE_PATH) -> str:
+    """Nilai header Authorization (Basic) untuk client RPC dari file cookie"""
+    return 'Basic ' + base64.b64encode(read_cookie(path).encode()).decode()
+
+def allowed_hosts(host: str, port: int) -> Optional[set]:
+    """Nilai Host header yang diterima (None = tidak dicek, bind ke semua interface)"""
+    if host in WILDCARD_HOSTS:
+        return None
+    names = set(LOOPBACK_HOSTS) if host in LOOPBACK_HOSTS else {host}
+    allowed = set()
+    for name in names:
+        name = f'[{name}]' if ':' in name else name
+        allowed.update({name, f'{name}:{port}'})
+    return allowed
+
+class RPCMethods:
+    """
+    Implementasi method RPC di atas satu DataManager dan WalletManager
+    Semua method mengembalikan data JSON (bukan print seperti CLI)
+    """
+    
+    def __init__(self, data_manager, wallet_manager):
+        self.data_manager = data_manager
+        self.wallet_manager = wallet_manager
+        self.methods: Dict[str, Callable[..., Any]] = {
+            'getblockcount': self.getblockcount,
+            'getbestblockhash': self.getbestblockhash,
+            'getblock': self.getblock,
+            'getblockbyheight': self.getblockbyheight,
+            'getblockhashes': self.getblockhashes,
+            'getbalance': self.getbalance,
+            'getbalances': self.getbalances,
+            'getutxos': self.getutxos,
+            'listaddresses': self.listaddresses,
+            'send': self.send,
+            'mine': self.mine,
+            'stopmining': self.stopmining,
+            'mininginfo': self.mininginfo,
+            'getminingmetrics': self.getminingmetrics,
+            'getsupplyinfo': self.getsupplyinfo,
+            'status': self.status
+        }
+    
+    def getblockcount(self) -> int:
+        return self.data_manager.db.get_block_count()
+    
+    def getbestblockhash(self) -> Optional[str]:
+        best_block = self.data_manager.db.get_best_block()
+        return best_block.header.get_hash_hex() if best_block else None
+    
+    def getblock(self, block_hash: str) -> dict:
+        block = self.data_manager.db.get_block(block_hash)
+        if not block:
+            raise RPCError(APPLICATION_ERROR, f"Block not found: {block_hash}")
+        return block_to_dict(get_height_index().get_height(block_hash), block_hash, block)
+    
+    def getblockbyheight(self, height: int) -> dict:
+        block_hash = get_height_index().get_hash(int(height))
+        block = self.data_manager.db.get_block(block_hash) if block_hash else None
+        if not block:
+            raise RPCError(APPLICATION_ERROR, f"Block not found at height: {height}")
+        return block_to_dict(int(height), block_hash, block)
+    
+    def getblockhashes(self, start: int, end: int) -> List[dict]:
+        return [
+            {'height': height, 'hash': block_hash}
+            for height, block_hash in get_height_index().get_hashes(int(start), int(end))
+        ]
+    
+    def getbalance(self, address: Optional[str] = None):
+        if address:
+            return get_address_index().get_balance(address)
+        wallet = self._current_wallet()
+        return sum(get_address_index().get_balances(wallet.get_addresses()).values())
+    
+    def getbalances(self, addresses: List[str]) -> Dict[str, int]:
+        return get_address_index().get_balances(addresses)
+    
+    def getutxos(self, address: str) -> List[dict]:
+        return [
+            {'txid': utxo['txid'].hex(), 'vout': utxo['vout'], 'value': utxo['value'],
+             'script_pubkey': utxo['script_pubkey'].hex()}
+            for utxo in get_address_index().get_utxos(address)
+        ]
+    
+    def listaddresses(self, wallet_name: str = "default") -> Dict[str, int]:
+        wallet = self.wallet_manager.get_wallet(wallet_name)
+        if not wallet:
+            raise RPCError(APPLICATION_ERROR, f"Wallet '{wallet_name}' not found")
+        return get_address_index().get_balances(wallet.get_addresses())
+    
+    def send(self, from_address: str, to_address: str, amount: str) -> dict:
+        wallet = self._current_wallet()
+        value = parse_bitpy_amount(str(amount))
+        
+        utxos = self.data_manager.db.get_utxos_for_address(from_address)
+        if not utxos:
+            raise RPCError(APPLICATION_ERROR, f"No UTXOs found for address: {from_address}")
+        
+        transaction = wallet.create_transaction(from_address, to_address, value, utxos)
+        if not transaction:
+            raise RPCError(APPLICATION_ERROR, "Failed to create transaction")
+        
+        if self.data_manager.db.mempool.add_transaction(transaction) is False:
+            raise RPCError(APPLICATION_ERROR, "Transaction rejected by mempool")
+        return {'txid': transaction.get_txid_hex(), 'amount': value}
+    
+    def mine(self, address: str, workers: Optional[int] = None) -> bool:
+        if not start_mining(address, int(workers) if workers else None):
+            raise RPCError(APPLICATION_ERROR, "Mining tidak dimulai: address sudah mining atau core tidak cukup")
+        return True
+    
+    def stopmining(self, address: Optional[str] = None) -> bool:
+        stop_mining(address)
+        return True
+    
+    def mininginfo(self) -> dict:
+        return get_mining_info()
+    
+    def getminingmetrics(self) -> str:
+        return get_mining_metrics()
+    
+    def getsupplyinfo(self) -> dict:
+        return get_supply_info(self.data_manager.db.get_block_height())
+    
+    def status(self) -> dict:
+        blockchain = self.data_manager.db
+        return {
+            'height': blockchain.get_block_height(),
+            'block_count': blockchain.get_block_count(),
+            'difficulty': blockchain.difficulty,
+            'mining': get_mining_info()['mining'],
+            'supply': get_supply_info(blockchain.get_block_height()),
+            'signature_cache': get_signature_cache().get_stats(),
+            'address_index': get_address_index().get_stats()
+        }
+    
+    def _current_wallet(self):
+        wallet = self.wallet_manager.current_wallet
+        if not wallet:
+            raise RPCError(APPLICATION_ERROR, "No wallet loaded")
+        return wallet
+
+class RPCDispatcher:
+    """Proses request JSON-RPC 2.0 (single atau batch) menjadi response"""
+    
+    def __init__(self, methods: RPCMethods):
+        self.methods = methods
+        self.signatures = {name: inspect.signature(method) for name, method in methods.methods.items()}
+        self.request_count = 0
+        self._lock = threading.Lock()
+    
+    def handle(self, body: bytes) -> Optional[bytes]:
+        """Proses body HTTP, return body response (None jika hanya notification)"""
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return self._encode(self._error(None, PARSE_ERROR, "Parse error"))
+        
+        if isinstance(payload, list):
+            if not payload:
+                return self._encode(self._error(None, INVALID_REQUEST, "Empty batch"))
+            responses = [self._handle_one(request) for request in payload]
+            responses = [response for response in responses if response is not None]
+            return self._encode(responses) if responses else None
+        
+        response = self._handle_one(payload)
+        return self._encode(response) if response is not None else None
+    
+    def _handle_one(self, request) -> Optional[dict]:
+        """Proses satu request, None untuk notification (tanpa id)"""
+        with self._lock:
+            self.request_count += 1
+        
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return self._error(None, INVALID_REQUEST, "Invalid request")
+        
+        request_id = request.get('id')
+        is_notification = 'id' not in request
+        method = self.methods.methods.get(request['method'])
+        params = request.get('params', [])
+        
+        try:
+            if method is None:
+                raise RPCError(METHOD_NOT_FOUND, f"Method not found: {request['method']}")
+            if isinstance(params, list):
+                args, kwargs = params, {}
+            elif isinstance(params, dict):
+                args, kwargs = [], params
+            else:
+                raise RPCError(INVALID_PARAMS, "params harus array atau object")
+            # Cek params dengan signature method dulu, TypeError di dalam method = INTERNAL_ERROR
+            try:
+                self.signatures[request['method']].bind(*args, **kwargs)
+            except TypeError as e:
+                raise RPCError(INVALID_PARAMS, str(e))
+            result = method(*args, **kwargs)
+        except RPCError as e:
+            return None if is_notification else self._error(request_id, e.code, e.message)
+        except Exception as e:
+            return None if is_notification else self._error(request_id, INTERNAL_ERROR, str(e))
+        
+        if is_notification:
+            return None
+        return {'jsonrpc': '2.0', 'result': result, 'id': request_id}
+    
+    def _error(self, request_id, code: int, message: str) -> dict:
+        return {'jsonrpc': '2.0', 'error': {'code': code, 'message': message}, 'id': request_id}
+    
+    def _encode(self, response) -> bytes:
+        return json.dumps(response, separators=(',', ':'), default=str).encode()
+
+class RPCRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP handler: POST body JSON-RPC, GET /metrics, koneksi keep-alive
+    Setiap request harus membawa Authorization dari file cookie dan Host
+    header yang sesuai alamat bind (mencegah DNS rebinding dari browser)
+    """
+    
+    protocol_version = 'HTTP/1.1'
+    dispatcher: RPCDispatcher = None  # Diset oleh RPCServer
+    auth: str = None  # Nilai header Authorization yang valid
+    hosts: Optional[set] = None  # Host header yang diterima (None = tidak dicek)
+    
+    def _check_request(self) -> bool:
+        """Cek Host header dan autentikasi, kirim error jika gagal"""
+        if self.hosts is not None and self.headers.get('Host', '').lower() not in self.hosts:
+            self.send_error(403, "Host tidak diizinkan")
+            return False
+        if not hmac.compare_digest(self.headers.get('Authorization', '').encode(), self.auth.encode()):
+            self.send_response(401)
+            self.send_header('WWW-Authenticate', 'Basic realm="bitpy-rpc"')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return False
+        return True
+    
+    def do_POST(self):
+        if not self._check_request():
+            return
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type != 'application/json':
+            self.send_error(415, "Content-Type harus application/json")
+            return
+        
+        length = int(self.headers.get('Content-Length', 0))
+        if length > MAX_REQUEST_SIZE:
+            self.send_error(413, "Request terlalu besar")
+            return
+        
+        response = self.dispatcher.handle(self.rfile.read(length))
+        if response is None:
+            self.send_response(204)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+    
+    def do_GET(self):
+        # Endpoint scrape Prometheus
+        if not self._check_request():
+            return
+        if self.path != '/metrics':
+            self.send_error(404)
+            return
+        
+        body = get_mining_metrics().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        # Jangan print setiap request (ribuan query per detik)
+        pass
+
+class RPCServer:
+    """
+    Server JSON-RPC HTTP yang long-lived di atas satu DataManager
+    Token autentikasi baru dibuat setiap start dan ditulis ke file cookie;
+    client membaca file itu (lihat auth_header)
+    """
+    
+    def __init__(self, data_manager, wallet_manager, host: str = DEFAULT_RPC_HOST, port: int = DEFAULT_RPC_PORT,
+                 cookie_path: str = DEFAULT_COOKIE_PATH):
+        self.dispatcher = RPCDispatcher(RPCMethods(data_manager, wallet_manager))
+        self.cookie_path = cookie_path
+        self.httpd = ThreadingHTTPServer((host, port), RPCRequestHandler)
+        self.httpd.daemon_threads = True
+        
+        token = write_cookie(cookie_path)
+        credentials = base64.b64encode(f'{COOKIE_USER}:{token}'.encode()).decode()
+        self.httpd.RequestHandlerClass = type('BoundRPCRequestHandler', (RPCRequestHandler,), {
+            'dispatcher': self.dispatcher,
+            'auth': f'Basic {credentials}',
+            'hosts': allowed_hosts(host, self.httpd.server_address[1])
+        })
+        self.thread: Optional[threading.Thread] = None
+    
+    @property
+    def address(self):
+        return self.httpd.server_address
+    
+    def serve_forever(self):
+        """Jalankan server di thread ini (blocking)"""
+        print(f"JSON-RPC server listening on http://{self.address[0]}:{self.address[1]}")
+        print(f"Auth cookie: {self.cookie_path}")
+        self.httpd.serve_forever()
+    
+    def start(self):
+        """Jalankan server di background thread"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        """Stop server"""
+        self.httpd.shutdown()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+        self.close()
+    
+    def close(self):
+        """Tutup socket server dan hapus file cookie"""
+        self.httpd.server_close()
+        try:
+            os.remove(self.cookie_path)
+        except FileNotFoundError:
+            pass
@@ -3,14 +3,261 @@
 Bitpy Script Interpreter
 """
 
-from typing import List, Optional, Any
+import copy
+import functools
+import hashlib
+import struct
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
 from crypto import CryptoUtils
 from util import ByteUtils
 
+SCRIPT_CACHE_SIZE = 4096  # Jumlah script hasil compile yang disimpan (LRU)
+SIGNATURE_CACHE_SIZE = 50000  # Jumlah signature valid yang disimpan (LRU)
+MAX_PUBKEYS_PER_MULTISIG = 20
+SIGHASH_ALL = 0x01
+
 class ScriptError(Exception):
     """Error dalam eksekusi script"""
     pass
 
+def _compile_script(script: bytes) -> Tuple[Tuple[int, Optional[bytes]], ...]:
+    """
+    Compile script menjadi urutan (opcode, data)
+    data berisi slice script untuk opcode push (memoryview jika script
+    memoryview, tanpa copy), None untuk opcode lain.
+    """
+    program = []
+    pc = 0
+    script_length = len(script)
+    
+    while pc < script_length:
+        opcode = script[pc]
+        pc += 1
+        
+        # Data pushing opcodes (0x01 - 0x4b)
+        if 1 <= opcode <= 75:
+            data_length = opcode
+            if pc + data_length > script_length:
+                raise ScriptError("PUSHDATA melebihi batas script")
+        
+        # OP_PUSHDATA1
+        elif opcode == 76:
+            if pc >= script_length:
+                raise ScriptError("OP_PUSHDATA1 tanpa data")
+            
+            data_length = script[pc]
+            pc += 1
+            
+            if pc + data_length > script_length:
+                raise ScriptError("OP_PUSHDATA1 melebihi batas")
+        
+        # OP_PUSHDATA2
+        elif opcode == 77:
+            if pc + 1 >= script_length:
+                raise ScriptError("OP_PUSHDATA2 tanpa data")
+            
+            data_length = int.from_bytes(script[pc:pc+2], 'little')
+            pc += 2
+            
+            if pc + data_length > script_length:
+                raise ScriptError("OP_PUSHDATA2 melebihi batas")
+        
+        # OP_PUSHDATA4
+        elif opcode == 78:
+            if pc + 3 >= script_length:
+                raise ScriptError("OP_PUSHDATA4 tanpa data")
+            
+            data_length = int.from_bytes(script[pc:pc+4], 'little')
+            pc += 4
+            
+            if pc + data_length > script_length:
+                raise ScriptError("OP_PUSHDATA4 melebihi batas")
+        
+        # Opcode lain (tanpa data)
+        else:
+            program.append((opcode, None))
+            continue
+        
+        program.append((opcode, script[pc:pc + data_length]))
+        pc += data_length
+    
+    return tuple(program)
+
+_compile_script_cached = functools.lru_cache(maxsize=SCRIPT_CACHE_SIZE)(_compile_script)
+
+def compile_script(script: bytes) -> Tuple[Tuple[int, Optional[bytes]], ...]:
+    """
+    Compile script dengan cache LRU (key = isi script), jadi script yang sama
+    seperti scriptPubKey P2PKH standar tidak di-parse ulang
+    memoryview disalin ke bytes agar cache tidak menahan buffer transaksi
+    """
+    if not isinstance(script, bytes):
+        script = bytes(script)
+    return _compile_script_cached(script)
+
+# Hasil OP_1 - OP_16 (dipakai ulang, tanpa alokasi bytes baru)
+_SMALL_INTS = [bytes([n]) for n in range(17)]
+
+class SignatureCache:
+    """
+    Cache signature ECDSA yang sudah terverifikasi valid
+    
+    Key = SHA-256(sighash + pubkey + signature). Hanya hasil valid yang
+    disimpan, jadi signature yang sudah dicek saat masuk mempool tidak
+    diverifikasi ulang saat transaksinya masuk block. Thread-safe, LRU.
+    """
+    
+    def __init__(self, max_size: int = SIGNATURE_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    @staticmethod
+    def make_key(sighash: bytes, pubkey: bytes, signature: bytes) -> bytes:
+        """Key cache untuk kombinasi (sighash, pubkey, signature)"""
+        key = hashlib.sha256(sighash)
+        key.update(pubkey)
+        key.update(signature)
+        return key.digest()
+    
+    def contains(self, key: bytes) -> bool:
+        """Cek key di cache (dihitung sebagai hit/miss)"""
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return True
+            self.misses += 1
+            return False
+    
+    def peek(self, key: bytes) -> bool:
+        """Cek key di cache tanpa mengubah counter dan urutan LRU"""
+        with self._lock:
+            return key in self.entries
+    
+    def keys(self) -> List[bytes]:
+        """Semua key di cache (contoh: dikirim worker ke process utama)"""
+        with self._lock:
+            return list(self.entries)
+    
+    def add(self, key: bytes):
+        """Simpan signature valid, buang entry paling lama jika penuh"""
+        with self._lock:
+            self.entries[key] = True
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+    
+    def clear(self):
+        """Kosongkan cache dan reset counter"""
+        with self._lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def get_stats(self) -> dict:
+        """Statistik cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self.entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+# Global signature cache (dipakai bersama mempool dan validasi block)
+_signature_cache = SignatureCache()
+
+def get_signature_cache() -> SignatureCache:
+    """Get global signature cache"""
+    return _signature_cache
+
+def verify_signature(signature: bytes, pubkey: bytes, sighash: bytes) -> bool:
+    """
+    Verifikasi signature ECDSA secp256k1 (DER + 1 byte sighash type)
+    terhadap sighash transaksi, lewat signature cache
+    """
+    if not signature or not pubkey or signature[-1] != SIGHASH_ALL:
+        return False  # Hanya SIGHASH_ALL yang didukung signature_hash
+    
+    key = SignatureCache.make_key(sighash, pubkey, signature)
+    if _signature_cache.contains(key):
+        return True
+    
+    # ecdsa di-import saat pertama dibutuhkan (startup CLI lebih cepat)
+    from ecdsa import VerifyingKey, SECP256k1, BadSignatureError
+    from ecdsa.util import sigdecode_der
+    
+    try:
+        verifying_key = VerifyingKey.from_string(bytes(pubkey), curve=SECP256k1)
+        verifying_key.verify_digest(bytes(signature[:-1]), bytes(sighash), sigdecode=sigdecode_der)
+    except BadSignatureError:
+        return False
+    except Exception:
+        # Encoding DER atau pubkey rusak
+        return False
+    
+    _signature_cache.add(key)
+    return True
+
+def signature_hash(transaction, input_index: int, script_pubkey: bytes, hash_type: int = SIGHASH_ALL) -> bytes:
+    """
+    Sighash legacy: scriptSig input yang ditandatangani diganti scriptPubKey
+    output yang dibelanjakan, scriptSig input lain dikosongkan, lalu
+    double SHA-256 dari serialisasi transaksi + 4 byte hash type
+    """
+    tx = copy.copy(transaction)
+    tx.inputs = [copy.copy(txin) for txin in transaction.inputs]
+    for index, txin in enumerate(tx.inputs):
+        txin.script_sig = bytes(script_pubkey) if index == input_index else b''
+    return CryptoUtils.double_sha256(tx.serialize() + struct.pack('<I', hash_type))
+
+def _build_opcode_table() -> List[str]:
+    """Nama handler untuk setiap opcode 0x00 - 0xff"""
+    table = ['_op_unknown'] * 256
+    table[0] = '_op_false'
+    for opcode in range(1, 79):  # 0x01 - 0x4b, OP_PUSHDATA1/2/4
+        table[opcode] = '_op_push'
+    for opcode in range(81, 97):  # OP_1 - OP_16
+        table[opcode] = '_op_small_int'
+    table[106] = '_op_return'
+    table[107] = '_op_toaltstack'
+    table[108] = '_op_fromaltstack'
+    table[117] = '_op_drop'
+    table[118] = '_op_dup'
+    table[135] = '_op_equal'
+    table[136] = '_op_equalverify'
+    table[169] = '_op_hash160'
+    table[170] = '_op_hash256'
+    table[172] = '_op_checksig'
+    table[174] = '_op_checkmultisig'
+    return table
+
+_OPCODE_TABLE = _build_opcode_table()
+
+def _push_only_items(program) -> Optional[List[bytes]]:
+    """Data dari program yang hanya berisi opcode push, None jika ada opcode lain"""
+    items = []
+    for opcode, data in program:
+        if data is not None:
+            items.append(data)
+        elif opcode == 0:
+            items.append(b'')
+        elif 81 <= opcode <= 96:
+            items.append(_SMALL_INTS[opcode - 80])
+        else:
+            return None
+    return items
+
 class Script:
     """
     Bitpy Script Interpreter
@@ -22,92 +269,63 @@ class Script:
         self.pc = 0  # Program counter
         self.last_code_separator = 0
         self.execution_success = True
+        self.sighash: Optional[bytes] = None  # Hash transaksi yang ditandatangani
         
-    def evaluate(self, script_sig: bytes, script_pubkey: bytes) -> bool:
+        # Dispatch table 256 entry (handler terikat ke instance ini)
+        self._dispatch = [getattr(self, name) for name in _OPCODE_TABLE]
+    
+    def evaluate(self, script_sig: bytes, script_pubkey: bytes, sighash: Optional[bytes] = None) -> bool:
         """
         Evaluate script combination (scriptSig + scriptPubKey)
+        Script boleh berupa memoryview dari transaksi yang diserialisasi.
+        sighash: hash transaksi untuk verifikasi OP_CHECKSIG/OP_CHECKMULTISIG;
+        tanpa sighash signature tidak diverifikasi (mode testing)
         """
-        # Combine scripts (scriptSig dijalankan pertama, lalu scriptPubKey)
-        combined_script = script_sig + script_pubkey
-        return self.execute(combined_script)
+        self.sighash = sighash
+        
+        # Fast path untuk P2PKH / P2SH standar (tanpa stack machine)
+        result = self._evaluate_standard(script_sig, script_pubkey)
+        if result is not None:
+            self.stack = [b'\x01' if result else b'']
+            self.altstack = []
+            self.execution_success = result
+            return result
+        
+        # scriptSig dijalankan pertama, lalu scriptPubKey
+        return self._execute(script_sig, script_pubkey)
         
     def execute(self, script: bytes) -> bool:
         """
         Execute Bitpy script opcode
         """
-        self.stack = []
+        return self._execute(None, script)
+    
+    def _execute(self, script_sig: Optional[bytes], script_pubkey: bytes,
+                 stack: Optional[List[bytes]] = None) -> bool:
+        """
+        Jalankan scriptSig lalu scriptPubKey berurutan pada stack yang sama,
+        tanpa membuat buffer gabungan. Data push tetap slice memoryview,
+        disalin hanya oleh opcode yang butuh bytes sendiri.
+        stack: isi awal stack (args redeem script P2SH)
+        """
+        self.stack = list(stack) if stack else []
         self.altstack = []
         self.pc = 0
         self.execution_success = True
         
         try:
-            while self.pc < len(script) and self.execution_success:
-                opcode = script[self.pc]
-                self.pc += 1
-                
-                # Data pushing opcodes (0x01 - 0x4b)
-                if 1 <= opcode <= 75:
-                    # Push opcode bytes ke stack
-                    data_length = opcode
-                    if self.pc + data_length > len(script):
-                        raise ScriptError("PUSHDATA melebihi batas script")
-                    
-                    data = script[self.pc:self.pc + data_length]
-                    self.pc += data_length
-                    self.stack.append(data)
-                    continue
-                    
-                # OP_PUSHDATA1
-                elif opcode == 76:
-                    if self.pc >= len(script):
-                        raise ScriptError("OP_PUSHDATA1 tanpa data")
-                    
-                    data_length = script[self.pc]
-                    self.pc += 1
-                    
-                    if self.pc + data_length > len(script):
-                        raise ScriptError("OP_PUSHDATA1 melebihi batas")
-                    
-                    data = script[self.pc:self.pc + data_length]
-                    self.pc += data_length
-                    self.stack.append(data)
-                    continue
-                    
-                # OP_PUSHDATA2
-                elif opcode == 77:
-                    if self.pc + 1 >= len(script):
-                        raise ScriptError("OP_PUSHDATA2 tanpa data")
-                    
-                    data_length = int.from_bytes(script[self.pc:self.pc+2], 'little')
-                    self.pc += 2
-                    
-                    if self.pc + data_length > len(script):
-                        raise ScriptError("OP_PUSHDATA2 melebihi batas")
-                    
-                    data = script[self.pc:self.pc + data_length]
-                    self.pc += data_length
-                    self.stack.append(data)
-                    continue
-                    
-                # OP_PUSHDATA4
-                elif opcode == 78:
-                    if self.pc + 3 >= len(script):
-                        raise ScriptError("OP_PUSHDATA4 tanpa data")
-                    
-                    data_length = int.from_bytes(script[self.pc:self.pc+4], 'little')
-                    self.pc += 4
-                    
-                    if self.pc + data_length > len(script):
-                        raise ScriptError("OP_PUSHDATA4 melebihi batas")
-                    
-                    data = script[self.pc:self.pc + data_length]
-                    self.pc += data_length
-                    self.stack.append(data)
-                    continue
-                
-                # Handle other opcodes
-                else:
-                    self._execute_opcode(opcode)
+            # scriptSig hampir selalu unik, tidak perlu masuk cache
+            # scriptPubKey di-cache, script berulang tidak di-parse ulang
+            programs = [compile_script(script_pubkey)]
+            if script_sig is not None:
+                programs.insert(0, _compile_script(script_sig))
+            
+            dispatch = self._dispatch
+            for program in programs:
+                for opcode, data in program:
+                    if not self.execution_success:
+                        break
+                    dispatch[opcode](opcode, data)
             
             # Script berhasil jika stack tidak kosong dan top element true
             return (self.execution_success and 
@@ -115,102 +333,164 @@ class Script:
                    self._cast_to_bool(self.stack[-1]))
                    
         except Exception as e:
+            self.execution_success = False
             print(f"Script execution error: {e}")
             return False
     
-    def _execute_opcode(self, opcode: int):
-        """Execute single opcode"""
+    def _evaluate_standard(self, script_sig: bytes, script_pubkey: bytes) -> Optional[bool]:
+        """
+        Validasi template P2PKH / P2SH langsung (P2PKH tanpa stack machine,
+        P2SH menjalankan redeem script). Return None jika script tidak
+        standar, lanjut ke interpreter
+        """
         try:
-            # Constants
-            if opcode == 0:  # OP_0, OP_FALSE
-                self.stack.append(b'')
-                
-            elif 81 <= opcode <= 96:  # OP_1 - OP_16
-                self.stack.append(bytes([opcode - 80]))
-            
-            # Stack operations
-            elif opcode == 107:  # OP_TOALTSTACK
-                if not self.stack:
-                    raise ScriptError("OP_TOALTSTACK dengan stack kosong")
-                self.altstack.append(self.stack.pop())
-                
-            elif opcode == 108:  # OP_FROMALTSTACK
-                if not self.altstack:
-                    raise ScriptError("OP_FROMALTSTACK dengan altstack kosong")
-                self.stack.append(self.altstack.pop())
-                
-            elif opcode == 117:  # OP_DROP
-                if not self.stack:
-                    raise ScriptError("OP_DROP dengan stack kosong")
-                self.stack.pop()
-                
-            elif opcode == 118:  # OP_DUP
-                if not self.stack:
-                    raise ScriptError("OP_DUP dengan stack kosong")
-                self.stack.append(self.stack[-1])
-                
-            elif opcode == 169:  # OP_HASH160
-                if not self.stack:
-                    raise ScriptError("OP_HASH160 dengan stack kosong")
-                data = self.stack.pop()
-                self.stack.append(CryptoUtils.hash160(data))
-                
-            elif opcode == 170:  # OP_HASH256
-                if not self.stack:
-                    raise ScriptError("OP_HASH256 dengan stack kosong")
-                data = self.stack.pop()
-                self.stack.append(CryptoUtils.double_sha256(data))
-            
-            # Crypto operations
-            elif opcode == 172:  # OP_CHECKSIG (sederhana)
-                if len(self.stack) < 2:
-                    raise ScriptError("OP_CHECKSIG butuh 2 element di stack")
-                
-                pubkey = self.stack.pop()
-                signature = self.stack.pop()
-                
-                # Dalam implementasi real, butuh transaction data untuk verifikasi
-                # Di sini kita sederhanakan untuk testing
-                self.stack.append(b'\x01')  # Always return true untuk testing
-                
-            elif opcode == 174:  # OP_CHECKMULTISIG (sederhana)
-                # Implementasi sederhana untuk testing
-                self.stack.append(b'\x01')  # Always return true
-                
-            # Bitwise logic
-            elif opcode == 135:  # OP_EQUAL
-                if len(self.stack) < 2:
-                    raise ScriptError("OP_EQUAL butuh 2 element di stack")
-                
-                a = self.stack.pop()
-                b = self.stack.pop()
-                
-                if a == b:
-                    self.stack.append(b'\x01')
-                else:
-                    self.stack.append(b'')
-                    
-            elif opcode == 136:  # OP_EQUALVERIFY
-                if len(self.stack) < 2:
-                    raise ScriptError("OP_EQUALVERIFY butuh 2 element di stack")
-                
-                a = self.stack.pop()
-                b = self.stack.pop()
-                
-                if a != b:
-                    raise ScriptError("OP_EQUALVERIFY failed")
+            # scriptSig hampir selalu unik, tidak perlu masuk cache
+            items = _push_only_items(_compile_script(script_sig))
+        except ScriptError:
+            return None
+        if items is None:
+            # P2SH hanya menerima scriptSig push-only
+            return False if is_p2sh_script(script_pubkey) else None
+        
+        pubkey_view = memoryview(script_pubkey)
+        
+        # P2PKH: <sig> <pubkey> | OP_DUP OP_HASH160 <20 bytes> OP_EQUALVERIFY OP_CHECKSIG
+        if is_p2pkh_script(script_pubkey):
+            if len(items) < 2:
+                return None
+            signature, pubkey = items[-2], items[-1]
+            if CryptoUtils.hash160(pubkey) != pubkey_view[3:23]:
+                return False
+            return self._check_signature(signature, pubkey)
+        
+        # P2SH: <args> <redeem script> | OP_HASH160 <20 bytes> OP_EQUAL
+        # Redeem script dijalankan dengan args sebagai stack awal
+        if is_p2sh_script(script_pubkey):
+            if not items or CryptoUtils.hash160(items[-1]) != pubkey_view[2:22]:
+                return False
+            return self._execute(None, items[-1], stack=items[:-1])
+        
+        return None
+    
+    def _check_signature(self, signature: bytes, pubkey: bytes) -> bool:
+        """Verifikasi signature untuk OP_CHECKSIG / OP_CHECKMULTISIG"""
+        if self.sighash is None:
+            # Tanpa transaction data signature tidak bisa diverifikasi
+            return True  # Always return true untuk testing
+        return verify_signature(signature, pubkey, self.sighash)
+    
+    # Opcode handlers (dipanggil lewat dispatch table dengan argumen opcode, data)
+    
+    # Constants
+    def _op_false(self, opcode: int, data: Optional[bytes]):  # OP_0, OP_FALSE
+        self.stack.append(b'')
+    
+    def _op_push(self, opcode: int, data: bytes):  # 0x01 - 0x4b, OP_PUSHDATA1/2/4
+        self.stack.append(data)
+    
+    def _op_small_int(self, opcode: int, data: Optional[bytes]):  # OP_1 - OP_16
+        self.stack.append(_SMALL_INTS[opcode - 80])
+    
+    # Stack operations
+    def _op_toaltstack(self, opcode: int, data: Optional[bytes]):
+        if not self.stack:
+            raise ScriptError("OP_TOALTSTACK dengan stack kosong")
+        self.altstack.append(self.stack.pop())
+    
+    def _op_fromaltstack(self, opcode: int, data: Optional[bytes]):
+        if not self.altstack:
+            raise ScriptError("OP_FROMALTSTACK dengan altstack kosong")
+        self.stack.append(self.altstack.pop())
+    
+    def _op_drop(self, opcode: int, data: Optional[bytes]):
+        if not self.stack:
+            raise ScriptError("OP_DROP dengan stack kosong")
+        self.stack.pop()
+    
+    def _op_dup(self, opcode: int, data: Optional[bytes]):
+        if not self.stack:
+            raise ScriptError("OP_DUP dengan stack kosong")
+        self.stack.append(self.stack[-1])
+    
+    def _op_hash160(self, opcode: int, data: Optional[bytes]):
+        if not self.stack:
+            raise ScriptError("OP_HASH160 dengan stack kosong")
+        self.stack.append(CryptoUtils.hash160(self.stack.pop()))
+    
+    def _op_hash256(self, opcode: int, data: Optional[bytes]):
+        if not self.stack:
+            raise ScriptError("OP_HASH256 dengan stack kosong")
+        self.stack.append(CryptoUtils.double_sha256(self.stack.pop()))
+    
+    # Crypto operations
+    def _op_checksig(self, opcode: int, data: Optional[bytes]):  # OP_CHECKSIG (sederhana)
+        if len(self.stack) < 2:
+            raise ScriptError("OP_CHECKSIG butuh 2 element di stack")
+        
+        pubkey = self.stack.pop()
+        signature = self.stack.pop()
+        self.stack.append(b'\x01' if self._check_signature(signature, pubkey) else b'')
+    
+    def _op_checkmultisig(self, opcode: int, data: Optional[bytes]):  # OP_CHECKMULTISIG
+        # Stack: <dummy> <sig1> ... <sigm> <m> <pubkey1> ... <pubkeyn> <n>
+        if not self.stack:
+            raise ScriptError("OP_CHECKMULTISIG dengan stack kosong")
+        
+        n = self._decode_small_int(self.stack.pop())
+        if n < 0 or n > MAX_PUBKEYS_PER_MULTISIG or len(self.stack) < n + 1:
+            raise ScriptError("OP_CHECKMULTISIG jumlah pubkey tidak valid")
+        pubkeys = [self.stack.pop() for _ in range(n)][::-1]
+        
+        m = self._decode_small_int(self.stack.pop())
+        if m < 0 or m > n or len(self.stack) < m + 1:
+            raise ScriptError("OP_CHECKMULTISIG jumlah signature tidak valid")
+        signatures = [self.stack.pop() for _ in range(m)][::-1]
+        self.stack.pop()  # Dummy element (bug off-by-one Bitcoin)
+        
+        # Signature harus urut sesuai urutan pubkey
+        key_index = 0
+        success = True
+        for signature in signatures:
+            while key_index < n and not self._check_signature(signature, pubkeys[key_index]):
+                key_index += 1
+            if key_index == n:
+                success = False
+                break
+            key_index += 1
+        
+        self.stack.append(b'\x01' if success else b'')
+    
+    # Bitwise logic
+    def _op_equal(self, opcode: int, data: Optional[bytes]):
+        if len(self.stack) < 2:
+            raise ScriptError("OP_EQUAL butuh 2 element di stack")
+        
+        a = self.stack.pop()
+        b = self.stack.pop()
+        self.stack.append(b'\x01' if a == b else b'')
+    
+    def _op_equalverify(self, opcode: int, data: Optional[bytes]):
+        if len(self.stack) < 2:
+            raise ScriptError("OP_EQUALVERIFY butuh 2 element di stack")
+        
+        a = self.stack.pop()
+        b = self.stack.pop()
+        if a != b:
+            raise ScriptError("OP_EQUALVERIFY failed")
             
-            # Control operations
-            elif opcode == 106:  # OP_RETURN
-                self.execution_success = False
-                
-            else:
-                # Opcode tidak dikenali
-                raise ScriptError(f"Opcode tidak didukung: {opcode:02x}")
-                
-        except ScriptError as e:
-            self.execution_success = False
-            raise e
+    # Control operations
+    def _op_return(self, opcode: int, data: Optional[bytes]):
+        self.execution_success = False
+    
+    def _op_unknown(self, opcode: int, data: Optional[bytes]):
+        # Opcode tidak dikenali
+        raise ScriptError(f"Opcode tidak didukung: {opcode:02x}")
+    
+    def _decode_small_int(self, data: bytes) -> int:
+        """Decode angka kecil (hasil OP_0 - OP_16 atau push 1 byte)"""
+        if len(data) > 1:
+            raise ScriptError("Angka melebihi 1 byte")
+        return data[0] if data else 0
     
     def _cast_to_bool(self, data: bytes) -> bool:
         """Convert bytes ke boolean (mengikuti aturan Bitpy)"""
@@ -275,14 +555,24 @@ def create_multisig_script(m: int, pubkeys: List[bytes]) -> bytes:
     
     return script
 
+def is_p2pkh_script(script_pubkey: bytes) -> bool:
+    """Cek pattern P2PKH standar"""
+    # Pattern: OP_DUP OP_HASH160 <20 bytes> OP_EQUALVERIFY OP_CHECKSIG
+    return (len(script_pubkey) == 25 and
+            script_pubkey[0] == 0x76 and script_pubkey[1] == 0xa9 and
+            script_pubkey[2] == 0x14 and script_pubkey[23] == 0x88 and
+            script_pubkey[24] == 0xac)
+
+def is_p2sh_script(script_pubkey: bytes) -> bool:
+    """Cek pattern P2SH standar"""
+    # Pattern: OP_HASH160 <20 bytes> OP_EQUAL
+    return (len(script_pubkey) == 23 and
+            script_pubkey[0] == 0xa9 and script_pubkey[1] == 0x14 and
+            script_pubkey[22] == 0x87)
+
 def extract_p2pkh_address(script_pubkey: bytes) -> Optional[str]:
     """Extract address dari P2PKH script"""
-    # Pattern: OP_DUP OP_HASH160 <20 bytes> OP_EQUALVERIFY OP_CHECKSIG
-    if (len(script_pubkey) == 25 and
-        script_pubkey[0] == 0x76 and script_pubkey[1] == 0xa9 and
-        script_pubkey[2] == 0x14 and script_pubkey[23] == 0x88 and 
-        script_pubkey[24] == 0xac):
-        
+    if is_p2pkh_script(script_pubkey):
         pubkey_hash = script_pubkey[3:23]
         return CryptoUtils.create_bitpy_address(pubkey_hash)
     
@@ -290,11 +580,7 @@ def extract_p2pkh_address(script_pubkey: bytes) -> Optional[str]:
 
 def extract_p2sh_address(script_pubkey: bytes) -> Optional[str]:
     """Extract address dari P2SH script"""
-    # Pattern: OP_HASH160 <20 bytes> OP_EQUAL
-    if (len(script_pubkey) == 23 and
-        script_pubkey[0] == 0xa9 and script_pubkey[1] == 0x14 and
-        script_pubkey[22] == 0x87):
-        
+    if is_p2sh_script(script_pubkey):
         script_hash = script_pubkey[2:22]
         return CryptoUtils.create_bitpy_address(script_hash)
     
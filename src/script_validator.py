@@ -0,0 +1,266 @@
+# script_validator.py
+"""
+Bitpy Script Validator - validasi script input block secara paralel
+(validator save_block, lihat ScriptValidator.attach)
+"""
+
+import atexit
+import os
+import time
+import multiprocessing
+import threading
+from typing import Iterable, List, Optional, Sequence, Tuple
+from chain_hooks import get_chain_hooks
+from script import (Script, ScriptError, SignatureCache, get_signature_cache,
+                    is_p2pkh_script, signature_hash, _compile_script, _push_only_items)
+
+CHUNK_SIZE = 64  # Jumlah input per task worker
+MIN_PARALLEL_JOBS = 2 * CHUNK_SIZE  # Di bawah ini validasi serial lebih cepat
+# Tolak block/transaksi dengan script input tidak valid. Nonaktif sampai
+# signature_hash terbukti sama dengan serialisasi yang ditandatangani wallet
+ENFORCE_SCRIPTS = False
+
+# Satu job = (scriptSig, scriptPubKey, sighash)
+ScriptJob = Tuple[bytes, bytes, Optional[bytes]]
+
+# State worker process (diset oleh _init_worker di setiap process pool)
+_worker_stop_event = None
+_worker_script: Optional[Script] = None
+
+def _init_worker(stop_event):
+    """Initializer untuk worker process: satu interpreter per process"""
+    global _worker_stop_event, _worker_script
+    _worker_stop_event = stop_event
+    _worker_script = Script()
+
+def _validate_chunk(jobs: List[ScriptJob]) -> Tuple[List[bool], List[bytes]]:
+    """
+    Validasi satu chunk input (dijalankan di worker process)
+    Return (hasil per input, key signature yang baru terverifikasi)
+    """
+    # Cache worker dikosongkan agar hanya signature baru yang dikirim balik
+    cache = get_signature_cache()
+    cache.clear()
+    
+    results = []
+    for script_sig, script_pubkey, sighash in jobs:
+        if _worker_stop_event.is_set():
+            break
+        valid = _worker_script.evaluate(script_sig, script_pubkey, sighash)
+        results.append(valid)
+        if not valid:
+            _worker_stop_event.set()
+            break
+    return results, cache.keys()
+
+def _owned_job(job: ScriptJob) -> ScriptJob:
+    """Salin memoryview ke bytes agar job bisa dikirim ke worker process"""
+    return tuple(bytes(item) if isinstance(item, memoryview) else item for item in job)
+
+def _is_signature_cached(script_sig: bytes, script_pubkey: bytes, sighash: Optional[bytes]) -> bool:
+    """True jika input P2PKH dengan signature yang sudah ada di signature cache"""
+    if sighash is None or not is_p2pkh_script(script_pubkey):
+        return False
+    try:
+        items = _push_only_items(_compile_script(script_sig))
+    except ScriptError:
+        return False
+    if not items or len(items) < 2:
+        return False
+    return get_signature_cache().peek(SignatureCache.make_key(sighash, items[-1], items[-2]))
+
+def transaction_jobs(transaction, script_pubkeys: Sequence[bytes]) -> List[ScriptJob]:
+    """Job validasi setiap input transaksi (script_pubkeys = scriptPubKey output yang dibelanjakan)"""
+    return [
+        (txin.script_sig, script_pubkey, signature_hash(transaction, index, script_pubkey))
+        for index, (txin, script_pubkey) in enumerate(zip(transaction.inputs, script_pubkeys))
+    ]
+
+class ScriptValidator:
+    """
+    Validasi script semua input block dengan process pool
+    
+    Setiap worker punya interpreter sendiri. Input yang signature-nya sudah
+    ada di cache (contoh: transaksi yang sudah lewat mempool) divalidasi
+    langsung di process utama, sisanya dibagi per chunk ke worker.
+    Validasi berhenti pada input invalid pertama (fail fast).
+    
+    Thread-safe: setiap validasi serial memakai interpreter sendiri, dan
+    pool serta stop event hanya dipakai satu validasi paralel sekaligus.
+    """
+    
+    def __init__(self, num_workers: Optional[int] = None):
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.pool = None
+        self._stop_event = None
+        self._pool_lock = threading.RLock()  # start/stop pool dan validasi paralel
+        self._stats_lock = threading.Lock()
+        
+        # Statistik
+        self.validated_inputs = 0
+        self.last_validation_time = 0.0
+    
+    def attach(self, blockchain):
+        """Daftarkan validasi script input sebagai validator sebelum block disimpan"""
+        if not ENFORCE_SCRIPTS:
+            return
+        get_chain_hooks(blockchain).add_validator('scripts', lambda block: self.validate_block(block, blockchain))
+    
+    def validate_block(self, block, blockchain) -> bool:
+        """
+        Validasi script semua input non-coinbase block yang memperpanjang
+        best block (scriptPubKey dari address index atau transaksi sebelumnya
+        di block yang sama). Block cabang dan input yang output-nya tidak ada
+        di index (non-standar) diserahkan ke validasi database
+        """
+        from chain_index import get_address_index
+        
+        best_block = blockchain.get_best_block()
+        if best_block is None or block.header.prev_block_hash != best_block.header.get_hash():
+            return True
+        
+        address_index = get_address_index()
+        created = {}  # Outpoint -> scriptPubKey output transaksi di block ini
+        jobs: List[ScriptJob] = []
+        for tx in block.transactions[1:]:
+            for index, txin in enumerate(tx.inputs):
+                outpoint = (txin.prev_tx_hash, txin.prev_output_index)
+                script_pubkey = created.get(outpoint)
+                if script_pubkey is None:
+                    output = address_index.get_output(outpoint)
+                    if output is None:
+                        continue
+                    script_pubkey = output[1]
+                jobs.append((txin.script_sig, script_pubkey, signature_hash(tx, index, script_pubkey)))
+            txid = tx.get_txid()
+            for vout, txout in enumerate(tx.outputs):
+                created[(txid, vout)] = txout.script_pubkey
+        return all(self.validate(jobs))
+    
+    def start(self):
+        """Buat process pool (dipakai ulang untuk setiap block)"""
+        with self._pool_lock:
+            self._start()
+    
+    def _start(self):
+        if self.pool or self.num_workers <= 1:
+            return
+        try:
+            self._stop_event = multiprocessing.Event()
+            self.pool = multiprocessing.Pool(
+                processes=self.num_workers,
+                initializer=_init_worker,
+                initargs=(self._stop_event,)
+            )
+        except (OSError, ImportError) as e:
+            # Contoh: Termux/Android tidak mendukung semaphore multiprocessing
+            print(f"Multiprocessing tidak tersedia ({e}), validasi script dengan 1 thread")
+            self.num_workers = 1
+            self.pool = None
+    
+    def stop(self):
+        """Hentikan process pool"""
+        with self._pool_lock:
+            if self.pool:
+                self.pool.terminate()
+                self.pool.join()
+                self.pool = None
+    
+    def validate(self, jobs: Iterable[ScriptJob], parallel: bool = True) -> List[Optional[bool]]:
+        """
+        Validasi list (scriptSig, scriptPubKey, sighash)
+        Return hasil per input: True/False, atau None jika tidak dievaluasi
+        karena input lain sudah gagal. parallel=False (contoh: satu transaksi
+        mempool) tidak pernah membuat atau memakai process pool
+        """
+        jobs = list(jobs)
+        start_time = time.time()
+        
+        results: List[Optional[bool]] = [None] * len(jobs)
+        remote: List[int] = []
+        failed = False
+        
+        # Input dengan signature di cache cukup divalidasi di sini
+        script = Script()
+        for index, job in enumerate(jobs):
+            if _is_signature_cached(*job):
+                results[index] = script.evaluate(*job)
+                if not results[index]:
+                    failed = True
+                    break
+            else:
+                remote.append(index)
+        
+        if not failed and remote:
+            parallel_done = False
+            if parallel and len(remote) >= MIN_PARALLEL_JOBS:
+                with self._pool_lock:
+                    self._start()
+                    if self.pool:
+                        self._validate_parallel(jobs, remote, results)
+                        parallel_done = True
+            if not parallel_done:
+                self._validate_serial(jobs, remote, results)
+        
+        with self._stats_lock:
+            self.validated_inputs += sum(1 for result in results if result is not None)
+            self.last_validation_time = time.time() - start_time
+        return results
+    
+    def _validate_serial(self, jobs: Sequence[ScriptJob], indexes: List[int], results: List[Optional[bool]]):
+        """Validasi input satu per satu di process utama (interpreter sendiri per panggilan)"""
+        script = Script()
+        for index in indexes:
+            results[index] = script.evaluate(*jobs[index])
+            if not results[index]:
+                break
+    
+    def _validate_parallel(self, jobs: Sequence[ScriptJob], indexes: List[int], results: List[Optional[bool]]):
+        """Bagi input ke worker per chunk, hentikan semua worker jika ada yang invalid"""
+        self._stop_event.clear()
+        cache = get_signature_cache()
+        
+        pending = []
+        for offset in range(0, len(indexes), CHUNK_SIZE):
+            chunk = indexes[offset:offset + CHUNK_SIZE]
+            pending.append((chunk, self.pool.apply_async(
+                _validate_chunk, ([_owned_job(jobs[index]) for index in chunk],)
+            )))
+        
+        # Tunggu semua task selesai (worker berhenti cepat setelah stop event)
+        for chunk, async_result in pending:
+            chunk_results, verified = async_result.get()
+            for index, valid in zip(chunk, chunk_results):
+                results[index] = valid
+            for key in verified:
+                cache.add(key)
+        
+        self._stop_event.clear()
+    
+    def get_stats(self) -> dict:
+        """Statistik validator"""
+        return {
+            'workers': self.num_workers,
+            'validated_inputs': self.validated_inputs,
+            'last_validation_time': self.last_validation_time
+        }
+
+# Global validator instance
+_script_validator: Optional[ScriptValidator] = None
+
+def get_script_validator() -> ScriptValidator:
+    """Get global script validator"""
+    global _script_validator
+    if _script_validator is None:
+        _script_validator = ScriptValidator()
+        atexit.register(stop_script_validator)  # Process pool tidak tertinggal saat program keluar
+    return _script_validator
+
+def validate_scripts_parallel(jobs: Iterable[ScriptJob]) -> List[Optional[bool]]:
+    """Validasi script semua input block dengan global validator"""
+    return get_script_validator().validate(jobs)
+
+def stop_script_validator():
+    """Hentikan process pool global validator"""
+    if _script_validator:
+        _script_validator.stop()
@@ -0,0 +1,156 @@
+# template_manager.py
+"""
+Bitpy Template Manager - refresh template block mining secara live
+"""
+
+import time
+import threading
+from typing import Callable, List, Optional
+from block import Block
+from database import get_data_manager
+
+DEFAULT_MIN_REFRESH_INTERVAL = 5.0  # Jarak minimum refresh karena perubahan mempool (detik)
+DEFAULT_POLL_INTERVAL = 0.5  # Interval cek best block dan mempool (detik)
+
+class BlockTemplate:
+    """Block siap mining beserta state untuk extranonce rolling"""
+    
+    def __init__(self, block: Block, height: int, coinbase_branch: List[bytes]):
+        self.block = block
+        self.height = height
+        self.coinbase_branch = coinbase_branch  # Merkle branch coinbase (index 0)
+        self.created_at = time.time()
+        self.stale_since: Optional[float] = None  # Waktu template sebelumnya terdeteksi basi
+
+class TemplateManager:
+    """
+    Pantau best block dan mempool, bangun ulang template di background
+    
+    Tip berubah -> rebuild segera (work lama sudah basi).
+    Mempool berubah -> rebuild paling cepat setiap min_refresh_interval.
+    Template baru diserahkan lewat on_template; penggantian di hashing
+    worker dilakukan oleh miner di antara batch nonce.
+    """
+    
+    def __init__(self, build_template: Callable[[], Optional[BlockTemplate]],
+                 on_template: Callable[[BlockTemplate], None],
+                 min_refresh_interval: float = DEFAULT_MIN_REFRESH_INTERVAL,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 get_tip: Optional[Callable[[], Optional[bytes]]] = None):
+        self.build_template = build_template
+        self.on_template = on_template
+        self.get_tip = get_tip or self._best_block_hash
+        self.min_refresh_interval = min_refresh_interval
+        self.poll_interval = poll_interval
+        
+        self.template_tip: Optional[bytes] = None
+        self.template_mempool_revision = None
+        self.last_refresh = 0.0
+        
+        # Metrics
+        self.refresh_count = 0
+        self.tip_changes = 0
+        self.stale_work_time = 0.0
+        self.last_build_time = 0.0
+        
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+    
+    def start(self):
+        """Mulai thread pemantau template"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        """Stop thread pemantau template"""
+        self.running = False
+        self._wakeup.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+    
+    def notify(self):
+        """Cek perubahan segera (contoh: dipanggil network saat ada block/tx baru)"""
+        self._wakeup.set()
+    
+    def refresh(self, stale_since: Optional[float] = None) -> Optional[BlockTemplate]:
+        """Bangun template baru secara sinkron"""
+        with self._lock:
+            revision = self._mempool_revision()
+            start_time = time.time()
+            template = self.build_template()
+            self.last_build_time = time.time() - start_time
+            
+            if template:
+                template.stale_since = stale_since
+                self.template_tip = template.block.header.prev_block_hash
+                self.template_mempool_revision = revision
+                self.last_refresh = time.time()
+                self.refresh_count += 1
+            return template
+    
+    def mark_swapped(self, template: BlockTemplate):
+        """Catat bahwa template sudah dipakai hashing worker"""
+        if template.stale_since is not None:
+            self.stale_work_time += time.time() - template.stale_since
+    
+    def get_stats(self) -> dict:
+        """Metrics template manager"""
+        return {
+            'template_refreshes': self.refresh_count,
+            'tip_changes': self.tip_changes,
+            'stale_work_time': self.stale_work_time,
+            'last_build_time': self.last_build_time,
+            'template_age': time.time() - self.last_refresh if self.last_refresh else 0
+        }
+    
+    def _run(self):
+        """Loop pemantau best block dan mempool"""
+        while self.running:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            if not self.running:
+                break
+            
+            try:
+                template = self._check()
+                if template:
+                    self.on_template(template)
+            except Exception as e:
+                print(f"Template manager error: {e}")
+    
+    def _check(self) -> Optional[BlockTemplate]:
+        """Rebuild template jika tip atau mempool berubah"""
+        if self.template_tip is None:
+            return None
+        
+        tip = self.get_tip()
+        if tip and tip != self.template_tip:
+            self.tip_changes += 1
+            return self.refresh(stale_since=time.time())
+        
+        if (self._mempool_revision() != self.template_mempool_revision and
+                time.time() - self.last_refresh >= self.min_refresh_interval):
+            return self.refresh()
+        
+        return None
+    
+    def _best_block_hash(self) -> Optional[bytes]:
+        """Hash best block di blockchain"""
+        best_block = get_data_manager().db.get_best_block()
+        return best_block.header.get_hash() if best_block else None
+    
+    def _mempool_revision(self):
+        """Penanda perubahan mempool"""
+        mempool = getattr(get_data_manager().db, 'mempool', None)
+        if mempool is None:
+            return None
+        revision = getattr(mempool, 'revision', None)
+        if revision is None:
+            revision = len(mempool.get_transactions())
+        return revision
@@ -0,0 +1,477 @@
+# work_server.py
+#!/usr/bin/env python3
+"""
+Bitpy Work Server - bagi template mining ke hasher eksternal (protokol mirip Stratum)
+
+Protokol: JSON per baris di atas TCP.
+  client -> mining.subscribe [name]            -> {session_id, nonce_range}
+  client -> mining.get_work []                 -> work unit berikutnya
+  client -> mining.submit [job_id, extranonce, nonce] -> true / error
+  server -> mining.notify [work, clean_jobs]   (job baru, clean = tip berubah)
+
+Setiap session punya ruang extranonce sendiri ((session_id << 32) | n) dan
+setiap work unit adalah range nonce di satu extranonce, jadi tidak ada dua
+hasher yang menghitung header yang sama.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+from block import Block
+from hasher import HeaderHasher, search_nonce, target_to_bytes
+from mining import Miner
+from mining_stats import RateMeter
+from template_manager import BlockTemplate
+
+DEFAULT_WORK_HOST = '127.0.0.1'
+DEFAULT_WORK_PORT = 3333
+NONCE_SPACE = 1 << 32
+DEFAULT_NONCE_RANGE = 1 << 28  # Ukuran satu work unit (16 unit per extranonce)
+DEFAULT_SHARE_MULTIPLIER = 256  # Share target = block target * multiplier
+MAX_JOBS = 8  # Job lama (tip sama) yang share-nya masih diterima
+MAX_TARGET = (1 << 256) - 1
+WORK_RETRY_DELAY = 0.5  # Jeda client sebelum minta work lagi saat server belum punya job (detik)
+
+# Kode error submit (mengikuti Stratum)
+ERROR_OTHER = 20
+ERROR_STALE_JOB = 21
+ERROR_DUPLICATE_SHARE = 22
+ERROR_LOW_DIFFICULTY = 23
+ERROR_NOT_SUBSCRIBED = 25
+ERROR_NO_WORK = 26  # Belum ada job (menunggu template berikutnya), client coba lagi
+
+class WorkError(Exception):
+    """Error request yang dikirim ke hasher"""
+    
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+class WorkJob:
+    """Satu template block yang dibagi ke semua session"""
+    
+    def __init__(self, job_id: str, template: BlockTemplate, miner: Miner, share_multiplier: int):
+        self.job_id = job_id
+        self.template = template
+        self.miner = miner
+        self.height = template.height
+        self.prev_block_hash = template.block.header.prev_block_hash
+        self.target = template.block.header.get_target()
+        self.share_target = min(self.target * share_multiplier, MAX_TARGET)
+        self.blocks: Dict[int, Block] = {}  # extranonce -> block (header dengan merkle root sendiri)
+        self.shares = set()  # (extranonce, nonce) yang sudah diterima
+    
+    def get_block(self, extranonce: int) -> Block:
+        """Block untuk extranonce (dibangun sekali lalu di-cache)"""
+        block = self.blocks.get(extranonce)
+        if block is None:
+            block = self.miner.build_block(self.template, extranonce)
+            self.blocks[extranonce] = block
+        return block
+
+class WorkSession:
+    """Koneksi satu hasher"""
+    
+    def __init__(self, session_id: int, writer: asyncio.StreamWriter):
+        self.session_id = session_id
+        self.writer = writer
+        self.name = f"session-{session_id}"
+        self.subscribed = False
+        
+        # Posisi work unit berikutnya di job saat ini
+        self.job_id: Optional[str] = None
+        self.extranonce_index = 0
+        self.next_nonce = 0
+        
+        self.accepted = 0
+        self.rejected = 0
+        self.stale = 0
+        self.blocks = 0
+        self.hashes = RateMeter()  # Estimasi hash dari share (hash per share = 2^256 / share target)
+    
+    def owns_extranonce(self, extranonce: int) -> bool:
+        return extranonce >> 32 == self.session_id
+    
+    def next_unit(self, job: WorkJob, nonce_range: int) -> Tuple[int, int, int]:
+        """(extranonce, nonce_start, nonce_end) berikutnya, tidak pernah overlap"""
+        if self.job_id != job.job_id:
+            self.job_id = job.job_id
+            self.extranonce_index = 0
+            self.next_nonce = 0
+        if self.next_nonce >= NONCE_SPACE:
+            self.extranonce_index += 1
+            self.next_nonce = 0
+        
+        extranonce = (self.session_id << 32) | self.extranonce_index
+        start = self.next_nonce
+        self.next_nonce = min(start + nonce_range, NONCE_SPACE)
+        return extranonce, start, self.next_nonce
+    
+    def get_stats(self) -> dict:
+        return {
+            'name': self.name,
+            'accepted_shares': self.accepted,
+            'rejected_shares': self.rejected,
+            'stale_shares': self.stale,
+            'blocks': self.blocks,
+            'hash_rate': self.hashes.get_rate('1m')
+        }
+
+class WorkServer:
+    """
+    Server asyncio yang membagikan work dari template Miner ke hasher eksternal
+    
+    Template dibangun oleh TemplateManager milik Miner (tanpa menjalankan
+    hashing lokal); tip berubah -> job baru dengan clean_jobs dikirim ke
+    semua session. Share divalidasi terhadap share target, share yang juga
+    memenuhi target block diserahkan ke Miner.submit_block.
+    """
+    
+    def __init__(self, miner_address: str, host: str = DEFAULT_WORK_HOST, port: int = DEFAULT_WORK_PORT,
+                 nonce_range: int = DEFAULT_NONCE_RANGE, share_multiplier: int = DEFAULT_SHARE_MULTIPLIER):
+        self.host = host
+        self.port = port
+        self.nonce_range = nonce_range
+        self.share_multiplier = share_multiplier
+        
+        self.miner = Miner(miner_address, num_workers=1)
+        self.miner.template_manager.on_template = self._on_template
+        
+        self.jobs: Dict[str, WorkJob] = {}
+        self.current_job: Optional[WorkJob] = None
+        self.sessions: Dict[int, WorkSession] = {}
+        self._next_session_id = 1  # Extranonce prefix 0 dipakai Miner lokal
+        self._next_job_id = 0
+        
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.started_at = 0.0
+        self.accepted_shares = 0
+        self.rejected_shares = 0
+        self.stale_shares = 0
+    
+    async def start(self):
+        """Bangun template pertama lalu mulai listen"""
+        self.loop = asyncio.get_running_loop()
+        template = await self.loop.run_in_executor(None, self.miner.template_manager.refresh)
+        if not template:
+            raise RuntimeError("Tidak bisa membuat template (genesis block belum ada?)")
+        self._set_job(template)
+        
+        self.miner.submitter.start()
+        self.miner.template_manager.start()
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.started_at = time.time()
+        print(f"Work server listening on {self.host}:{self.port} (mining to {self.miner.miner_address})")
+    
+    async def serve_forever(self):
+        """Start lalu jalan sampai di-cancel"""
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+    
+    async def stop(self):
+        """Stop server, template manager, dan submitter"""
+        if self.server:
+            self.server.close()
+            for session in list(self.sessions.values()):
+                session.writer.close()
+            await self.server.wait_closed()
+            self.server = None
+        self.miner.template_manager.stop()
+        await asyncio.get_running_loop().run_in_executor(None, self.miner.submitter.stop)
+    
+    def get_stats(self) -> dict:
+        """Statistik server dan per session"""
+        sessions = {session_id: session.get_stats() for session_id, session in self.sessions.items()}
+        job = self.current_job
+        return {
+            'sessions': len(self.sessions),
+            'height': job.height if job else None,
+            'job_id': job.job_id if job else None,
+            'jobs': len(self.jobs),
+            'accepted_shares': self.accepted_shares,
+            'rejected_shares': self.rejected_shares,
+            'stale_shares': self.stale_shares,
+            'found_blocks': self.miner.found_blocks,
+            'hash_rate': sum(session['hash_rate'] for session in sessions.values()),
+            'uptime': time.time() - self.started_at if self.started_at else 0,
+            'session_stats': sessions,
+            **self.miner.submitter.get_stats()
+        }
+    
+    # Template / job
+    
+    def _on_template(self, template: BlockTemplate):
+        """Callback TemplateManager (dari thread template manager)"""
+        if self.loop and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._set_job, template)
+    
+    def _set_job(self, template: BlockTemplate):
+        """Pasang job baru dan kirim ke semua session (di event loop)"""
+        self.miner.template_manager.mark_swapped(template)
+        self._next_job_id += 1
+        job = WorkJob(f"{self._next_job_id:x}", template, self.miner, self.share_multiplier)
+        
+        # Tip berubah: share untuk job lama sudah basi
+        clean = self.current_job is None or job.prev_block_hash != self.current_job.prev_block_hash
+        if clean:
+            self.jobs.clear()
+        self.jobs[job.job_id] = job
+        while len(self.jobs) > MAX_JOBS:
+            del self.jobs[next(iter(self.jobs))]
+        self.current_job = job
+        
+        for session in self.sessions.values():
+            if session.subscribed:
+                self._send(session, {'id': None, 'method': 'mining.notify',
+                                     'params': [self._make_work(session, job), clean]})
+    
+    def _make_work(self, session: WorkSession, job: WorkJob) -> dict:
+        """Work unit untuk session: header 80-byte (nonce 0) dan range nonce"""
+        extranonce, nonce_start, nonce_end = session.next_unit(job, self.nonce_range)
+        return {
+            'job_id': job.job_id,
+            'height': job.height,
+            'header': job.get_block(extranonce).header.serialize().hex(),
+            'extranonce': extranonce,
+            'nonce_start': nonce_start,
+            'nonce_end': nonce_end,
+            'target': f"{job.target:064x}",
+            'share_target': f"{job.share_target:064x}"
+        }
+    
+    # Koneksi
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        session = WorkSession(self._next_session_id, writer)
+        self._next_session_id += 1
+        self.sessions[session.session_id] = session
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = self._handle_line(session, line)
+                if response is not None:
+                    self._send(session, response)
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            del self.sessions[session.session_id]
+            writer.close()
+    
+    def _handle_line(self, session: WorkSession, line: bytes) -> Optional[dict]:
+        """Proses satu request, return response (None untuk notification)"""
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            method = request['method']
+            params = request.get('params') or []
+        except (ValueError, KeyError, AttributeError):
+            return {'id': None, 'result': None, 'error': {'code': ERROR_OTHER, 'message': "Invalid request"}}
+        
+        try:
+            if method == 'mining.subscribe':
+                result = self._subscribe(session, params)
+            elif method == 'mining.get_work':
+                result = self._get_work(session)
+            elif method == 'mining.submit':
+                result = self._submit(session, *params)
+            else:
+                raise WorkError(ERROR_OTHER, f"Unknown method: {method}")
+        except WorkError as e:
+            return {'id': request_id, 'result': None, 'error': {'code': e.code, 'message': e.message}}
+        except (TypeError, ValueError) as e:
+            return {'id': request_id, 'result': None, 'error': {'code': ERROR_OTHER, 'message': str(e)}}
+        
+        if request_id is None:
+            return None
+        return {'id': request_id, 'result': result, 'error': None}
+    
+    def _send(self, session: WorkSession, message: dict):
+        session.writer.write(json.dumps(message, separators=(',', ':')).encode() + b'\n')
+    
+    # Method
+    
+    def _subscribe(self, session: WorkSession, params: List) -> dict:
+        if params:
+            session.name = str(params[0])
+        session.subscribed = True
+        return {'session_id': session.session_id, 'nonce_range': self.nonce_range}
+    
+    def _get_work(self, session: WorkSession) -> dict:
+        if not session.subscribed:
+            raise WorkError(ERROR_NOT_SUBSCRIBED, "Not subscribed")
+        if self.current_job is None:
+            # Job terakhir sudah basi (block ditemukan), job baru dikirim lewat mining.notify
+            raise WorkError(ERROR_NO_WORK, "No work available, retry")
+        return self._make_work(session, self.current_job)
+    
+    def _submit(self, session: WorkSession, job_id: str, extranonce: int, nonce: int) -> bool:
+        if not session.subscribed:
+            raise WorkError(ERROR_NOT_SUBSCRIBED, "Not subscribed")
+        
+        job = self.jobs.get(job_id)
+        if job is None:
+            session.stale += 1
+            self.stale_shares += 1
+            raise WorkError(ERROR_STALE_JOB, "Stale job")
+        
+        extranonce, nonce = int(extranonce), int(nonce)
+        if not session.owns_extranonce(extranonce) or not 0 <= nonce < NONCE_SPACE:
+            session.rejected += 1
+            self.rejected_shares += 1
+            raise WorkError(ERROR_OTHER, "Extranonce/nonce di luar work unit session")
+        if (extranonce, nonce) in job.shares:
+            session.rejected += 1
+            self.rejected_shares += 1
+            raise WorkError(ERROR_DUPLICATE_SHARE, "Duplicate share")
+        
+        block = job.get_block(extranonce)
+        block_hash = HeaderHasher(block.header.serialize()).hash_nonce(nonce)
+        if block_hash > target_to_bytes(job.share_target):
+            session.rejected += 1
+            self.rejected_shares += 1
+            raise WorkError(ERROR_LOW_DIFFICULTY, "Low difficulty share")
+        
+        job.shares.add((extranonce, nonce))
+        session.accepted += 1
+        self.accepted_shares += 1
+        session.hashes.mark((1 << 256) // (job.share_target + 1))
+        
+        if block_hash <= target_to_bytes(job.target):
+            # Share memenuhi target block: simpan dan relay lewat submitter
+            job.blocks.pop(extranonce)  # Block ini tidak boleh diubah lagi
+            block.header.nonce = nonce
+            session.blocks += 1
+            print(f"🎉 BLOCK FOUND by {session.name}! Height: {job.height} Hash: {block.header.get_hash_hex()}")
+            self.miner.submit_block(block, job.height)
+            # Semua job masih di atas tip lama: share berikutnya basi sampai job baru dikirim
+            self.jobs.clear()
+            self.current_job = None
+            self.miner.template_manager.notify()
+        return True
+
+# Hasher client (referensi)
+
+class WorkClient:
+    """Hasher sederhana: ambil work unit, cari nonce yang memenuhi share target, submit"""
+    
+    def __init__(self, host: str = DEFAULT_WORK_HOST, port: int = DEFAULT_WORK_PORT, name: str = "hasher"):
+        self.host = host
+        self.port = port
+        self.name = name
+        self.work: Optional[dict] = None
+        self.accepted = 0
+        self.rejected = 0
+        self._request_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+    
+    async def run(self, max_shares: Optional[int] = None):
+        """Hashing sampai koneksi putus (atau max_shares share diterima)"""
+        reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        reader_task = asyncio.create_task(self._read_loop(reader))
+        loop = asyncio.get_running_loop()
+        try:
+            await self._request('mining.subscribe', [self.name])
+            self.work = await self._get_work(None)
+            while max_shares is None or self.accepted < max_shares:
+                work = self.work
+                nonce = await loop.run_in_executor(None, self._search, work)
+                if nonce is None:
+                    if self.work is work:
+                        self.work = await self._get_work(work)
+                    continue
+                
+                # Lanjut dari nonce berikutnya di work unit yang sama
+                work['nonce_start'] = nonce + 1
+                try:
+                    await self._request('mining.submit', [work['job_id'], work['extranonce'], nonce])
+                    self.accepted += 1
+                except WorkError:
+                    self.rejected += 1
+        finally:
+            reader_task.cancel()
+            self.writer.close()
+    
+    async def _get_work(self, current: Optional[dict]) -> dict:
+        """Work unit berikutnya; jika server belum punya job, tunggu (notify atau retry)"""
+        while self.work is current:
+            try:
+                return await self._request('mining.get_work', [])
+            except WorkError as e:
+                if e.code != ERROR_NO_WORK:
+                    raise
+                await asyncio.sleep(WORK_RETRY_DELAY)
+        return self.work
+    
+    def _search(self, work: dict) -> Optional[int]:
+        return search_nonce(
+            bytes.fromhex(work['header']), target_to_bytes(int(work['share_target'], 16)),
+            work['nonce_start'], work['nonce_end'],
+            keep_running=lambda: self.work is work
+        )
+    
+    async def _request(self, method: str, params: List):
+        self._request_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[self._request_id] = future
+        message = {'id': self._request_id, 'method': method, 'params': params}
+        self.writer.write(json.dumps(message).encode() + b'\n')
+        await self.writer.drain()
+        return await future
+    
+    async def _read_loop(self, reader: asyncio.StreamReader):
+        while True:
+            line = await reader.readline()
+            if not line:
+                for future in self._pending.values():
+                    future.set_exception(ConnectionError("Work server disconnected"))
+                return
+            
+            message = json.loads(line)
+            if message.get('method') == 'mining.notify':
+                # Job baru: hentikan pencarian di work unit lama
+                self.work = message['params'][0]
+                continue
+            
+            future = self._pending.pop(message.get('id'), None)
+            if future is None:
+                continue
+            if message.get('error'):
+                future.set_exception(WorkError(message['error']['code'], message['error']['message']))
+            else:
+                future.set_result(message['result'])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bitpy work server / hasher")
+    subparsers = parser.add_subparsers(dest='mode', required=True)
+    
+    serve_parser = subparsers.add_parser('serve', help="Jalankan work server")
+    serve_parser.add_argument('address', help="Address penerima reward")
+    serve_parser.add_argument('--host', default=DEFAULT_WORK_HOST)
+    serve_parser.add_argument('--port', type=int, default=DEFAULT_WORK_PORT)
+    serve_parser.add_argument('--share-multiplier', type=int, default=DEFAULT_SHARE_MULTIPLIER)
+    
+    hash_parser = subparsers.add_parser('hash', help="Jalankan hasher yang terhubung ke work server")
+    hash_parser.add_argument('--host', default=DEFAULT_WORK_HOST)
+    hash_parser.add_argument('--port', type=int, default=DEFAULT_WORK_PORT)
+    hash_parser.add_argument('--name', default="hasher")
+    args = parser.parse_args()
+    
+    try:
+        if args.mode == 'serve':
+            server = WorkServer(args.address, args.host, args.port, share_multiplier=args.share_multiplier)
+            asyncio.run(server.serve_forever())
+        else:
+            asyncio.run(WorkClient(args.host, args.port, args.name).run())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,83 @@
+# test_chain_dump.py
+"""
+dumpblockchain: format text, NDJSON, dan binary dari records streaming
+"""
+
+import io
+import json
+import os
+import struct
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+pytest.importorskip('block')
+util = pytest.importorskip('util')
+
+from chain_dump import BINARY_MAGIC, BINARY_VERSION, dump_blocks
+
+class FakeTx:
+    def __init__(self, data: bytes):
+        self.data = data
+    
+    def serialize(self) -> bytes:
+        return self.data
+    
+    def get_txid_hex(self) -> str:
+        return self.data.hex()
+
+def make_block(height: int):
+    header = SimpleNamespace(
+        version=1, prev_block_hash=bytes([height]) * 32, merkle_root=bytes([height + 1]) * 32,
+        timestamp=1700000000 + height, bits=0x207fffff, nonce=height,
+        serialize=lambda: bytes([height]) * 80
+    )
+    return SimpleNamespace(header=header, transactions=[FakeTx(bytes([height, n])) for n in range(height + 1)])
+
+def records(count: int):
+    """Generator seperti HeightIndex.iter_blocks (block dibuat saat dibaca)"""
+    for height in range(count):
+        yield height, f'{height:064x}', make_block(height)
+
+def test_text_format():
+    output = io.StringIO()
+    assert dump_blocks(records(2), output) == 2
+    assert output.getvalue().splitlines() == [
+        f"Block 0: {0:064x}", "  Transactions: 1", "  Timestamp: 1700000000",
+        f"Block 1: {1:064x}", "  Transactions: 2", "  Timestamp: 1700000001",
+    ]
+
+def test_ndjson_format():
+    output = io.StringIO()
+    assert dump_blocks(records(3), output, 'ndjson') == 3
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [line['height'] for line in lines] == [0, 1, 2]
+    assert lines[2]['tx_count'] == 3
+    assert lines[2]['txids'] == ['0200', '0201', '0202']
+    assert lines[1]['prev_block_hash'] == '01' * 32
+
+def test_binary_format():
+    output = io.BytesIO()
+    assert dump_blocks(records(2), output, 'binary') == 2
+    data = output.getvalue()
+    assert data[:5] == BINARY_MAGIC + bytes([BINARY_VERSION])
+    
+    offset = 5
+    for height in range(2):
+        record_height, length = struct.unpack_from('<II', data, offset)
+        offset += 8
+        payload = data[offset:offset + length]
+        offset += length
+        block = make_block(height)
+        expected = block.header.serialize() + util.ByteUtils.var_int_encode(len(block.transactions))
+        expected += b''.join(tx.serialize() for tx in block.transactions)
+        assert record_height == height
+        assert payload == expected
+    assert offset == len(data)
+
+def test_unknown_format_rejected():
+    with pytest.raises(ValueError):
+        dump_blocks(records(1), io.StringIO(), 'xml')
@@ -0,0 +1,125 @@
+# test_chain_index.py
+"""
+Address index: saldo ikut best chain, block cabang diabaikan, reorg lewat
+undo data (atau rebuild jika undo tidak cukup), snapshot bisa di-load
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+for module in ('block', 'database', 'crypto', 'util'):
+    pytest.importorskip(module)
+
+import chain_index
+from block import Block, BlockHeader
+from chain_index import AddressIndex
+from script import create_p2pkh_script, extract_p2pkh_address
+
+GENESIS_PREV_HASH = b'\x00' * 32
+ADDRESSES = [extract_p2pkh_address(create_p2pkh_script(bytes([key]) * 20)) for key in range(4)]
+
+class FakeChain:
+    """
+    Blockchain minimal: best block = height tertinggi, block hanya bisa
+    diambil lewat get_block (tanpa dict blocks publik)
+    """
+    
+    def __init__(self):
+        self._blocks = {}
+        self._heights = {}
+        self.best = None
+    
+    def get_best_block(self):
+        return self.best
+    
+    def get_block(self, block_hash: str):
+        return self._blocks.get(block_hash)
+    
+    def get_block_height(self) -> int:
+        return self._heights[self.best.header.get_hash()]
+    
+    def save_block(self, block) -> bool:
+        prev_hash = block.header.prev_block_hash
+        height = 0 if prev_hash == GENESIS_PREV_HASH else self._heights[prev_hash] + 1
+        self._blocks[block.header.get_hash_hex()] = block
+        self._heights[block.header.get_hash()] = height
+        if self.best is None or height > self.get_block_height():
+            self.best = block
+        return True
+
+class FakeTx:
+    def __init__(self, txid: bytes, inputs, outputs):
+        self.txid = txid
+        self.inputs = [SimpleNamespace(prev_tx_hash=tx_hash, prev_output_index=index, script_sig=b'')
+                       for tx_hash, index in inputs]
+        self.outputs = [SimpleNamespace(value=value, script_pubkey=create_p2pkh_script(bytes([key]) * 20))
+                        for key, value in outputs]
+    
+    def get_txid(self) -> bytes:
+        return self.txid
+
+def coinbase(txid: bytes, key: int, value: int) -> FakeTx:
+    return FakeTx(txid, [(GENESIS_PREV_HASH, 0xffffffff)], [(key, value)])
+
+def make_block(prev, n: int, transactions):
+    prev_hash = prev.header.get_hash() if prev else GENESIS_PREV_HASH
+    return Block(BlockHeader(1, prev_hash, bytes([n]) * 32, n, 0x207fffff, n), transactions)
+
+def balances(index: AddressIndex):
+    return [index.get_balances(ADDRESSES[1:]).get(address, 0) for address in ADDRESSES[1:]]
+
+@pytest.fixture
+def chain(tmp_path):
+    blockchain = FakeChain()
+    genesis = make_block(None, 0, [coinbase(b'cb0', 1, 50)])
+    blockchain.save_block(genesis)
+    index = AddressIndex(str(tmp_path / 'address_index.pkl'))
+    index.attach(blockchain)
+    index.bootstrap(blockchain)
+    return blockchain, genesis, index
+
+def test_reorg_follows_best_chain(chain):
+    blockchain, genesis, index = chain
+    assert balances(index) == [50, 0, 0]
+    
+    a1 = make_block(genesis, 1, [coinbase(b'cb1', 3, 50), FakeTx(b't1', [(b'cb0', 0)], [(2, 30), (1, 20)])])
+    blockchain.save_block(a1)
+    assert balances(index) == [20, 30, 50]
+    
+    # Block cabang dengan height sama: best block tidak berubah
+    side = make_block(genesis, 11, [coinbase(b'cbs', 3, 7)])
+    blockchain.save_block(side)
+    assert balances(index) == [20, 30, 50]
+    
+    # Cabang lebih panjang: a1 di-disconnect, output cb0 dibelanjakan ulang
+    side2 = make_block(side, 12, [coinbase(b'cbs2', 2, 1), FakeTx(b'ts', [(b'cb0', 0)], [(3, 50)])])
+    blockchain.save_block(side2)
+    assert balances(index) == [0, 1, 57]
+    assert index.chain == [block.header.get_hash() for block in (genesis, side, side2)]
+    
+    index.save()
+    reloaded = AddressIndex(index.path)
+    reloaded.bootstrap(blockchain)
+    assert reloaded.balances == index.balances and reloaded.chain == index.chain
+
+def test_reorg_deeper_than_undo_rebuilds(chain, monkeypatch):
+    blockchain, genesis, index = chain
+    monkeypatch.setattr(chain_index, 'MAX_UNDO_BLOCKS', 1)
+    side = make_block(genesis, 11, [coinbase(b'cbs', 3, 7)])
+    side2 = make_block(side, 12, [coinbase(b'cbs2', 2, 1)])
+    for block in (side, side2):
+        blockchain.save_block(block)
+    assert balances(index) == [50, 1, 7]
+    
+    a1 = make_block(genesis, 1, [coinbase(b'cb1', 1, 5)])
+    a2 = make_block(a1, 2, [coinbase(b'cb2', 1, 5)])
+    a3 = make_block(a2, 3, [coinbase(b'cb3', 3, 5)])
+    for block in (a1, a2, a3):
+        blockchain.save_block(block)
+    assert balances(index) == [60, 0, 5]
+    assert index.chain == [block.header.get_hash() for block in (genesis, a1, a2, a3)]
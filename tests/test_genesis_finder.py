@@ -0,0 +1,67 @@
+# test_genesis_finder.py
+"""
+Genesis finder paralel: hasil sama dengan mode serial, checkpoint
+di-resume (termasuk timestamp), dan range yang sudah di-scan dilewati
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from genesis_finder import (_add_range, _is_scanned, _load_checkpoint, _save_checkpoint,
+                            bits_to_target, find_genesis, find_genesis_parallel)
+
+VERSION = 1
+PREV_BLOCK = '00' * 32
+MERKLE_ROOT = '4a5e1e4baab89f3a32518a88c31bc87f618f76673e2cc77ab2127b7afdeda33b'
+EASY_BITS = 0x207fffff  # Sekitar separuh hash valid
+TIMESTAMP = 1700000000
+
+def make_params(timestamp=TIMESTAMP):
+    return {'version': VERSION, 'prev_block': PREV_BLOCK, 'merkle_root': MERKLE_ROOT,
+            'timestamp': timestamp, 'bits': EASY_BITS}
+
+def test_add_range_merges_adjacent_ranges():
+    ranges = []
+    _add_range(ranges, 32, 48)
+    _add_range(ranges, 0, 16)
+    _add_range(ranges, 16, 32)
+    assert ranges == [[0, 48]]
+    assert _is_scanned(ranges, 16, 48)
+    assert not _is_scanned(ranges, 40, 64)
+
+def test_parallel_matches_serial():
+    serial = find_genesis(VERSION, PREV_BLOCK, MERKLE_ROOT, TIMESTAMP, EASY_BITS)
+    parallel = find_genesis_parallel(VERSION, PREV_BLOCK, MERKLE_ROOT, TIMESTAMP, EASY_BITS,
+                                     workers=1, chunk_size=16)
+    assert parallel == serial
+    assert int(parallel[1], 16) <= bits_to_target(EASY_BITS)
+
+def test_resume_takes_timestamp_and_skips_scanned_ranges(tmp_path):
+    checkpoint = str(tmp_path / 'genesis.json')
+    _save_checkpoint(checkpoint, make_params(), {TIMESTAMP: [[0, 64]]})
+    
+    nonce, _, timestamp = find_genesis_parallel(VERSION, PREV_BLOCK, MERKLE_ROOT, None, EASY_BITS,
+                                                workers=1, checkpoint=checkpoint, chunk_size=16)
+    assert timestamp == TIMESTAMP
+    assert nonce >= 64
+    
+    with open(checkpoint) as f:
+        assert json.load(f)['params']['timestamp'] == TIMESTAMP
+
+def test_checkpoint_for_other_parameters_rejected(tmp_path):
+    checkpoint = str(tmp_path / 'genesis.json')
+    _save_checkpoint(checkpoint, make_params(), {})
+    
+    params = make_params()
+    params['bits'] = 0x1e0ffff0
+    with pytest.raises(ValueError):
+        _load_checkpoint(checkpoint, params)
+    
+    params = make_params(timestamp=None)
+    assert _load_checkpoint(checkpoint, params) == {}
+    assert params['timestamp'] == TIMESTAMP
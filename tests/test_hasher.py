@@ -0,0 +1,49 @@
+# test_hasher.py
+"""
+Hash dari SHA-256 midstate sama dengan double SHA-256 header penuh,
+dan search_nonce menemukan nonce valid pertama di range
+"""
+
+import hashlib
+import os
+import struct
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from hasher import HeaderHasher, search_nonce, serialize_header, target_to_bytes
+
+HEADER = serialize_header(1, bytes(range(32)), bytes(range(32, 64)), 1700000000, 0x207fffff, 0)
+
+def full_hash(header: bytes, nonce: int) -> bytes:
+    data = header[:76] + struct.pack('<I', nonce)
+    return hashlib.sha256(hashlib.sha256(data).digest()).digest()
+
+def test_midstate_hash_matches_full_header_hash():
+    hasher = HeaderHasher(HEADER)
+    for nonce in (0, 1, 0x12345678, 0xFFFFFFFF):
+        assert hasher.hash_nonce(nonce) == full_hash(HEADER, nonce)
+
+def test_header_size_checked():
+    with pytest.raises(ValueError):
+        HeaderHasher(HEADER[:79])
+
+def test_search_nonce_finds_first_valid_nonce():
+    target = target_to_bytes(1 << 252)  # Rata-rata 1 dari 16 hash valid
+    expected = next(nonce for nonce in range(1000) if full_hash(HEADER, nonce) <= target)
+    counted = []
+    assert search_nonce(HEADER, target, 0, 1000, on_batch=counted.append, batch_size=7) == expected
+    assert sum(counted) == expected + 1
+
+def test_search_nonce_range_end_exclusive_and_stop():
+    target = target_to_bytes(1 << 252)
+    first = next(nonce for nonce in range(1000) if full_hash(HEADER, nonce) <= target)
+    assert search_nonce(HEADER, target, 0, first) is None
+    assert search_nonce(HEADER, target, 0, 1000, keep_running=lambda: False) is None
+
+def test_search_nonce_little_endian_target():
+    target = target_to_bytes(1 << 252)
+    expected = next(nonce for nonce in range(1000) if full_hash(HEADER, nonce)[::-1] <= target)
+    assert search_nonce(HEADER, target, 0, 1000, byteorder='little') == expected
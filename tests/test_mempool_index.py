@@ -0,0 +1,81 @@
+# test_mempool_index.py
+"""
+Pemilihan transaksi template berdasarkan fee rate paket ancestor:
+urutan fee rate, parent sebelum child (CPFP), dan batas ukuran block
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+for module in ('block', 'transaction', 'network'):
+    pytest.importorskip(module)
+
+from mempool_index import FeeRateIndex
+
+class FakeTx:
+    def __init__(self, name: str, parents=()):
+        self.txid = name.encode()
+        self.inputs = [SimpleNamespace(prev_tx_hash=parent.encode()) for parent in parents]
+    
+    def get_txid(self) -> bytes:
+        return self.txid
+
+def build_index(specs):
+    """specs: (nama, fee, size, parent) urut masuk mempool"""
+    index = FeeRateIndex()
+    for name, fee, size, parents in specs:
+        index.add(FakeTx(name, parents), fee=fee, size=size)
+    return index
+
+def names(transactions):
+    return [tx.get_txid().decode() for tx in transactions]
+
+def test_selects_by_fee_rate():
+    index = build_index([
+        ('low', 100, 100, ()),
+        ('high', 1000, 100, ()),
+        ('mid', 500, 100, ()),
+    ])
+    assert names(index.select_transactions()) == ['high', 'mid', 'low']
+
+def test_child_pays_for_parent():
+    index = build_index([
+        ('parent', 10, 100, ()),
+        ('mid', 400, 100, ()),
+        ('child', 1000, 100, ('parent',)),  # Paket parent+child: 1010 / 200
+    ])
+    assert names(index.select_transactions()) == ['parent', 'child', 'mid']
+
+def test_parent_selected_before_child_after_own_inclusion():
+    index = build_index([
+        ('parent', 1000, 100, ()),
+        ('child', 10, 100, ('parent',)),
+        ('other', 500, 100, ()),
+    ])
+    assert names(index.select_transactions()) == ['parent', 'other', 'child']
+
+def test_respects_max_size():
+    index = build_index([
+        ('big', 5000, 300, ()),
+        ('small', 1000, 100, ()),
+        ('tiny', 10, 50, ()),
+    ])
+    selected = names(index.select_transactions(max_size=200))
+    assert selected == ['small', 'tiny']
+    # Kandidat dikembalikan ke heap, pemilihan berikutnya sama
+    assert names(index.select_transactions(max_size=200)) == selected
+
+def test_remove_updates_descendant_package():
+    index = build_index([
+        ('parent', 10, 100, ()),
+        ('child', 1000, 100, ('parent',)),
+        ('mid', 400, 100, ()),
+    ])
+    index.remove(b'parent')
+    assert index.entries[b'child'].ancestor_fee == 1000
+    assert names(index.select_transactions()) == ['child', 'mid']
@@ -0,0 +1,69 @@
+# test_merkle.py
+"""
+MerkleCache sama dengan merkle root yang dihitung ulang penuh setelah
+append / replace / truncate / update, dan branch coinbase valid
+"""
+
+import hashlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+pytest.importorskip('crypto')
+
+from merkle import MerkleCache, merkle_root_from_branch
+
+def double_sha256(data: bytes) -> bytes:
+    return hashlib.sha256(hashlib.sha256(data).digest()).digest()
+
+def full_root(tx_hashes):
+    """Merkle root dihitung ulang dari semua leaf (node ganjil diduplikasi)"""
+    if not tx_hashes:
+        return b'\x00' * 32
+    level = list(tx_hashes)
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [double_sha256(level[i] + level[i + 1]) for i in range(0, len(level), 2)]
+    return level[0]
+
+def txids(count: int, salt: bytes = b''):
+    return [hashlib.sha256(salt + bytes([n])).digest() for n in range(count)]
+
+def test_root_matches_full_recompute():
+    for count in range(0, 12):
+        assert MerkleCache(txids(count)).root == full_root(txids(count))
+
+def test_incremental_operations():
+    hashes = txids(9)
+    cache = MerkleCache(hashes[:5])
+    for tx_hash in hashes[5:]:
+        cache.append(tx_hash)
+    assert cache.root == full_root(hashes)
+    
+    hashes[3] = hashlib.sha256(b'ganti').digest()
+    cache.replace(3, hashes[3])
+    assert cache.root == full_root(hashes)
+    
+    for size in (7, 4, 1, 0):
+        cache.truncate(size)
+        assert cache.root == full_root(hashes[:size])
+
+def test_update_reuses_common_prefix():
+    cache = MerkleCache()
+    for template in (txids(6), txids(6, b'cb')[:1] + txids(6)[1:], txids(8), txids(3), txids(10, b'x')):
+        cache.update(template)
+        assert cache.root == full_root(template)
+        assert cache.leaves == template
+
+def test_coinbase_branch():
+    hashes = txids(7)
+    cache = MerkleCache(hashes)
+    branch = cache.get_branch(0)
+    assert merkle_root_from_branch(hashes[0], branch) == cache.root
+    
+    coinbase = hashlib.sha256(b'extranonce 1').digest()
+    assert merkle_root_from_branch(coinbase, branch) == full_root([coinbase] + hashes[1:])
@@ -0,0 +1,88 @@
+# test_reward.py
+"""
+Tabel subsidy sama dengan loop halving, supply O(1) sama dengan jumlah
+subsidy per block, dan validator nilai coinbase
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+pytest.importorskip('util')
+pytest.importorskip('block')
+
+from reward import (HALVING_INTERVAL, INITIAL_SUBSIDY, MAX_SUPPLY, get_block_fees,
+                    get_block_subsidy, get_supply_at, get_supply_info, validate_coinbase)
+
+def loop_subsidy(height: int) -> int:
+    """Subsidy dengan loop halving (implementasi lama)"""
+    subsidy = INITIAL_SUBSIDY
+    for _ in range(height // HALVING_INTERVAL):
+        subsidy //= 2
+    return subsidy
+
+def test_subsidy_matches_halving_loop():
+    for era in range(70):
+        for height in (era * HALVING_INTERVAL, (era + 1) * HALVING_INTERVAL - 1):
+            assert get_block_subsidy(height) == loop_subsidy(height)
+
+def test_supply_matches_sum_of_subsidies():
+    boundaries = [0, 1, HALVING_INTERVAL - 1, HALVING_INTERVAL, 3 * HALVING_INTERVAL + 7]
+    for height in boundaries:
+        era = height // HALVING_INTERVAL
+        expected = sum(loop_subsidy(e * HALVING_INTERVAL) * HALVING_INTERVAL for e in range(era))
+        expected += (height - era * HALVING_INTERVAL + 1) * loop_subsidy(height)
+        assert get_supply_at(height) == expected
+    assert get_supply_at(-1) == 0
+    assert get_supply_at(100 * HALVING_INTERVAL) == MAX_SUPPLY
+
+def test_supply_info():
+    info = get_supply_info(HALVING_INTERVAL - 1)
+    assert info['issued_supply'] + info['remaining_supply'] == MAX_SUPPLY
+    assert info['next_subsidy'] == INITIAL_SUBSIDY // 2
+
+class FakeTx:
+    def __init__(self, txid: bytes, inputs, outputs):
+        self.txid = txid
+        self.inputs = [SimpleNamespace(prev_tx_hash=h, prev_output_index=i) for h, i in inputs]
+        self.outputs = [SimpleNamespace(value=value) for value in outputs]
+    
+    def get_txid(self) -> bytes:
+        return self.txid
+
+class FakeAddressIndex:
+    def __init__(self, utxos):
+        self.utxos = utxos
+    
+    def get_output(self, outpoint):
+        return self.utxos.get(outpoint)
+
+def make_block(prev_hash: bytes, transactions):
+    return SimpleNamespace(header=SimpleNamespace(prev_block_hash=prev_hash), transactions=transactions)
+
+def test_block_fees_include_outputs_created_in_block():
+    index = FakeAddressIndex({(b'a', 0): (100, b'')})
+    parent = FakeTx(b'p', [(b'a', 0)], [90])  # fee 10
+    child = FakeTx(b'c', [(b'p', 0)], [85])  # fee 5, input dari transaksi di block ini
+    block = make_block(b'tip', [FakeTx(b'cb', [], [0]), parent, child])
+    assert get_block_fees(block, index) == 15
+    
+    unknown = make_block(b'tip', [FakeTx(b'cb', [], [0]), FakeTx(b'x', [(b'z', 0)], [1])])
+    assert get_block_fees(unknown, index) is None
+
+def test_validate_coinbase(monkeypatch):
+    index = FakeAddressIndex({(b'a', 0): (100, b'')})
+    monkeypatch.setattr('chain_index.get_address_index', lambda: index, raising=False)
+    best = SimpleNamespace(header=SimpleNamespace(get_hash=lambda: b'tip'))
+    blockchain = SimpleNamespace(get_best_block=lambda: best, get_block_height=lambda: HALVING_INTERVAL - 1)
+    subsidy = get_block_subsidy(HALVING_INTERVAL)
+    spend = FakeTx(b's', [(b'a', 0)], [90])
+    
+    assert validate_coinbase(make_block(b'tip', [FakeTx(b'cb', [], [subsidy + 10]), spend]), blockchain)
+    assert not validate_coinbase(make_block(b'tip', [FakeTx(b'cb', [], [subsidy + 11]), spend]), blockchain)
+    # Block cabang tidak dicek di sini
+    assert validate_coinbase(make_block(b'other', [FakeTx(b'cb', [], [subsidy + 11]), spend]), blockchain)
@@ -0,0 +1,86 @@
+# test_rpc.py
+"""
+JSON-RPC server: autentikasi cookie, Host header, Content-Type, dan
+validasi params lewat signature method
+"""
+
+import http.client
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+for module in ('block', 'transaction', 'database', 'network', 'wallet', 'crypto', 'util', 'rocksdict'):
+    pytest.importorskip(module)
+
+from rpc import (INVALID_PARAMS, METHOD_NOT_FOUND, PARSE_ERROR, RPCServer, allowed_hosts,
+                 auth_header)
+
+REQUEST = {'jsonrpc': '2.0', 'method': 'getblockcount', 'id': 1}
+
+@pytest.fixture
+def server(tmp_path):
+    cookie_path = str(tmp_path / '.cookie')
+    data_manager = SimpleNamespace(db=SimpleNamespace(get_block_count=lambda: 7, get_block=lambda block_hash: None))
+    server = RPCServer(data_manager, SimpleNamespace(current_wallet=None), port=0, cookie_path=cookie_path)
+    server.start()
+    yield server
+    server.stop()
+
+def post(server, body, **headers):
+    host, port = server.address
+    request_headers = {'Content-Type': 'application/json', 'Authorization': auth_header(server.cookie_path)}
+    request_headers.update(headers)
+    connection = http.client.HTTPConnection(host, port)
+    connection.request('POST', '/', body if isinstance(body, bytes) else json.dumps(body),
+                       headers={name: value for name, value in request_headers.items() if value is not None})
+    response = connection.getresponse()
+    data = response.read()
+    connection.close()
+    return response.status, json.loads(data) if response.status == 200 else None
+
+def test_cookie_only_readable_by_owner(server):
+    assert os.stat(server.cookie_path).st_mode & 0o777 == 0o600
+
+def test_authenticated_request(server):
+    assert post(server, REQUEST) == (200, {'jsonrpc': '2.0', 'result': 7, 'id': 1})
+
+def test_missing_or_wrong_auth_rejected(server):
+    assert post(server, REQUEST, Authorization=None)[0] == 401
+    assert post(server, REQUEST, Authorization='Basic eDp5')[0] == 401
+
+def test_host_header_checked(server):
+    port = server.address[1]
+    assert post(server, REQUEST, Host='evil.example')[0] == 403
+    assert post(server, REQUEST, Host=f'localhost:{port}')[0] == 200
+
+def test_content_type_required(server):
+    assert post(server, REQUEST, **{'Content-Type': 'text/plain'})[0] == 415
+    assert post(server, REQUEST, **{'Content-Type': 'application/json; charset=utf-8'})[0] == 200
+
+def test_json_rpc_errors(server):
+    assert post(server, b'{bukan json')[1]['error']['code'] == PARSE_ERROR
+    assert post(server, {'jsonrpc': '2.0', 'method': 'tidakada', 'id': 2})[1]['error']['code'] == METHOD_NOT_FOUND
+    bad_params = {'jsonrpc': '2.0', 'method': 'getblock', 'params': [1, 2, 3], 'id': 3}
+    assert post(server, bad_params)[1]['error']['code'] == INVALID_PARAMS
+
+def test_batch_and_notification(server):
+    status, responses = post(server, [REQUEST, {'jsonrpc': '2.0', 'method': 'getblockcount'}])
+    assert status == 200 and [response['id'] for response in responses] == [1]
+    assert post(server, {'jsonrpc': '2.0', 'method': 'getblockcount'}) == (204, None)
+
+def test_cookie_removed_on_stop(tmp_path):
+    cookie_path = str(tmp_path / '.cookie')
+    server = RPCServer(SimpleNamespace(db=None), SimpleNamespace(current_wallet=None), port=0, cookie_path=cookie_path)
+    server.start()
+    server.stop()
+    assert not os.path.exists(cookie_path)
+
+def test_allowed_hosts():
+    assert allowed_hosts('0.0.0.0', 8332) is None
+    assert {'localhost:8332', '127.0.0.1', '[::1]:8332'} <= allowed_hosts('127.0.0.1', 8332)
+    assert allowed_hosts('10.0.0.5', 8332) == {'10.0.0.5', '10.0.0.5:8332'}
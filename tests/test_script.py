@@ -0,0 +1,118 @@
+# test_script.py
+"""
+Script interpreter: fast path P2PKH / P2SH sama dengan stack machine,
+redeem script P2SH dijalankan, dan multisig
+"""
+
+import hashlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+pytest.importorskip('crypto')
+ecdsa = pytest.importorskip('ecdsa')
+
+from ecdsa.util import sigencode_der
+from crypto import CryptoUtils
+from script import (SIGHASH_ALL, Script, ScriptError, compile_script, create_multisig_script,
+                    create_p2pkh_script, create_p2sh_script, _compile_script_cached)
+
+SIGHASH = hashlib.sha256(b'bitpy test transaction').digest()
+
+def make_key(secret: int):
+    signing_key = ecdsa.SigningKey.from_secret_exponent(secret, curve=ecdsa.SECP256k1)
+    return signing_key, signing_key.get_verifying_key().to_string('compressed')
+
+def sign(signing_key, sighash: bytes = SIGHASH) -> bytes:
+    return signing_key.sign_digest(sighash, sigencode=sigencode_der) + bytes([SIGHASH_ALL])
+
+def push(data: bytes) -> bytes:
+    return bytes([len(data)]) + data
+
+def interpret(script_sig: bytes, script_pubkey: bytes, sighash: bytes) -> bool:
+    """Evaluasi lewat stack machine saja (tanpa fast path)"""
+    script = Script()
+    script.sighash = sighash
+    return script._execute(script_sig, script_pubkey)
+
+def test_p2pkh_fast_path_matches_interpreter():
+    signing_key, pubkey = make_key(3)
+    _, other_pubkey = make_key(4)
+    script_pubkey = create_p2pkh_script(CryptoUtils.hash160(pubkey))
+    
+    cases = [
+        push(sign(signing_key)) + push(pubkey),  # valid
+        push(sign(signing_key, hashlib.sha256(b'lain').digest())) + push(pubkey),  # signature salah
+        push(sign(signing_key)) + push(other_pubkey),  # pubkey tidak cocok hash
+    ]
+    for script_sig in cases:
+        assert Script().evaluate(script_sig, script_pubkey, SIGHASH) == interpret(script_sig, script_pubkey, SIGHASH)
+    assert Script().evaluate(cases[0], script_pubkey, SIGHASH)
+    assert not Script().evaluate(cases[1], script_pubkey, SIGHASH)
+
+def test_multisig_requires_m_valid_signatures():
+    keys = [make_key(secret) for secret in (5, 6, 7)]
+    script_pubkey = create_multisig_script(2, [pubkey for _, pubkey in keys])
+    
+    valid = b'\x00' + push(sign(keys[0][0])) + push(sign(keys[2][0]))
+    one_signature = b'\x00' + push(sign(keys[0][0]))
+    wrong_order = b'\x00' + push(sign(keys[2][0])) + push(sign(keys[0][0]))
+    
+    assert Script().evaluate(valid, script_pubkey, SIGHASH)
+    assert not Script().evaluate(one_signature, script_pubkey, SIGHASH)
+    assert not Script().evaluate(wrong_order, script_pubkey, SIGHASH)
+
+def test_p2sh_runs_redeem_script():
+    signing_key, pubkey = make_key(8)
+    other_key, _ = make_key(9)
+    redeem_script = create_multisig_script(1, [pubkey])
+    script_pubkey = create_p2sh_script(CryptoUtils.hash160(redeem_script))
+    
+    valid = b'\x00' + push(sign(signing_key)) + push(redeem_script)
+    wrong_signature = b'\x00' + push(sign(other_key)) + push(redeem_script)
+    
+    assert Script().evaluate(valid, script_pubkey, SIGHASH)
+    assert not Script().evaluate(wrong_signature, script_pubkey, SIGHASH)
+
+def test_p2sh_rejects_wrong_redeem_script_and_non_push_script_sig():
+    signing_key, pubkey = make_key(10)
+    redeem_script = create_multisig_script(1, [pubkey])
+    script_pubkey = create_p2sh_script(CryptoUtils.hash160(redeem_script))
+    
+    wrong_redeem = b'\x00' + push(sign(signing_key)) + push(b'\x51')  # OP_1
+    non_push = b'\x76' + push(redeem_script)  # OP_DUP di scriptSig
+    
+    assert not Script().evaluate(wrong_redeem, script_pubkey, SIGHASH)
+    assert not Script().evaluate(non_push, script_pubkey, SIGHASH)
+
+def test_opcode_dispatch():
+    # OP_1 OP_DUP OP_TOALTSTACK OP_FROMALTSTACK OP_EQUAL
+    assert Script().execute(bytes([0x51, 0x76, 0x6b, 0x6c, 0x87]))
+    # OP_2 OP_3 OP_EQUAL
+    assert not Script().execute(bytes([0x52, 0x53, 0x87]))
+    # OP_1 OP_RETURN
+    assert not Script().execute(bytes([0x51, 0x6a]))
+    # OP_1 + opcode tidak dikenal (0xba)
+    assert not Script().execute(bytes([0x51, 0xba]))
+    # PUSHDATA1 / PUSHDATA2 dengan data sama, lalu OP_EQUAL
+    data = b'\xab' * 80
+    assert Script().execute(b'\x4c' + bytes([80]) + data + b'\x4d' + (80).to_bytes(2, 'little') + data + b'\x87')
+
+def test_compile_script_cache():
+    script_pubkey = create_p2pkh_script(b'\x01' * 20)
+    before = _compile_script_cached.cache_info().hits
+    program = compile_script(script_pubkey)
+    # memoryview dengan isi sama memakai entry cache yang sama
+    assert compile_script(memoryview(bytearray(script_pubkey))) is program
+    assert _compile_script_cached.cache_info().hits > before
+    assert [opcode for opcode, _ in program] == [0x76, 0xa9, 0x14, 0x88, 0xac]
+    assert program[2][1] == b'\x01' * 20
+
+def test_compile_script_rejects_truncated_push():
+    with pytest.raises(ScriptError):
+        compile_script(b'\x05\x01\x02')
+    with pytest.raises(ScriptError):
+        compile_script(b'\x4d\xff')
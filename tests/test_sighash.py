@@ -0,0 +1,81 @@
+# test_sighash.py
+"""
+signature_hash: signature yang dibuat atas sighash input diterima
+interpreter, dan hanya berlaku untuk input / transaksi / hash type itu
+"""
+
+import hashlib
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+pytest.importorskip('crypto')
+ecdsa = pytest.importorskip('ecdsa')
+
+from ecdsa.util import sigencode_der
+from crypto import CryptoUtils
+from script import SIGHASH_ALL, Script, create_p2pkh_script, signature_hash
+
+class FakeTransaction:
+    """Transaksi minimal: serialize() mencakup scriptSig setiap input"""
+    
+    def __init__(self, inputs, outputs):
+        self.inputs = inputs
+        self.outputs = outputs
+    
+    def serialize(self) -> bytes:
+        data = b''.join(
+            txin.prev_tx_hash + txin.prev_output_index.to_bytes(4, 'little')
+            + len(txin.script_sig).to_bytes(1, 'little') + bytes(txin.script_sig)
+            for txin in self.inputs
+        )
+        return data + b''.join(txout.value.to_bytes(8, 'little') + txout.script_pubkey for txout in self.outputs)
+
+def push(data: bytes) -> bytes:
+    return bytes([len(data)]) + data
+
+@pytest.fixture
+def spend():
+    signing_key = ecdsa.SigningKey.from_secret_exponent(11, curve=ecdsa.SECP256k1)
+    pubkey = signing_key.get_verifying_key().to_string('compressed')
+    script_pubkey = create_p2pkh_script(CryptoUtils.hash160(pubkey))
+    inputs = [SimpleNamespace(prev_tx_hash=hashlib.sha256(bytes([n])).digest(), prev_output_index=n, script_sig=b'')
+              for n in range(2)]
+    tx = FakeTransaction(inputs, [SimpleNamespace(value=40, script_pubkey=script_pubkey)])
+    return signing_key, pubkey, script_pubkey, tx
+
+def sign_input(signing_key, pubkey, tx, index, script_pubkey, hash_type=SIGHASH_ALL) -> bytes:
+    sighash = signature_hash(tx, index, script_pubkey)
+    signature = signing_key.sign_digest(sighash, sigencode=sigencode_der) + bytes([hash_type])
+    return push(signature) + push(pubkey)
+
+def test_signature_over_sighash_verifies(spend):
+    signing_key, pubkey, script_pubkey, tx = spend
+    for index in range(len(tx.inputs)):
+        tx.inputs[index].script_sig = sign_input(signing_key, pubkey, tx, index, script_pubkey)
+    for index, txin in enumerate(tx.inputs):
+        assert Script().evaluate(txin.script_sig, script_pubkey, signature_hash(tx, index, script_pubkey))
+
+def test_signature_hash_ignores_script_sigs_and_keeps_transaction(spend):
+    _, _, script_pubkey, tx = spend
+    before = signature_hash(tx, 0, script_pubkey)
+    tx.inputs[1].script_sig = b'\x51'
+    assert signature_hash(tx, 0, script_pubkey) == before
+    assert tx.inputs[0].script_sig == b''  # transaksi asli tidak diubah
+    assert signature_hash(tx, 1, script_pubkey) != before
+
+def test_signature_bound_to_input_and_outputs(spend):
+    signing_key, pubkey, script_pubkey, tx = spend
+    script_sig = sign_input(signing_key, pubkey, tx, 0, script_pubkey)
+    assert not Script().evaluate(script_sig, script_pubkey, signature_hash(tx, 1, script_pubkey))
+    tx.outputs[0].value = 41
+    assert not Script().evaluate(script_sig, script_pubkey, signature_hash(tx, 0, script_pubkey))
+
+def test_unsupported_hash_type_rejected(spend):
+    signing_key, pubkey, script_pubkey, tx = spend
+    script_sig = sign_input(signing_key, pubkey, tx, 0, script_pubkey, hash_type=0x02)
+    assert not Script().evaluate(script_sig, script_pubkey, signature_hash(tx, 0, script_pubkey))
@@ -0,0 +1,33 @@
+# test_startup.py
+"""
+Startup CLI tetap cepat: budget waktu 'main.py help' dan tidak ada
+subsystem berat (ecdsa, RocksDB, process pool) yang di-import saat startup
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from bench_startup import imported_modules, measure_baseline, measure_command
+
+STARTUP_RUNS = 5
+# Budget di atas startup interpreter kosong (ms), bisa diubah untuk mesin lambat (Termux)
+STARTUP_BUDGET_MS = float(os.environ.get('BITPY_STARTUP_BUDGET_MS', 100))
+HEAVY_MODULES = ('ecdsa', 'rocksdict', 'multiprocessing.pool')
+
+def test_help_within_startup_budget():
+    baseline = measure_baseline(STARTUP_RUNS)
+    result = measure_command(['help'], runs=STARTUP_RUNS)
+    assert result['median_ms'] <= baseline + STARTUP_BUDGET_MS, (
+        f"main.py help: {result['median_ms']:.1f} ms, budget {baseline + STARTUP_BUDGET_MS:.1f} ms "
+        f"(import paling lambat: {result['slowest_imports'][:3]})"
+    )
+
+def test_help_does_not_import_heavy_modules():
+    modules = imported_modules(['help'])
+    heavy = sorted(
+        module for module in modules
+        if any(module == name or module.startswith(name + '.') for name in HEAVY_MODULES)
+    )
+    assert not heavy, f"main.py help meng-import module berat saat startup: {heavy}"
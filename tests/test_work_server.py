@@ -0,0 +1,137 @@
+# test_work_server.py
+"""
+Work server: work unit per session tidak overlap, dan validasi share
+(session, job basi, duplikat, share target, share yang memenuhi target block)
+"""
+
+import hashlib
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+for module in ('block', 'transaction', 'database', 'network', 'crypto', 'util'):
+    pytest.importorskip(module)
+
+from block import Block, BlockHeader
+from hasher import HeaderHasher, search_nonce, target_to_bytes
+from template_manager import BlockTemplate
+from work_server import (ERROR_DUPLICATE_SHARE, ERROR_LOW_DIFFICULTY, ERROR_NO_WORK, ERROR_NOT_SUBSCRIBED,
+                         ERROR_OTHER, ERROR_STALE_JOB, NONCE_SPACE, WorkServer, WorkSession)
+
+BITS = 0x1f00ffff  # Target block sekitar 2^240, share target (x256) sekitar 2^248
+
+class FakeMiner:
+    """Pengganti Miner: block per extranonce dengan merkle root berbeda"""
+    
+    def __init__(self):
+        self.submitted = []
+        self.found_blocks = 0
+        self.template_manager = SimpleNamespace(mark_swapped=lambda template: None, notify=lambda: None)
+    
+    def build_block(self, template, extranonce):
+        header = template.block.header
+        merkle_root = hashlib.sha256(extranonce.to_bytes(8, 'little')).digest()
+        return Block(BlockHeader(header.version, header.prev_block_hash, merkle_root,
+                                 header.timestamp, header.bits, 0), [])
+    
+    def submit_block(self, block, height):
+        self.submitted.append((block, height))
+
+class FakeWriter:
+    def __init__(self):
+        self.messages = []
+    
+    def write(self, data: bytes):
+        self.messages.append(json.loads(data))
+
+@pytest.fixture
+def server():
+    server = WorkServer('addr', nonce_range=1 << 30)
+    server.miner = FakeMiner()
+    header = BlockHeader(1, b'\x11' * 32, b'\x00' * 32, 1700000000, BITS, 0)
+    server._set_job(BlockTemplate(Block(header, []), 5, []))
+    return server
+
+def add_session(server, subscribe=True) -> WorkSession:
+    session = WorkSession(server._next_session_id, FakeWriter())
+    server._next_session_id += 1
+    server.sessions[session.session_id] = session
+    if subscribe:
+        request(server, session, 'mining.subscribe', ['hasher'])
+    return session
+
+def request(server, session, method, params=None):
+    line = json.dumps({'id': 1, 'method': method, 'params': params or []}).encode()
+    return server._handle_line(session, line)
+
+def error_code(response):
+    return response['error']['code'] if response['error'] else None
+
+def find_nonce(header: bytes, target: int, reject_below=None) -> int:
+    """Nonce pertama dengan hash <= target (dan > reject_below jika diberikan)"""
+    start = 0
+    while True:
+        nonce = search_nonce(header, target_to_bytes(target), start, NONCE_SPACE)
+        if reject_below is None or HeaderHasher(header).hash_nonce(nonce) > target_to_bytes(reject_below):
+            return nonce
+        start = nonce + 1
+
+def test_work_requires_subscription_and_job(server):
+    session = add_session(server, subscribe=False)
+    assert error_code(request(server, session, 'mining.get_work')) == ERROR_NOT_SUBSCRIBED
+    
+    request(server, session, 'mining.subscribe')
+    server.current_job = None
+    assert error_code(request(server, session, 'mining.get_work')) == ERROR_NO_WORK
+
+def test_work_units_do_not_overlap(server):
+    first, second = add_session(server), add_session(server)
+    units = set()
+    for session in (first, second):
+        for _ in range(6):  # 4 unit per extranonce (nonce_range 2^30)
+            work = request(server, session, 'mining.get_work')['result']
+            assert work['extranonce'] >> 32 == session.session_id
+            units.add((work['extranonce'], work['nonce_start'], work['nonce_end']))
+    assert len(units) == 12
+    extranonces = {extranonce for extranonce, _, _ in units}
+    assert len(extranonces) == 4
+
+def test_share_validation(server):
+    session, other = add_session(server), add_session(server)
+    work = request(server, session, 'mining.get_work')['result']
+    job = server.current_job
+    header = bytes.fromhex(work['header'])
+    submit = lambda *params: request(server, session, 'mining.submit', list(params))
+    
+    share_nonce = find_nonce(header, job.share_target, reject_below=job.target)
+    low_nonce = next(nonce for nonce in range(1000)
+                     if HeaderHasher(header).hash_nonce(nonce) > target_to_bytes(job.share_target))
+    
+    assert error_code(submit('tidakada', work['extranonce'], share_nonce)) == ERROR_STALE_JOB
+    foreign = request(server, other, 'mining.get_work')['result']['extranonce']
+    assert error_code(submit(work['job_id'], foreign, share_nonce)) == ERROR_OTHER
+    assert error_code(submit(work['job_id'], work['extranonce'], NONCE_SPACE)) == ERROR_OTHER
+    assert error_code(submit(work['job_id'], work['extranonce'], low_nonce)) == ERROR_LOW_DIFFICULTY
+    
+    assert submit(work['job_id'], work['extranonce'], share_nonce)['result'] is True
+    assert error_code(submit(work['job_id'], work['extranonce'], share_nonce)) == ERROR_DUPLICATE_SHARE
+    assert (session.accepted, session.rejected, session.stale) == (1, 4, 1)
+    assert server.miner.submitted == []
+
+def test_block_share_submitted_and_job_cleared(server):
+    session = add_session(server)
+    work = request(server, session, 'mining.get_work')['result']
+    job = server.current_job
+    nonce = find_nonce(bytes.fromhex(work['header']), job.target)
+    
+    assert request(server, session, 'mining.submit', [work['job_id'], work['extranonce'], nonce])['result'] is True
+    [(block, height)] = server.miner.submitted
+    assert height == 5 and block.header.nonce == nonce
+    assert block.header.get_hash() == HeaderHasher(bytes.fromhex(work['header'])).hash_nonce(nonce)
+    assert server.current_job is None and not server.jobs
+    assert error_code(request(server, session, 'mining.get_work')) == ERROR_NO_WORK